@@ -0,0 +1,288 @@
+"""
+Per-client admission control for the API.
+
+One client posting to /analyze/ in a loop can keep the inference pool busy
+and push everyone else's latency up without bound. AdmissionMiddleware turns
+such requests away with 429 and a Retry-After header before their body is
+read:
+
+- Every route belongs to a class (inference, admin, metadata or media), and each
+  class has its own token-bucket budget per client, so cheap GETs are never
+  starved by the analysis budget and vice versa.
+- Analyses (including queued jobs) also need a slot in InferenceGate: at most
+  INFERENCE_MAX_PENDING may be queued or running at once, and one client may
+  hold at most INFERENCE_MAX_PER_CLIENT of them. The queue in front of the
+  inference pool, and so the wait, stays bounded, and one client cannot fill it.
+- /reload-celebrities/ requires the X-Admin-Token header when ADMIN_TOKEN is set.
+
+Clients are identified by a key from ADMISSION_API_KEYS sent as X-API-Key, or
+else by IP address. Behind a proxy (Render, Railway) set FORWARDED_HOPS=1 so
+the address comes from X-Forwarded-For; otherwise every client looks like the
+proxy. Budgets are "<requests>/<seconds>", e.g. ADMISSION_INFERENCE_BUDGET=10/60,
+and apply per worker process.
+"""
+
+import hashlib
+import hmac
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "on") != "off"
+ADMISSION_MAX_CLIENTS = int(os.getenv("ADMISSION_MAX_CLIENTS", "10000"))
+FORWARDED_HOPS = int(os.getenv("FORWARDED_HOPS", "0"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+INFERENCE_MAX_PER_CLIENT = int(os.getenv("INFERENCE_MAX_PER_CLIENT", "2"))
+
+DEFAULT_BUDGETS = {
+    "inference": "10/60",
+    "admin": "2/60",
+    "metadata": "120/60",
+    "media": "1200/60",
+}
+
+# (method, path prefix, class); GET/HEAD requests not listed are metadata, anything else is not limited
+ROUTE_CLASSES: List[Tuple[str, str, str]] = [
+    ("POST", "/analyze/", "inference"),
+    ("POST", "/jobs/analyze", "inference"),
+    ("POST", "/reload-celebrities/", "admin"),
+    # A page of thumbnails is dozens of requests; CDNs and browsers absorb repeats
+    ("GET", "/media/", "media"),
+    ("HEAD", "/media/", "media"),
+]
+
+
+def parse_budget(value: str) -> Tuple[float, int]:
+    """'10/60' -> (10/60 tokens per second, burst of 10)"""
+    requests, _, seconds = value.partition("/")
+    count = int(requests)
+    return count / float(seconds or 1), count
+
+
+def budget_from_env(route_class: str) -> Tuple[float, int]:
+    return parse_budget(os.getenv(f"ADMISSION_{route_class.upper()}_BUDGET", DEFAULT_BUDGETS[route_class]))
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    for route_method, prefix, name in ROUTE_CLASSES:
+        if method == route_method and path.startswith(prefix):
+            return name
+    return "metadata" if method in ("GET", "HEAD") else None
+
+
+class TokenBucket:
+    """Non-blocking token bucket: take() grants a token or says how long until one is available"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(float(burst), 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class ClientBuckets:
+    """One bucket per client for a route class, least recently seen clients evicted first"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = ADMISSION_MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def take(self, client: str) -> float:
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+        return bucket.take()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class Slot:
+    """A place in the inference queue; released when the request (or the job it started) finishes"""
+
+    def __init__(self, gate: "InferenceGate", client: str):
+        self.gate = gate
+        self.client = client
+        self.held = False
+        self._started = time.monotonic()
+        self._released = False
+
+    def hold(self):
+        """Keep the slot past the end of the request; the caller must release() it"""
+        self.held = True
+
+    def release(self, measured: bool = True):
+        if not self._released:
+            self._released = True
+            self.gate.exit(self.client, time.monotonic() - self._started if measured else None)
+
+
+class InferenceGate:
+    """Bounds analyses queued or running, in total and per client"""
+
+    def __init__(self, workers: int, max_pending: Optional[int] = None,
+                 per_client: int = INFERENCE_MAX_PER_CLIENT):
+        self.workers = max(workers, 1)
+        self.max_pending = max_pending or int(os.getenv("INFERENCE_MAX_PENDING", "0")) or 4 * self.workers
+        self.per_client = per_client
+        self.pending = 0
+        self.by_client: Dict[str, int] = {}
+        # Moving average of how long a slot is held, for Retry-After
+        self.average_seconds = 5.0
+        self._lock = threading.Lock()
+
+    def enter(self, client: str) -> Tuple[Optional[Slot], float]:
+        """A slot, or None and the suggested wait in seconds"""
+        with self._lock:
+            if self.by_client.get(client, 0) >= self.per_client:
+                return None, self.average_seconds
+            if self.pending >= self.max_pending:
+                return None, self.pending / self.workers * self.average_seconds
+            self.pending += 1
+            self.by_client[client] = self.by_client.get(client, 0) + 1
+        return Slot(self, client), 0.0
+
+    def exit(self, client: str, seconds: Optional[float]):
+        with self._lock:
+            self.pending -= 1
+            remaining = self.by_client.get(client, 1) - 1
+            if remaining:
+                self.by_client[client] = remaining
+            else:
+                self.by_client.pop(client, None)
+            if seconds is not None:
+                self.average_seconds = 0.8 * self.average_seconds + 0.2 * seconds
+
+
+class AdmissionController:
+    """Decides per request whether to admit it; counts what it turned away"""
+
+    def __init__(self, workers: int, budgets: Optional[Dict[str, Tuple[float, int]]] = None,
+                 api_keys: Optional[List[str]] = None, forwarded_hops: int = FORWARDED_HOPS,
+                 admin_token: str = ADMIN_TOKEN):
+        budgets = budgets or {name: budget_from_env(name) for name in DEFAULT_BUDGETS}
+        self.buckets = {name: ClientBuckets(rate, burst) for name, (rate, burst) in budgets.items()}
+        self.gate = InferenceGate(workers)
+        if api_keys is None:
+            api_keys = [key.strip() for key in os.getenv("ADMISSION_API_KEYS", "").split(",") if key.strip()]
+        self.api_keys = {hashlib.sha256(key.encode()).hexdigest()[:16] for key in api_keys}
+        self.forwarded_hops = forwarded_hops
+        self.admin_token = admin_token
+        self.counts: Dict[str, int] = {}
+        self._warned_proxy = False
+
+    def client_id(self, scope: Dict[str, Any]) -> str:
+        headers = dict(scope.get("headers") or [])
+        api_key = headers.get(b"x-api-key")
+        if api_key:
+            digest = hashlib.sha256(api_key).hexdigest()[:16]
+            if digest in self.api_keys:
+                return f"key:{digest}"
+        forwarded = headers.get(b"x-forwarded-for")
+        if forwarded and not self.forwarded_hops and not self._warned_proxy:
+            self._warned_proxy = True
+            logger.warning("Requests arrive through a proxy (X-Forwarded-For) but FORWARDED_HOPS=0: every client "
+                           "shares the proxy's address and one set of admission budgets. Set FORWARDED_HOPS=1.")
+        if self.forwarded_hops and forwarded:
+            # The last hop is the one our proxy appended; anything further left is client-supplied
+            hops = [hop.strip() for hop in forwarded.decode("latin-1").split(",") if hop.strip()]
+            if hops:
+                return f"ip:{hops[-min(self.forwarded_hops, len(hops))]}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    def _count(self, key: str):
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def admit(self, scope: Dict[str, Any]) -> Tuple[Optional[JSONResponse], Optional[Slot]]:
+        """(rejection response, None) or (None, inference slot if the route needs one)"""
+        name = route_class(scope["method"], scope["path"])
+        if name is None:
+            return None, None
+        if name == "admin" and self.admin_token:
+            token = dict(scope.get("headers") or []).get(b"x-admin-token", b"")
+            if not hmac.compare_digest(token, self.admin_token.encode()):
+                self._count("forbidden_admin")
+                return JSONResponse({"detail": "Admin token required"}, status_code=403), None
+        client = self.client_id(scope)
+        slot = None
+        if name == "inference":
+            slot, wait = self.gate.enter(client)
+            if slot is None:
+                self._count("rejected_busy")
+                return self.too_many("The AI is busy with other photos right now, please retry shortly", wait), None
+        wait = self.buckets[name].take(client)
+        if wait > 0:
+            if slot is not None:
+                slot.release(measured=False)
+            self._count(f"rejected_{name}")
+            return self.too_many("Too many requests, please slow down", wait), None
+        self._count(f"admitted_{name}")
+        return None, slot
+
+    @staticmethod
+    def too_many(detail: str, wait: float) -> JSONResponse:
+        return JSONResponse({"detail": detail}, status_code=429,
+                            headers={"Retry-After": str(max(1, math.ceil(wait)))})
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": ADMISSION_CONTROL,
+            "inference_pending": self.gate.pending,
+            "inference_max_pending": self.gate.max_pending,
+            "inference_average_seconds": round(self.gate.average_seconds, 2),
+            "budgets": {name: {"per_second": round(b.rate, 4), "burst": b.burst, "clients": len(b)}
+                        for name, b in self.buckets.items()},
+            "counts": dict(self.counts),
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying an AdmissionController before the request body is read"""
+
+    def __init__(self, app, controller: AdmissionController, enabled: bool = ADMISSION_CONTROL):
+        self.app = app
+        self.controller = controller
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        rejection, slot = self.controller.admit(scope)
+        if rejection is not None:
+            await rejection(scope, receive, send)
+            return
+        if slot is None:
+            await self.app(scope, receive, send)
+            return
+        # Handlers find the slot on request.state.admission_slot
+        scope.setdefault("state", {})["admission_slot"] = slot
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if not slot.held:
+                slot.release()
@@ -264,7 +264,8 @@ export default function AnalysisPage() {
         },
         celebrityMatches: result.lookalike.name !== "Unknown" ? [{
           name: result.lookalike.name,
-          image: result.lookalike.image,
+          // image_url is a cacheable thumbnail path on the API; image is a server-side file path
+          image: result.lookalike.image_url ? new URL(result.lookalike.image_url, API_ENDPOINTS.ANALYZE).toString() : result.lookalike.image,
           similarity: result.lookalike.similarity,
           category: result.lookalike.info.group || "Celebrity"
         }] : [],
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for gallery ingestion.
+
+Starts mock_image_hosts.py as a subprocess and runs GalleryCrawler against it
+through MockHostsTransport, one phase per mock scenario (fast, typical, slow,
+flaky, throttled, large). Each phase ingests the same synthetic identities
+into a fresh temporary gallery and reports images/s, bytes/s, retries, 429
+pauses and the CPU time of the ingestion pipeline (the crawler plus its face
+validation workers; the mock's own CPU is not counted). Results are
+reproducible with --seed, so crawler changes can be compared run against run.
+
+The real per-host rate limits apply unless --unlimited is given; those
+dominate wall time for the search providers, which is usually what you want
+to see. --unlimited measures the pipeline itself.
+
+Usage:
+    python bench_ingest.py --scenarios fast,flaky,throttled --identities 40
+    python bench_ingest.py --unlimited --face-check --images celebrities/BTS_Jimin --json
+    python bench_ingest.py --mock http://127.0.0.1:8089 --scenarios large
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from face_validation import FaceValidator
+from gallery_ingest import HOST_RATES, GalleryCrawler, HostLimiter, load_providers
+from http_cache import HTTPCache
+from ingest_manifest import IngestManifest
+from loadtest import wait_until_up
+from mock_image_hosts import MockHostsTransport
+
+UNLIMITED_RATE = (10000.0, 10000)
+
+
+def cpu_seconds() -> float:
+    """User + system CPU of this process and its reaped children (the validation pool)"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def start_mock(port: int, args) -> subprocess.Popen:
+    here = os.path.dirname(os.path.abspath(__file__))
+    command = [sys.executable, os.path.join(here, "mock_image_hosts.py"), "--port", str(port)]
+    if args.images:
+        command += ["--images", args.images]
+    return subprocess.Popen(command, cwd=here)
+
+
+def run_phase(args, mock: str) -> Dict[str, Any]:
+    """Ingest --identities synthetic names into a fresh temporary gallery"""
+    names = [f"Benchmark Identity {n:04d}" for n in range(args.identities)]
+    with tempfile.TemporaryDirectory(prefix="bench_ingest_") as work:
+        if args.unlimited:
+            limiter = HostLimiter({host: UNLIMITED_RATE for host in HOST_RATES}, default=UNLIMITED_RATE)
+        else:
+            limiter = HostLimiter()
+        crawler = GalleryCrawler(
+            load_providers(args.providers.split(",")), out_dir=os.path.join(work, "gallery"),
+            concurrency=args.concurrency, per_identity=args.per_identity, candidates=args.candidates,
+            limiter=limiter, timeout=args.timeout,
+            manifest=None if args.no_manifest else IngestManifest(os.path.join(work, "manifest.sqlite3")),
+            validator=FaceValidator(args.validate_workers) if args.face_check else None,
+            cache=HTTPCache(os.path.join(work, "cache")) if args.cache else None,
+            transport=MockHostsTransport(mock),
+        )
+        cpu_start = cpu_seconds()
+        start = time.perf_counter()
+        try:
+            results = asyncio.run(crawler.run(names))
+        finally:
+            if crawler.validator is not None:
+                crawler.validator.close()
+        elapsed = time.perf_counter() - start
+        cpu = cpu_seconds() - cpu_start
+
+    stats = crawler.stats
+    images = sum(result["images"] for result in results)
+    statuses = {key[len("status_"):]: value for key, value in stats.items() if key.startswith("status_")}
+    rate_limited = stats.get("status_429", 0)
+    server_errors = sum(value for key, value in statuses.items() if key.startswith("5"))
+    return {
+        "identities": len(names),
+        "images": images,
+        "elapsed_s": round(elapsed, 3),
+        "images_per_s": round(images / elapsed, 2) if elapsed else 0.0,
+        "bytes": stats.get("bytes", 0),
+        "bytes_per_s": round(stats.get("bytes", 0) / elapsed) if elapsed else 0,
+        "retries": rate_limited + server_errors + stats.get("fetch_errors", 0),
+        "rate_limited": rate_limited,
+        "cpu_s": round(cpu, 2),
+        "cpu_pct": round(cpu / elapsed * 100, 1) if elapsed else 0.0,
+        "statuses": statuses,
+        "outcomes": {key: stats[key] for key in ("downloaded", "failed", "skipped") if key in stats},
+        "rejected": {key: value for key, value in stats.items() if key.startswith("rejected_")},
+    }
+
+
+def print_phase(scenario: str, result: Dict[str, Any]):
+    print(f"\n📊 Scenario: {scenario}")
+    print(f"   Images:    {result['images']} for {result['identities']} identities in {result['elapsed_s']}s "
+          f"({result['images_per_s']} images/s)")
+    print(f"   Bytes:     {result['bytes'] / 1024 / 1024:.1f} MB ({result['bytes_per_s'] / 1024 / 1024:.2f} MB/s)")
+    print(f"   Retries:   {result['retries']} ({result['rate_limited']} rate limited)")
+    print(f"   CPU:       {result['cpu_s']}s ({result['cpu_pct']}% of one core)")
+    print(f"   Statuses:  {result['statuses']}")
+    if result["rejected"]:
+        print(f"   Rejected:  {result['rejected']}")
+    if result.get("hosts"):
+        print(f"   Hosts:     {result['hosts']}")
+
+
+def run(args) -> List[Dict[str, Any]]:
+    results = []
+    with httpx.Client(timeout=30.0) as control:
+        for scenario in args.scenarios.split(","):
+            control.post(f"{args.mock}/_mock/config", json={"scenario": scenario, "seed": args.seed})
+            control.post(f"{args.mock}/_mock/reset")
+            result = run_phase(args, args.mock)
+            result["scenario"] = scenario
+            result["hosts"] = control.get(f"{args.mock}/_mock/stats").json()
+            results.append(result)
+            if not args.json:
+                print_phase(scenario, result)
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark gallery ingestion against local mock image hosts")
+    parser.add_argument("--mock", help="base URL of a running mock_image_hosts.py (default: start one)")
+    parser.add_argument("--mock-port", type=int, default=8089)
+    parser.add_argument("--scenarios", default="fast,typical,flaky,throttled,large")
+    parser.add_argument("--identities", type=int, default=40)
+    parser.add_argument("--providers", default="wikipedia,duckduckgo,bing")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--per-identity", type=int, default=3)
+    parser.add_argument("--candidates", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--unlimited", action="store_true", help="disable the per-host rate limits")
+    parser.add_argument("--face-check", action="store_true", help="run face validation (use with --images)")
+    parser.add_argument("--validate-workers", type=int)
+    parser.add_argument("--images", help="folder of real images for the spawned mock to serve")
+    parser.add_argument("--no-manifest", action="store_true")
+    parser.add_argument("--cache", action="store_true", help="use a (fresh) HTTP cache for searches")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show the crawler's rate limit warnings")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.ERROR)
+
+    process = None
+    if not args.mock:
+        process = start_mock(args.mock_port, args)
+        args.mock = f"http://127.0.0.1:{args.mock_port}"
+    try:
+        wait_until_up(f"{args.mock}/_mock/stats")
+        results = run(args)
+        if args.json:
+            print(json.dumps(results, indent=2))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Precomputed celebrity catalog for GET /celebrities/.
+
+A CelebrityCatalog is built once per gallery snapshot (every load_celebrities()
+call). It joins each gallery image to its CSV row once, sorts the entries by
+name and precomputes the filter indexes (group, gender, name prefix), so a
+request is a couple of set intersections and a slice. Rendered bodies, and
+their gzip/brotli variants, are cached per query. Each body has a strong ETag
+derived from the snapshot version and the body itself, so a client revalidating
+an unchanged page gets a bodiless 304.
+"""
+
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import api_responses
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+# Rendered bodies kept per snapshot (each query and encoding is one entry)
+MAX_CACHED_BODIES = 256
+
+GENDER_ALIASES = {"m": "M", "male": "M", "man": "M", "f": "F", "female": "F", "woman": "F"}
+
+
+def name_key(name: str) -> str:
+    return name.replace("_", " ").strip().lower()
+
+
+def record_index(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """CSV rows by lowercased name, stage name and "<group> <stage name>"; the first row wins"""
+    index: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        keys = [record.get("name"), record.get("Stage Name"), record.get("Full Name")]
+        if record.get("Group") and record.get("Stage Name"):
+            keys.append(f"{record['Group']} {record['Stage Name']}")
+        for key in keys:
+            if isinstance(key, str) and key.strip():
+                index.setdefault(name_key(key), record)
+    return index
+
+
+def match_key(index: Dict[str, Any], name: str) -> Optional[str]:
+    """Key of ``index`` (see record_index) for a gallery name such as "BTS_Jimin" or "Kim_Younghoon" """
+    key = name_key(name)
+    if key in index:
+        return key
+    # "<Group>_<Stage Name>" where the group itself contains no underscore
+    _, _, stage = key.partition(" ")
+    return stage if stage and stage in index else None
+
+
+def match_record(index: Dict[str, Dict[str, Any]], name: str) -> Dict[str, Any]:
+    """CSV row for a gallery name ({} if none)"""
+    key = match_key(index, name)
+    return index[key] if key is not None else {}
+
+
+def normalize_gender(value: Any) -> Optional[str]:
+    return GENDER_ALIASES.get(str(value).strip().lower()) if value else None
+
+
+class CelebrityCatalog:
+    """Filterable, paginated listing of one gallery snapshot"""
+
+    def __init__(self, names: List[str], images: List[str], records: List[Dict[str, Any]],
+                 thumbs: Optional[List[Optional[str]]] = None):
+        index = record_index(records)
+        entries = []
+        for name, image, thumb in zip(names, images, thumbs or [None] * len(names)):
+            record = match_record(index, name)
+            entries.append((name_key(name), name, image, record.get("Group") or None,
+                            normalize_gender(record.get("Gender")), thumb))
+        entries.sort(key=lambda entry: entry[:3])
+        self.keys = [entry[0] for entry in entries]
+        self.names = [entry[1] for entry in entries]
+        self.images = [entry[2] for entry in entries]
+        self.groups = [entry[3] for entry in entries]
+        self.genders = [entry[4] for entry in entries]
+        self.thumbs = [entry[5] for entry in entries]
+        self.by_group: Dict[str, List[int]] = {}
+        self.by_gender: Dict[str, List[int]] = {}
+        for position, (group, gender) in enumerate(zip(self.groups, self.genders)):
+            if group:
+                self.by_group.setdefault(group.lower(), []).append(position)
+            if gender:
+                self.by_gender.setdefault(gender, []).append(position)
+        digest = hashlib.sha256()
+        for entry in zip(self.names, self.images, self.groups, self.genders, self.thumbs):
+            digest.update(("\0".join(map(str, entry)) + "\n").encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+        self._bodies: "OrderedDict[tuple, Tuple[bytes, str, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Body cache lookups, for GET /metrics
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def select(self, group: Optional[str] = None, gender: Optional[str] = None,
+               prefix: Optional[str] = None) -> Sequence[int]:
+        """Positions of the matching entries, in name order"""
+        positions = None
+        if prefix:
+            key = name_key(prefix)
+            start = bisect.bisect_left(self.keys, key)
+            end = bisect.bisect_left(self.keys, key + "\uffff")
+            positions = range(start, end)
+        for selected in (self.by_group.get(group.lower(), []) if group else None,
+                         self.by_gender.get(normalize_gender(gender), []) if gender else None):
+            if selected is None:
+                continue
+            if positions is None:
+                positions = selected
+            else:
+                allowed = set(selected)
+                positions = [position for position in positions if position in allowed]
+        return range(len(self.names)) if positions is None else positions
+
+    def render(self, offset: int, limit: int, group: Optional[str], gender: Optional[str],
+               prefix: Optional[str]) -> bytes:
+        positions = self.select(group, gender, prefix)
+        page = positions[offset:offset + limit]
+        return api_responses.dumps({
+            "count": len(positions),
+            "total": len(self.names),
+            "offset": offset,
+            "limit": limit,
+            "version": self.version,
+            "names": [self.names[p] for p in page],
+            "images": [self.images[p] for p in page],
+            "groups": [self.groups[p] for p in page],
+            "genders": [self.genders[p] for p in page],
+            "thumbs": [self.thumbs[p] for p in page],
+        })
+
+    def page(self, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE, group: Optional[str] = None,
+             gender: Optional[str] = None, prefix: Optional[str] = None,
+             encoding: Optional[str] = None) -> Tuple[bytes, str, Optional[str]]:
+        """(body, strong ETag, encoding used) for a query; ``encoding`` is "br", "gzip" or None"""
+        offset = max(offset, 0)
+        limit = min(max(limit, 1), MAX_PAGE_SIZE)
+        query = (offset, limit, (group or "").lower(), normalize_gender(gender) if gender else "",
+                 name_key(prefix) if prefix else "")
+        cache_key = query + (encoding,)
+        with self._lock:
+            if cache_key in self._bodies:
+                self.hits += 1
+                self._bodies.move_to_end(cache_key)
+                return self._bodies[cache_key]
+            self.misses += 1
+        if encoding is None:
+            body = self.render(offset, limit, group, gender, prefix)
+            entry = (body, f'"{self.version}-{hashlib.sha256(body).hexdigest()[:16]}"', None)
+        else:
+            plain, plain_etag, _ = self.page(offset, limit, group, gender, prefix)
+            if len(plain) < api_responses.COMPRESS_MIN_BYTES:
+                entry = (plain, plain_etag, None)
+            else:
+                # Strong ETags identify bytes, so every encoding gets its own
+                entry = (api_responses.compress(plain, encoding), f'{plain_etag[:-1]}-{encoding}"', encoding)
+        with self._lock:
+            self._bodies[cache_key] = entry
+            while len(self._bodies) > MAX_CACHED_BODIES:
+                self._bodies.popitem(last=False)
+        return entry
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Face validation for gallery images.
+
+A gallery image is only useful for matching if it shows exactly one face that
+is large enough and sharp enough. validate_image checks that on the raw
+downloaded bytes: decode, reject blank/placeholder images, detect faces, then
+score sharpness as the variance of the Laplacian over the face. Detection uses
+the Haar cascades bundled with OpenCV, or the YuNet model if
+FACE_DETECTOR_MODEL is set. gallery_ingest.py runs it in a FaceValidator
+process pool while downloads stream in, so rejected images are never written.
+
+Thresholds come from FACE_MIN_SIZE, FACE_MIN_FRACTION and FACE_MIN_SHARPNESS.
+
+Usage:
+    python face_validation.py celebrities/BTS_Jimin/*.jpg
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Smallest accepted face side in pixels, and as a fraction of the shorter image side
+FACE_MIN_SIZE = int(os.getenv("FACE_MIN_SIZE", "64"))
+FACE_MIN_FRACTION = float(os.getenv("FACE_MIN_FRACTION", "0.1"))
+# Variance of the Laplacian over the face crop; below this the face is too blurry
+FACE_MIN_SHARPNESS = float(os.getenv("FACE_MIN_SHARPNESS", "30"))
+# Pixel standard deviation below which an image is a flat placeholder
+MIN_CONTRAST = 8.0
+# A second face only makes it a group shot if it is at least this fraction of the largest one;
+# smaller detections are background people or cascade false positives
+GROUP_FACE_RATIO = 0.5
+DETECT_MAX_SIDE = 480
+# Optional path to OpenCV's YuNet face detector (face_detection_yunet_*.onnx)
+FACE_DETECTOR_MODEL = os.getenv("FACE_DETECTOR_MODEL")
+
+_cascades: Dict[str, Any] = {}
+_yunet = None
+
+
+def haar_cascade(name: str):
+    """Haar cascade, loaded once per worker process"""
+    if name not in _cascades:
+        import cv2
+
+        _cascades[name] = cv2.CascadeClassifier(os.path.join(cv2.data.haarcascades, name))
+    return _cascades[name]
+
+
+def detect_faces_with_landmarks(gray: np.ndarray, min_side: int) -> List[Dict[str, Any]]:
+    """Faces as {"box": [x, y, w, h], "landmarks": 5 (x, y) points or None}, largest first
+
+    Uses OpenCV's YuNet detector when FACE_DETECTOR_MODEL points at its ONNX
+    file (which also gives eye, nose and mouth-corner landmarks), otherwise the
+    frontal Haar cascade with a profile-face fallback.
+    """
+    import cv2
+
+    global _yunet
+    faces = []
+    if FACE_DETECTOR_MODEL:
+        if _yunet is None:
+            _yunet = cv2.FaceDetectorYN_create(FACE_DETECTOR_MODEL, "", (320, 320), 0.8)
+        _yunet.setInputSize((gray.shape[1], gray.shape[0]))
+        _, found = _yunet.detect(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+        for face in (found if found is not None else []):
+            box = [int(v) for v in face[:4]]
+            if min(box[2], box[3]) >= min_side:
+                faces.append({"box": box, "landmarks": face[4:14].reshape(5, 2).round(1).tolist()})
+    else:
+        equalized = cv2.equalizeHist(gray)
+        size = (min_side, min_side)
+        boxes = list(haar_cascade("haarcascade_frontalface_alt2.xml").detectMultiScale(equalized, 1.1, 4, minSize=size))
+        if not boxes:
+            profile = haar_cascade("haarcascade_profileface.xml")
+            boxes = list(profile.detectMultiScale(equalized, 1.1, 4, minSize=size))
+            if not boxes:
+                width = equalized.shape[1]
+                boxes = [[width - x - w, y, w, h] for x, y, w, h in
+                         profile.detectMultiScale(cv2.flip(equalized, 1), 1.1, 4, minSize=size)]
+        faces = [{"box": [int(v) for v in box], "landmarks": None} for box in boxes]
+    return sorted(faces, key=lambda f: f["box"][2] * f["box"][3], reverse=True)
+
+
+def detect_faces(gray: np.ndarray, min_side: int) -> List[List[int]]:
+    """Face boxes (x, y, w, h) in a grayscale image, largest first"""
+    return [face["box"] for face in detect_faces_with_landmarks(gray, min_side)]
+
+
+def validate_image(data: bytes, min_size: int = FACE_MIN_SIZE, min_fraction: float = FACE_MIN_FRACTION,
+                   min_sharpness: float = FACE_MIN_SHARPNESS) -> Dict[str, Any]:
+    """Check that ``data`` decodes to an image with exactly one large, sharp face"""
+    import cv2
+
+    result: Dict[str, Any] = {"ok": False, "reason": None, "faces": 0, "box": None, "sharpness": None}
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        result["reason"] = "undecodable"
+        return result
+    height, width = img.shape
+    result.update(width=width, height=height)
+    if img.std() < MIN_CONTRAST:
+        result["reason"] = "blank"
+        return result
+
+    scale = min(1.0, DETECT_MAX_SIDE / max(height, width))
+    small = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else img
+    smallest = max(min_size, int(min_fraction * min(height, width)))
+    faces = detect_faces(small, max(1, int(smallest * scale)))
+    result["faces"] = len(faces)
+    if len(faces) == 0:
+        result["reason"] = "no_face"
+        return result
+    if len(faces) > 1 and faces[1][2] >= GROUP_FACE_RATIO * faces[0][2]:
+        result["reason"] = "multiple_faces"
+        return result
+
+    x, y, w, h = (int(round(v / scale)) for v in faces[0])
+    result["box"] = [x, y, w, h]
+    sharpness = float(cv2.Laplacian(img[y:y + h, x:x + w], cv2.CV_64F).var())
+    result["sharpness"] = round(sharpness, 1)
+    if sharpness < min_sharpness:
+        result["reason"] = "blurry"
+        return result
+    result["ok"] = True
+    return result
+
+
+class FaceValidator:
+    """Runs validate_image in a process pool so detection never blocks the download loop"""
+
+    def __init__(self, workers: Optional[int] = None, **thresholds):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.check = functools.partial(validate_image, **thresholds)
+
+    async def validate(self, data: bytes) -> Dict[str, Any]:
+        return await asyncio.get_running_loop().run_in_executor(self.pool, self.check, data)
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check gallery images for exactly one sharp face")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--min-size", type=int, default=FACE_MIN_SIZE)
+    parser.add_argument("--min-fraction", type=float, default=FACE_MIN_FRACTION)
+    parser.add_argument("--min-sharpness", type=float, default=FACE_MIN_SHARPNESS)
+    args = parser.parse_args()
+
+    reasons: Dict[str, int] = {}
+    for path in args.paths:
+        with open(path, "rb") as f:
+            result = validate_image(f.read(), args.min_size, args.min_fraction, args.min_sharpness)
+        reason = result["reason"] or "ok"
+        reasons[reason] = reasons.get(reason, 0) + 1
+        mark = "✓" if result["ok"] else "✗"
+        print(f"{mark} {path}: {reason} (faces={result['faces']}, sharpness={result['sharpness']})")
+    print(f"\n📊 {reasons}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Run an ASGI app (FastAPI) behind a WSGI-style request, e.g. Firebase's https_fn.Request.
+
+One event loop is started per instance, in a background thread, and reused by
+every invocation; the app's lifespan startup runs once on the first request.
+Each request becomes an ASGI http scope with the raw body, so FastAPI does its
+own multipart parsing, validation and JSON encoding exactly as under uvicorn.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+# Path prefix to strip before routing, for Hosting rewrites like /api/** -> function
+ASGI_PATH_PREFIX = os.getenv("ASGI_PATH_PREFIX", "")
+
+
+class ASGIBridge:
+    """Calls an ASGI app from synchronous request handlers on a persistent event loop"""
+
+    def __init__(self, app, path_prefix: str = ASGI_PATH_PREFIX, timeout: Optional[float] = None):
+        self.app = app
+        self.path_prefix = path_prefix.rstrip("/")
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lifespan: Optional[asyncio.Future] = None
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="asgi-bridge", daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._startup(), loop).result(self.timeout)
+                self._loop = loop
+                atexit.register(self.close)
+        return self._loop
+
+    async def _startup(self):
+        """Run the app's lifespan startup (FastAPI startup events); apps without lifespan are fine"""
+        queue = self._lifespan_queue = asyncio.Queue()
+        await queue.put({"type": "lifespan.startup"})
+        started = asyncio.get_running_loop().create_future()
+
+        async def send(message: Dict[str, Any]):
+            if message["type"].startswith("lifespan.startup.") and not started.done():
+                started.set_result(message)
+
+        # The task stays parked on receive() for the lifetime of the instance
+        self._lifespan = asyncio.ensure_future(
+            self.app({"type": "lifespan", "asgi": {"version": "3.0"}}, queue.get, send))
+        await asyncio.wait({started, self._lifespan}, return_when=asyncio.FIRST_COMPLETED)
+        if started.done() and started.result()["type"] == "lifespan.startup.failed":
+            raise RuntimeError(f"ASGI startup failed: {started.result().get('message', '')}")
+        if not started.done():
+            logger.info("ASGI app does not support lifespan, skipping startup")
+
+    async def _shutdown(self):
+        if self._lifespan is not None and not self._lifespan.done():
+            await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+            await asyncio.wait({self._lifespan}, timeout=5.0)
+
+    def close(self):
+        """Run the app's shutdown handlers and stop the loop (at interpreter exit)"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(10.0)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def scope(self, req) -> Dict[str, Any]:
+        """ASGI http scope for a werkzeug-style request"""
+        path = req.path or "/"
+        if self.path_prefix and (path == self.path_prefix or path.startswith(self.path_prefix + "/")):
+            path = path[len(self.path_prefix):] or "/"
+        host = req.host or "localhost"
+        server_name, _, server_port = host.partition(":")
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": req.method.upper(),
+            "scheme": req.scheme or "https",
+            "path": path,
+            "raw_path": quote(path).encode("latin-1"),
+            "query_string": req.query_string or b"",
+            "root_path": self.path_prefix,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in req.headers.items()],
+            "client": (req.remote_addr or "", 0),
+            "server": (server_name, int(server_port) if server_port.isdigit() else
+                       (443 if req.scheme == "https" else 80)),
+        }
+
+    async def _call(self, scope: Dict[str, Any], body: bytes) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        response: Dict[str, Any] = {"status": 500, "headers": [], "body": []}
+        finished = asyncio.Event()
+        request_sent = False
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Only a disconnect listener asks again; the client goes away once the response is done
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [(name.decode("latin-1"), value.decode("latin-1"))
+                                       for name, value in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            finished.set()
+        return response["status"], response["headers"], b"".join(response["body"])
+
+    def handle(self, req) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """Status, headers and body of the app's response to ``req``"""
+        loop = self._ensure_loop()
+        body = req.get_data(cache=False)
+        future = asyncio.run_coroutine_threadsafe(self._call(self.scope(req), body), loop)
+        return future.result(self.timeout)
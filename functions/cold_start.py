@@ -0,0 +1,59 @@
+"""
+Cold-start bookkeeping for the serverless entry point.
+
+Import this first: it notes when the module import began, so the report can
+show how long imports took, how long each lazily loaded model took on first
+use, and how long the first request waited. GET /cold-start serves the report.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+_started = time.perf_counter()
+_marks: Dict[str, float] = {}
+_loads: Dict[str, float] = {}
+
+
+def elapsed_ms() -> float:
+    return round((time.perf_counter() - _started) * 1000, 1)
+
+
+def mark(name: str):
+    """Record the time since import for ``name`` (only the first time)"""
+    _marks.setdefault(name, elapsed_ms())
+
+
+def marked(name: str) -> bool:
+    return name in _marks
+
+
+def report() -> Dict[str, Any]:
+    return {"since_import_ms": dict(_marks), "load_ms": dict(_loads), "uptime_ms": elapsed_ms()}
+
+
+class Lazy(Generic[T]):
+    """A model or client created on first use, once, with its load time recorded"""
+
+    def __init__(self, name: str, load: Callable[[], T]):
+        self.name = name
+        self._load = load
+        self._value: Optional[T] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> T:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    start = time.perf_counter()
+                    self._value = self._load()
+                    _loads[self.name] = round((time.perf_counter() - start) * 1000, 1)
+                    self._loaded = True
+        return self._value
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Prebuilt, memory-mapped gallery index for the serverless entry point.
+
+Listing celebrities/ and parsing kpopidolsv3.csv with pandas on every cold
+start costs seconds (most of it importing pandas). build() does that once at
+deploy time and writes gallery_index.bin:
+
+    b"GIDX2\\n" | header length (8 bytes, little endian) | header JSON | records
+
+The header holds the image names and paths, the CSV row count and, per row,
+the offset and length of its JSON record. load() maps the file and parses only
+the header; CSV records are decoded from the mapping when they are looked up.
+
+Usage:
+    python gallery_index.py            # run before `firebase deploy`
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, List, Optional
+
+# Shared with the API; copied into this folder at deploy time (firebase.json predeploy)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import celebrity_catalog  # noqa: E402
+
+MAGIC = b"GIDX2\n"
+GALLERY_INDEX_FILE = os.getenv("GALLERY_INDEX_FILE", "gallery_index.bin")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def list_gallery(celeb_dir: str):
+    """Celebrity names and image paths, as load_celebrities() lists them"""
+    image_files = sorted(f for f in os.listdir(celeb_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
+    return [os.path.splitext(f)[0] for f in image_files], [os.path.join(celeb_dir, f) for f in image_files]
+
+
+def build(celeb_dir: str, csv_file: str, out_path: str = GALLERY_INDEX_FILE) -> Dict[str, Any]:
+    import pandas as pd
+
+    names, images = list_gallery(celeb_dir) if os.path.exists(celeb_dir) else ([], [])
+    # Empty CSV cells become null rather than NaN, which JSON responses cannot carry
+    frame = pd.read_csv(csv_file) if os.path.exists(csv_file) else pd.DataFrame()
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    blobs: List[bytes] = [json.dumps(record, default=str).encode("utf-8") for record in records]
+    offsets = []
+    position = 0
+    for blob in blobs:
+        offsets.append([position, len(blob)])
+        position += len(blob)
+    # Stage name, full name and "<group> <stage name>" -> row, keyed as the API's catalog does
+    rows = {id(record): row for row, record in enumerate(records)}
+    by_name = {key: rows[id(record)] for key, record in celebrity_catalog.record_index(records).items()}
+    header = json.dumps({"names": names, "images": images, "offsets": offsets, "by_name": by_name}).encode("utf-8")
+    tmp_path = f"{out_path}.part"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, out_path)
+    return {"names": len(names), "records": len(records), "bytes": os.path.getsize(out_path)}
+
+
+class GalleryIndex:
+    """Read-only view of gallery_index.bin; CSV records stay in the page cache until used"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a gallery index")
+        (length,) = struct.unpack_from("<Q", self._map, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(self._map[start:start + length])
+        self._records_start = start + length
+        self.names: List[str] = header["names"]
+        self.images: List[str] = header["images"]
+        self._offsets: List[List[int]] = header["offsets"]
+        self._by_name: Dict[str, int] = header["by_name"]
+
+    @property
+    def record_count(self) -> int:
+        return len(self._offsets)
+
+    def record(self, row: int) -> Dict[str, Any]:
+        offset, length = self._offsets[row]
+        start = self._records_start + offset
+        return json.loads(self._map[start:start + length])
+
+    def records(self, limit: int) -> List[Dict[str, Any]]:
+        return [self.record(row) for row in range(min(limit, self.record_count))]
+
+    def find(self, name: str) -> Dict[str, Any]:
+        """CSV record for a gallery name such as "BLACKPINK_Jennie" ({} if none)"""
+        key = celebrity_catalog.match_key(self._by_name, name)
+        return self.record(self._by_name[key]) if key is not None else {}
+
+
+def load(path: str = GALLERY_INDEX_FILE) -> Optional[GalleryIndex]:
+    return GalleryIndex(path) if os.path.exists(path) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped gallery index for cold starts")
+    parser.add_argument("--celebrities", default="celebrities")
+    parser.add_argument("--csv", default="celebrities/kpopidolsv3.csv")
+    parser.add_argument("--out", default=GALLERY_INDEX_FILE)
+    args = parser.parse_args()
+
+    info = build(args.celebrities, args.csv, args.out)
+    print(f"✅ Wrote {args.out}: {info['names']} images, {info['records']} CSV records, {info['bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
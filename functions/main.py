@@ -1,42 +1,60 @@
-import firebase_functions
-from firebase_functions import https_fn
-from firebase_admin import initialize_app
+import cold_start
 import os
 import sys
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# celebrity_catalog.py and api_responses.py live in the repository root; the predeploy
+# hook in firebase.json copies them here, and a checkout imports them from the root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from firebase_functions import https_fn
+
+from asgi_bridge import ASGIBridge
+import api_responses
+import celebrity_catalog
+import gallery_index
 
 # Import your existing FastAPI app
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from PIL import Image
-import numpy as np
-import io
-import cv2
-import pandas as pd
-from typing import List, Dict, Any
+from fastapi.responses import JSONResponse, Response
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+import importlib.util
 import logging
 import math
 import random
 import gc
 import time
 
-# Import DeepFace with error handling
-try:
-    from deepface import DeepFace
-    DEEPFACE_AVAILABLE = True
-except ImportError as e:
-    logging.warning(f"DeepFace not available: {e}")
-    DEEPFACE_AVAILABLE = False
-
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Firebase app
-initialize_app()
+# Cold-start mode (default): DeepFace/TensorFlow, pandas and the Firebase Admin SDK are
+# imported on first use, and the gallery comes from the prebuilt gallery_index.bin.
+# COLD_START_MODE=0 restores the eager behaviour (everything loaded at import time).
+COLD_START_MODE = os.getenv("COLD_START_MODE", "1") == "1"
+
+# Checking for the package is cheap; importing it pulls in TensorFlow
+DEEPFACE_AVAILABLE = importlib.util.find_spec("deepface") is not None
+if not DEEPFACE_AVAILABLE:
+    logging.warning("DeepFace not available: no module named 'deepface'")
+
+
+def _load_deepface():
+    from deepface import DeepFace
+    return DeepFace
+
+
+def _initialize_firebase():
+    from firebase_admin import initialize_app
+    return initialize_app()
+
+
+deepface = cold_start.Lazy("deepface", _load_deepface)
+firebase_app = cold_start.Lazy("firebase_admin", _initialize_firebase)
 
 # Create FastAPI app
 app = FastAPI(title="AI Face Analysis API", version="1.0.0")
@@ -67,37 +85,80 @@ CSV_FILE = "celebrities/kpopidolsv3.csv"
 celeb_names = []
 celeb_images = []
 celeb_data = []
+# CSV rows by name, for the scanning fallback (the prebuilt index has its own)
+celeb_record_index: Dict[str, Dict] = {}
+# Prebuilt index (python gallery_index.py); CSV records are read from it on lookup
+celeb_index = None
+celebrities_loaded = False
+# /celebrities/ listing, built on first use after each load
+catalog: Optional[celebrity_catalog.CelebrityCatalog] = None
 
 def load_celebrities():
     """Load celebrity data from CSV and images"""
-    global celeb_names, celeb_images, celeb_data
+    global celeb_names, celeb_images, celeb_data, celeb_index, celeb_record_index, celebrities_loaded, catalog
+    celebrities_loaded = True
+    catalog = None
+
+    if COLD_START_MODE:
+        try:
+            celeb_index = gallery_index.load()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not open gallery index, scanning instead: {e}")
+            celeb_index = None
+        if celeb_index is not None:
+            celeb_names, celeb_images, celeb_data = celeb_index.names, celeb_index.images, []
+            logger.info(f"Loaded {len(celeb_names)} celebrity images and {celeb_index.record_count} "
+                        f"CSV records from {gallery_index.GALLERY_INDEX_FILE}")
+            return
+        logger.warning(f"{gallery_index.GALLERY_INDEX_FILE} not found, scanning the gallery "
+                       f"(run gallery_index.py before deploying)")
     
     # Load CSV data
     if os.path.exists(CSV_FILE):
         try:
+            import pandas as pd
             celeb_data = pd.read_csv(CSV_FILE).to_dict('records')
+            celeb_record_index = celebrity_catalog.record_index(celeb_data)
             logger.info(f"Loaded CSV data with {len(celeb_data)} K-pop idols")
         except Exception as e:
             logger.error(f"Error loading CSV: {e}")
             celeb_data = []
+            celeb_record_index = {}
     
     # Load celebrity images
+    celeb_names = []
+    celeb_images = []
     if os.path.exists(CELEB_DIR):
-        image_files = [f for f in os.listdir(CELEB_DIR) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-        celeb_names = [os.path.splitext(f)[0] for f in image_files]
-        celeb_images = [os.path.join(CELEB_DIR, f) for f in image_files]
+        celeb_names, celeb_images = gallery_index.list_gallery(CELEB_DIR)
         logger.info(f"Loaded {len(celeb_names)} celebrity images")
     else:
         logger.warning("Celebrities directory not found")
-    celeb_names = []
-    celeb_images = []
+
+def ensure_celebrities():
+    """Load the gallery on first use (cold-start mode defers it until a request needs it)"""
+    if not celebrities_loaded:
+        load_celebrities()
+
+def get_catalog() -> celebrity_catalog.CelebrityCatalog:
+    """The /celebrities/ catalog; decoding every CSV record is left to the first listing request"""
+    global catalog
+    ensure_celebrities()
+    if catalog is None:
+        records = celeb_index.records(celeb_index.record_count) if celeb_index is not None else celeb_data
+        catalog = celebrity_catalog.CelebrityCatalog(celeb_names, celeb_images, api_responses.sanitize(records))
+    return catalog
+
+def csv_record_count() -> int:
+    return celeb_index.record_count if celeb_index is not None else len(celeb_data)
+
+def csv_sample(limit: int) -> List[Dict]:
+    return celeb_index.records(limit) if celeb_index is not None else celeb_data[:limit]
 
 def find_celeb_info(name: str) -> Dict:
     """Find celebrity info from CSV data"""
-    for celeb in celeb_data:
-        if celeb.get('name', '').lower() == name.lower():
-            return celeb
-    return {}
+    if celeb_index is not None:
+        return celeb_index.find(name)
+    return celebrity_catalog.match_record(celeb_record_index, name)
 
 def analyze_with_deepface(image_path: str):
     """Analyze image using DeepFace"""
@@ -105,7 +166,7 @@ def analyze_with_deepface(image_path: str):
         raise Exception("DeepFace is not available")
     
     try:
-        result = DeepFace.analyze(
+        result = deepface.get().analyze(
             img_path=image_path,
             actions=['age', 'gender', 'emotion'],
             enforce_detection=False,
@@ -197,24 +258,48 @@ def find_celebrity_lookalike(beauty_score: float, age: int, gender: str) -> Dict
         "info": celeb_info
     }
 
-# Load celebrities on startup
+if not COLD_START_MODE:
+    firebase_app.get()
+    if DEEPFACE_AVAILABLE:
+        deepface.get()
     load_celebrities()
+cold_start.mark("imported")
+
+@app.middleware("http")
+async def first_response_timing(request: Request, call_next):
+    response = await call_next(request)
+    if not cold_start.marked("first_response"):
+        cold_start.mark("first_response")
+        logger.info(f"Cold start: {cold_start.report()}")
+    return response
+
+@app.get("/cold-start")
+async def cold_start_report():
+    """Import, model load and first-response timings of this instance"""
+    return {
+        "cold_start_mode": COLD_START_MODE,
+        "gallery_index": celeb_index is not None,
+        "deepface_loaded": deepface.loaded,
+        **cold_start.report()
+    }
 
 @app.get("/")
 async def root():
+    ensure_celebrities()
     return {
         "message": "AI Face Analysis API is running!", 
         "celebrities_loaded": len(celeb_names), 
-        "csv_data_loaded": len(celeb_data),
+        "csv_data_loaded": csv_record_count(),
         "deepface_available": DEEPFACE_AVAILABLE
     }
 
 @app.get("/health")
 async def health_check():
+    ensure_celebrities()
     return {
         "status": "healthy", 
         "celebrities_count": len(celeb_names), 
-        "csv_records": len(celeb_data),
+        "csv_records": csv_record_count(),
         "deepface_available": DEEPFACE_AVAILABLE
     }
 
@@ -259,6 +344,7 @@ async def analyze_face(file: UploadFile = File(...)):
             beauty_score = calculate_beauty_score(age, gender, emotion, facial_features)
         
             # Find celebrity lookalike
+            ensure_celebrities()
             lookalike_result = find_celebrity_lookalike(beauty_score, age, gender)
         
             # Prepare response
@@ -273,7 +359,7 @@ async def analyze_face(file: UploadFile = File(...)):
                     "facial_features": facial_features
                 },
                 "lookalike": lookalike_result,
-                "timestamp": str(np.datetime64('now'))
+                "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
             }
         
             logger.info(f"Analysis completed: Age={age}, Gender={gender}, Beauty={beauty_score}")
@@ -304,74 +390,39 @@ async def analyze_face(file: UploadFile = File(...)):
         )
 
 @app.get("/celebrities/")
-async def get_celebrities():
-    """Get list of loaded celebrities with CSV data"""
-    celebrities = []
-    for i, (name, img) in enumerate(zip(celeb_names, celeb_images)):
-        info = find_celeb_info(name)
-        celebrities.append({
-            "name": name,
-            "image": img,
-            "info": info
-        })
-    return {
-        "count": len(celeb_names),
-        "celebrities": celebrities
-    }
+async def get_celebrities(request: Request, offset: int = 0, limit: int = celebrity_catalog.DEFAULT_PAGE_SIZE,
+                          group: Optional[str] = None, gender: Optional[str] = None, q: Optional[str] = None):
+    """List loaded celebrities, filtered by group, gender (M/F) or name prefix (q), one page at a time"""
+    encoding = api_responses.choose_encoding(request.headers.get("accept-encoding", ""))
+    body, etag, encoding = get_catalog().page(offset, limit, group, gender, q, encoding)
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache", "Vary": "Accept-Encoding"}
+    if celebrity_catalog.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
 
 @app.get("/csv-stats/")
 async def get_csv_stats():
     """Get CSV data statistics"""
+    ensure_celebrities()
     return {
-        "total_records": len(celeb_data),
-        "sample_records": celeb_data[:5] if celeb_data else []
+        "total_records": csv_record_count(),
+        "sample_records": csv_sample(5)
     }
 
 @app.post("/reload-celebrities/")
 async def reload_celebrities():
     """Reload celebrity database"""
     load_celebrities()
-    return {"message": f"Reloaded {len(celeb_names)} celebrities and {len(celeb_data)} CSV records"}
+    return {"message": f"Reloaded {len(celeb_names)} celebrities and {csv_record_count()} CSV records"}
+
+# Firebase Functions entry point: requests go through the FastAPI app itself (routing,
+# multipart uploads, JSON responses) on an event loop that persists across invocations
+bridge = ASGIBridge(app)
 
-# Firebase Functions wrapper
 @https_fn.on_request()
 def face_analysis_api(req: https_fn.Request) -> https_fn.Response:
     """Firebase Functions wrapper for the FastAPI app"""
-    import asyncio
-    from fastapi.responses import JSONResponse
-    
-    # Convert Firebase request to FastAPI request
-    async def handle_request():
-        # This is a simplified wrapper - in production you'd want a more robust solution
-        if req.method == "GET":
-            if req.path == "/health":
-                return await health_check()
-            elif req.path == "/celebrities/":
-                return await get_celebrities()
-            elif req.path == "/csv-stats/":
-                return await get_csv_stats()
-            else:
-                return await root()
-        elif req.method == "POST":
-            if req.path == "/analyze/":
-                # Handle file upload
-                # This is a simplified version - you'd need to properly handle multipart form data
-                return {"message": "File upload endpoint - implement file handling"}
-            elif req.path == "/reload-celebrities/":
-                return await reload_celebrities()
-        
-        return {"error": "Endpoint not found"}
-    
-    try:
-        result = asyncio.run(handle_request())
-        return https_fn.Response(
-            str(result),
-            status=200,
-            headers={"Content-Type": "application/json"}
-        )
-    except Exception as e:
-        return https_fn.Response(
-            str({"error": str(e)}),
-            status=500,
-            headers={"Content-Type": "application/json"}
-        ) 
\ No newline at end of file
+    status, headers, body = bridge.handle(req)
+    return https_fn.Response(body, status=status, headers=headers)
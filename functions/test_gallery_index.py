@@ -0,0 +1,48 @@
+"""
+gallery_index.py lookups against the real kpopidolsv3.csv header.
+
+    cd functions && python -m pytest test_gallery_index.py
+"""
+
+import os
+
+import pytest
+
+import gallery_index
+
+CSV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kpopidolsv3.csv")
+GALLERY_NAMES = ["BLACKPINK_Jennie", "Kim_Younghoon", "2Soul", "Ana_de_Armas"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    gallery = tmp_path / "celebrities"
+    gallery.mkdir()
+    for name in GALLERY_NAMES:
+        (gallery / f"{name}.jpg").write_bytes(b"\xff\xd8\xff")
+    out = str(tmp_path / "gallery_index.bin")
+    gallery_index.build(str(gallery), CSV_FILE, out)
+    return gallery_index.load(out)
+
+
+def test_csv_header_has_no_name_column():
+    with open(CSV_FILE, "r", encoding="utf-8-sig") as f:
+        header = f.readline().strip().split(",")
+    assert "name" not in header
+    assert header[:2] == ["Stage Name", "Full Name"] and "Group" in header
+
+
+def test_find_by_group_and_stage_name(index):
+    record = index.find("BLACKPINK_Jennie")
+    assert record["Stage Name"] == "Jennie"
+    assert record["Group"] == "BLACKPINK"
+
+
+def test_find_by_full_and_stage_name(index):
+    assert index.find("Kim_Younghoon")["Stage Name"] == "2Soul"
+    assert index.find("2Soul")["Full Name"] == "Kim Younghoon"
+
+
+def test_unknown_name(index):
+    assert index.find("Ana_de_Armas") == {}
+    assert index.names == sorted(GALLERY_NAMES)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash deduplication for the celebrity gallery.
+
+Different search terms for the same idol ("face", "portrait", "photo",
+"headshot") often return the same picture re-encoded or resized. This pass
+computes a 64-bit DCT perceptual hash for every gallery image in a process
+pool, clusters images whose hashes are within --threshold bits of each other
+across the whole gallery, and keeps the best copy of each cluster: the most
+pixels, then the largest file. Clusters are chained (A~B and B~C puts A and C
+together), so only images within --threshold of the kept copy are removed;
+the rest of the cluster is planned again around its own best copy.
+
+Duplicates inside one identity folder are removed. Near-duplicates that span
+different identities are only reported (by default), because they usually
+mean a group photo or a mislabelled image that needs a human look.
+
+Usage:
+    python gallery_dedup.py                   # report only
+    python gallery_dedup.py --apply           # delete duplicates
+    python gallery_dedup.py --apply --quarantine dupes/ --threshold 4
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from gallery_layout import GALLERY_DIR, IMAGE_EXTENSIONS
+
+HASH_SIZE = 8
+HASH_SCALE = 4
+DEFAULT_THRESHOLD = 6
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    matrix = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+DCT = _dct_matrix(HASH_SIZE * HASH_SCALE)
+POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def phash_pixels(gray: np.ndarray) -> int:
+    """64-bit pHash of a 32x32 grayscale array: low-frequency DCT coefficients above their median"""
+    coefficients = (DCT @ gray.astype(np.float64) @ DCT.T)[:HASH_SIZE, :HASH_SIZE].flatten()
+    bits = coefficients > np.median(coefficients[1:])
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hash_image(path: str) -> Optional[Dict[str, Any]]:
+    """Worker: hash one image file; None if it cannot be decoded"""
+    from PIL import Image
+
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            img.draft("L", (HASH_SIZE * HASH_SCALE * 4,) * 2)
+            side = HASH_SIZE * HASH_SCALE
+            gray = np.asarray(img.convert("L").resize((side, side), Image.LANCZOS))
+        return {"path": path, "hash": phash_pixels(gray), "pixels": width * height, "bytes": os.path.getsize(path)}
+    except Exception:
+        return None
+
+
+def gallery_images(root: str) -> List[str]:
+    paths = []
+    for entry in os.scandir(root):
+        if entry.is_dir():
+            paths.extend(os.path.join(entry.path, f.name) for f in os.scandir(entry.path)
+                         if f.is_file() and f.name.lower().endswith(IMAGE_EXTENSIONS))
+        elif entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+            paths.append(entry.path)
+    return sorted(paths)
+
+
+def hash_gallery(paths: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Hash every image in a process pool"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(hash_image, paths, chunksize=max(1, len(paths) // ((workers or os.cpu_count() or 1) * 8)))
+        return [r for r in results if r is not None]
+
+
+def hamming_pairs(hashes: np.ndarray, threshold: int, block: int = 1024):
+    """Yield (i, j) index pairs with i < j whose hashes differ in at most ``threshold`` bits"""
+    for start in range(0, len(hashes), block):
+        rows = hashes[start:start + block]
+        xor = rows[:, None] ^ hashes[None, :]
+        distances = POPCOUNT8[xor.view(np.uint8)].reshape(len(rows), len(hashes), 8).sum(axis=2)
+        for i, j in zip(*np.nonzero(distances <= threshold)):
+            if start + i < j:
+                yield start + int(i), int(j)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def cluster(records: List[Dict[str, Any]], threshold: int = DEFAULT_THRESHOLD) -> List[List[Dict[str, Any]]]:
+    """Group near-duplicate images (union-find over hash pairs within ``threshold``, so transitive)"""
+    parent = list(range(len(records)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    hashes = np.array([r["hash"] for r in records], dtype=np.uint64)
+    for i, j in hamming_pairs(hashes, threshold):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+    groups: Dict[int, List[Dict[str, Any]]] = {}
+    for i, record in enumerate(records):
+        groups.setdefault(find(i), []).append(record)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def plan(clusters: List[List[Dict[str, Any]]], across_identities: bool = False,
+         threshold: int = DEFAULT_THRESHOLD) -> Dict[str, Any]:
+    """Pick the copy to keep in each cluster and the files to remove"""
+    remove, conflicts = [], []
+    for group in clusters:
+        by_identity: Dict[str, List[Dict[str, Any]]] = {}
+        for record in group:
+            by_identity.setdefault(os.path.dirname(record["path"]), []).append(record)
+        if len(by_identity) > 1:
+            conflicts.append(sorted(r["path"] for r in group))
+        buckets = [group] if across_identities else list(by_identity.values())
+        for bucket in buckets:
+            ranked = sorted(bucket, key=lambda r: (r["pixels"], r["bytes"]), reverse=True)
+            while ranked:
+                # Only direct near-duplicates of the kept copy go; the others may be another picture
+                kept, rest = ranked[0], []
+                for r in ranked[1:]:
+                    if hamming(r["hash"], kept["hash"]) <= threshold:
+                        remove.append({"path": r["path"], "bytes": r["bytes"], "kept": kept["path"]})
+                    else:
+                        rest.append(r)
+                ranked = rest
+    return {"remove": remove, "conflicts": conflicts, "bytes_saved": sum(r["bytes"] for r in remove)}
+
+
+def apply_plan(result: Dict[str, Any], root: str, quarantine: Optional[str] = None):
+    for item in result["remove"]:
+        if quarantine:
+            target = os.path.join(quarantine, os.path.relpath(item["path"], root))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.move(item["path"], target)
+        else:
+            os.remove(item["path"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find and remove near-duplicate gallery images")
+    parser.add_argument("root", nargs="?", default=GALLERY_DIR)
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD, help="max differing hash bits")
+    parser.add_argument("--workers", type=int, help="hashing processes (default: CPU count)")
+    parser.add_argument("--across-identities", action="store_true",
+                        help="also remove duplicates that span identity folders")
+    parser.add_argument("--apply", action="store_true", help="remove duplicates (default: report only)")
+    parser.add_argument("--quarantine", help="move duplicates here instead of deleting them")
+    parser.add_argument("--json", action="store_true", help="print the plan as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = gallery_images(args.root)
+    records = hash_gallery(paths, args.workers)
+    hashed = time.perf_counter()
+    clusters = cluster(records, args.threshold)
+    result = plan(clusters, args.across_identities, args.threshold)
+    if args.apply:
+        apply_plan(result, args.root, args.quarantine)
+
+    if args.json:
+        print(json.dumps(dict(result, images=len(paths), clusters=len(clusters)), indent=2))
+        return
+    print(f"🔍 Hashed {len(records)}/{len(paths)} images in {hashed - start:.1f}s, "
+          f"clustered in {time.perf_counter() - hashed:.2f}s")
+    print(f"🧩 {len(clusters)} near-duplicate clusters, {len(result['conflicts'])} spanning several identities")
+    for paths_in_conflict in result["conflicts"][:10]:
+        print(f"   ⚠️  {', '.join(paths_in_conflict)}")
+    action = "Removed" if args.apply else "Would remove"
+    print(f"🗑️  {action} {len(result['remove'])} duplicates, saving {result['bytes_saved'] / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
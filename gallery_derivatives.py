@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Derivative store for gallery images.
+
+For every gallery image this writes, addressed by the sha256 of the original
+file:
+
+    gallery_derivatives/crops/ab/<sha256>.jpg    112x112 face crop aligned to the ArcFace template
+    gallery_derivatives/thumbs/ab/<sha256>.webp  small WebP thumbnail for the UI
+    gallery_derivatives/meta/ab/<sha256>.json    face box, landmarks, alignment method, sizes
+    gallery_derivatives/media/ab/<sha256>-<size>.webp|.jpg
+                                                 128/256/512 px variants the API serves at /media/
+
+and gallery_derivatives/index.json maps each gallery path to its hash. Index
+rebuilds can then embed the tiny crops directly instead of re-decoding and
+re-detecting the originals, and thumbnails can be served without them.
+
+Work runs in a process pool. Files whose size and mtime match the index are
+skipped without being read, and identical content (the same picture under two
+identities) is stored once. An image whose derivatives fail to encode is
+reported as an error and left out of the index, so the next run retries it.
+
+Alignment uses the five YuNet landmarks when FACE_DETECTOR_MODEL is set,
+otherwise eye centres from OpenCV's eye cascade, otherwise a square crop around
+the detected face box.
+
+Usage:
+    python gallery_derivatives.py
+    python gallery_derivatives.py celebrities --out gallery_derivatives --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from face_validation import DETECT_MAX_SIDE, detect_faces_with_landmarks, haar_cascade
+from gallery_dedup import gallery_images
+from gallery_layout import GALLERY_DIR
+from gallery_media import GALLERY_DERIVATIVES_DIR, MEDIA_SIZES, media_name, variant_paths
+
+CROP_SIZE = 112
+THUMB_SIZE = 256
+# ArcFace reference landmarks for a 112x112 crop: eyes, nose tip, mouth corners
+ARCFACE_TEMPLATE = np.array([
+    [38.2946, 51.6963], [73.5318, 51.5014], [56.0252, 71.7366], [41.5493, 92.3655], [70.7299, 92.2041],
+], dtype=np.float32)
+
+
+def derivative_paths(root: str, sha256: str) -> Dict[str, str]:
+    shard = sha256[:2]
+    return {
+        "crop": os.path.join(root, "crops", shard, f"{sha256}.jpg"),
+        "thumb": os.path.join(root, "thumbs", shard, f"{sha256}.webp"),
+        "meta": os.path.join(root, "meta", shard, f"{sha256}.json"),
+    }
+
+
+def is_complete(root: str, sha256: str) -> bool:
+    """Meta is written last, so with it and every media variant present nothing is left to build"""
+    return os.path.exists(derivative_paths(root, sha256)["meta"]) and \
+        all(_built(path) for path in variant_paths(root, sha256).values())
+
+
+def _built(path: str) -> bool:
+    # Empty files are what an unchecked failed encode used to leave behind
+    try:
+        return os.path.getsize(path) > 0
+    except OSError:
+        return False
+
+
+def encode(img: np.ndarray, ext: str, params: List[int]) -> bytes:
+    """cv2.imencode that raises instead of returning an empty buffer (e.g. OpenCV built without WebP)"""
+    import cv2
+
+    ok, encoded = cv2.imencode(f".{ext}", img, params)
+    if not ok or not len(encoded):
+        raise ValueError(f"could not encode .{ext} ({img.shape[1]}x{img.shape[0]})")
+    return encoded.tobytes()
+
+
+def write_media_variants(img: np.ndarray, root: str, sha256: str):
+    """WebP and JPEG at each MEDIA_SIZES longest side (never upscaled)"""
+    import cv2
+
+    paths = variant_paths(root, sha256)
+    height, width = img.shape[:2]
+    for size in MEDIA_SIZES:
+        scale = min(1.0, size / max(height, width))
+        resized = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else img
+        for ext, params in (("webp", [cv2.IMWRITE_WEBP_QUALITY, 80]),
+                            ("jpg", [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_PROGRESSIVE, 1])):
+            path = paths[media_name(sha256, size, ext)]
+            if not _built(path):
+                # Served as immutable for a year, so a failed encode must never reach the file
+                _write(path, encode(resized, ext, params))
+
+
+def _write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.part"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def eye_landmarks(gray: np.ndarray, box: List[int]) -> Optional[List[List[float]]]:
+    """Left and right eye centres inside a face box, or None if both are not found"""
+    x, y, w, h = box
+    upper = gray[y:y + h // 2, x:x + w]
+    if upper.size == 0:
+        return None
+    eyes = haar_cascade("haarcascade_eye.xml").detectMultiScale(upper, 1.1, 5, minSize=(max(1, w // 10),) * 2)
+    if len(eyes) < 2:
+        return None
+    eyes = sorted(eyes, key=lambda e: e[2] * e[3], reverse=True)[:2]
+    centres = sorted([[x + ex + ew / 2.0, y + ey + eh / 2.0] for ex, ey, ew, eh in eyes])
+    # Eyes must be side by side, not stacked
+    if centres[1][0] - centres[0][0] < w * 0.2:
+        return None
+    return centres
+
+
+def aligned_crop(img: np.ndarray, box: List[int], landmarks: Optional[List[List[float]]]) -> np.ndarray:
+    """112x112 crop, similarity-aligned to the ArcFace template when landmarks are known"""
+    import cv2
+
+    if landmarks is not None:
+        points = np.array(landmarks, dtype=np.float32)
+        matrix, _ = cv2.estimateAffinePartial2D(points, ARCFACE_TEMPLATE[:len(points)], method=cv2.LMEDS)
+        if matrix is not None:
+            return cv2.warpAffine(img, matrix, (CROP_SIZE, CROP_SIZE), borderMode=cv2.BORDER_REPLICATE)
+    # No landmarks: square crop around the box with some margin, like the template's framing
+    x, y, w, h = box
+    side = int(max(w, h) * 1.25)
+    cx, cy = x + w / 2.0, y + h / 2.0
+    matrix = np.array([[CROP_SIZE / side, 0, CROP_SIZE / 2 - cx * CROP_SIZE / side],
+                       [0, CROP_SIZE / side, CROP_SIZE / 2 - cy * CROP_SIZE / side]], dtype=np.float32)
+    return cv2.warpAffine(img, matrix, (CROP_SIZE, CROP_SIZE), borderMode=cv2.BORDER_REPLICATE)
+
+
+def process_image(path: str, out_dir: str) -> Dict[str, Any]:
+    """Worker: build the derivatives of one gallery image"""
+    import cv2
+
+    with open(path, "rb") as f:
+        data = f.read()
+    stat = os.stat(path)
+    sha256 = hashlib.sha256(data).hexdigest()
+    entry: Dict[str, Any] = {"hash": sha256, "size": stat.st_size, "mtime": stat.st_mtime}
+    paths = derivative_paths(out_dir, sha256)
+    if is_complete(out_dir, sha256):
+        entry["status"] = "cached"
+        return entry
+
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        entry["status"] = "undecodable"
+        return entry
+    if os.path.exists(paths["meta"]):
+        # Built before the media variants existed
+        write_media_variants(img, out_dir, sha256)
+        entry["status"] = "cached"
+        return entry
+    height, width = img.shape[:2]
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+    scale = min(1.0, DETECT_MAX_SIDE / max(height, width))
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+    faces = detect_faces_with_landmarks(small, max(16, int(0.1 * min(small.shape))))
+    meta: Dict[str, Any] = {"hash": sha256, "width": width, "height": height, "box": None,
+                            "landmarks": None, "alignment": None}
+    if faces:
+        box = [int(round(v / scale)) for v in faces[0]["box"]]
+        landmarks = faces[0]["landmarks"]
+        if landmarks is not None:
+            landmarks = [[round(px / scale, 1), round(py / scale, 1)] for px, py in landmarks]
+            alignment = "landmarks5"
+        else:
+            landmarks = eye_landmarks(gray, box)
+            alignment = "eyes" if landmarks else "box"
+        meta.update(box=box, landmarks=landmarks, alignment=alignment)
+        _write(paths["crop"], encode(aligned_crop(img, box, landmarks), "jpg", [cv2.IMWRITE_JPEG_QUALITY, 95]))
+
+    thumb_scale = min(1.0, THUMB_SIZE / max(height, width))
+    thumb = cv2.resize(img, None, fx=thumb_scale, fy=thumb_scale, interpolation=cv2.INTER_AREA) if thumb_scale < 1.0 else img
+    _write(paths["thumb"], encode(thumb, "webp", [cv2.IMWRITE_WEBP_QUALITY, 80]))
+    meta["thumb_size"] = [thumb.shape[1], thumb.shape[0]]
+    write_media_variants(img, out_dir, sha256)
+    # Meta last: its presence marks the derivatives complete
+    _write(paths["meta"], json.dumps(meta).encode("utf-8"))
+    entry["status"] = "built"
+    entry["alignment"] = meta["alignment"]
+    return entry
+
+
+def _process(args):
+    path, out_dir = args
+    try:
+        return path, process_image(path, out_dir)
+    except Exception as e:
+        return path, {"status": "error", "error": str(e)}
+
+
+def load_index(out_dir: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(os.path.join(out_dir, "index.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def build(root: str = GALLERY_DIR, out_dir: str = GALLERY_DERIVATIVES_DIR,
+          workers: Optional[int] = None) -> Dict[str, Any]:
+    """Bring the derivative store up to date with the gallery"""
+    previous = load_index(out_dir)
+    index: Dict[str, Dict[str, Any]] = {}
+    todo = []
+    for path in gallery_images(root):
+        key = os.path.relpath(path, root)
+        stat = os.stat(path)
+        old = previous.get(key)
+        if old and old["size"] == stat.st_size and old["mtime"] == stat.st_mtime \
+                and is_complete(out_dir, old["hash"]):
+            index[key] = old
+        else:
+            todo.append(path)
+
+    counts: Dict[str, int] = {"unchanged": len(index)}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(todo) // ((workers or os.cpu_count() or 1) * 8))
+        for path, entry in pool.map(_process, [(p, out_dir) for p in todo], chunksize=chunksize):
+            status = entry.pop("status")
+            counts[status] = counts.get(status, 0) + 1
+            if status == "built":
+                counts[entry["alignment"] or "no_face"] = counts.get(entry["alignment"] or "no_face", 0) + 1
+            entry.pop("alignment", None)
+            if "hash" in entry and status in ("built", "cached"):
+                index[os.path.relpath(path, root)] = entry
+
+    os.makedirs(out_dir, exist_ok=True)
+    _write(os.path.join(out_dir, "index.json"), json.dumps(index, sort_keys=True).encode("utf-8"))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build aligned crops, thumbnails and landmarks for the gallery")
+    parser.add_argument("root", nargs="?", default=GALLERY_DIR)
+    parser.add_argument("--out", default=GALLERY_DERIVATIVES_DIR)
+    parser.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = build(args.root, args.out, args.workers)
+    print(f"🖼️  Derivatives up to date in {time.perf_counter() - start:.1f}s: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Bulk import of face dataset archives into the gallery.
+
+The old retry_failed_downloads.py pulled datasets through the GitHub contents
+API one file at a time with a sleep between downloads. This streams a whole
+archive instead, from a URL or a local path:
+
+- tar archives (plain, .gz, .bz2, .xz) are read member by member straight off
+  the network; zip archives are spooled to a temporary file first, since their
+  directory sits at the end.
+- Members are face-validated (face_validation.py) in a process pool while the
+  archive keeps streaming, and written into celebrities/<Name>/000001.jpg, ...
+  after any images already there.
+- Every member is recorded in the ingestion manifest as <source>#<member>, so
+  re-importing the same archive skips what is already in the gallery.
+
+The identity is the member's parent folder (Name/xyz.jpg), or for files at
+the archive root the file name without its numbering (Name_001.jpg). Use
+--strip-components to drop a wrapping folder such as GitHub's <repo>-main/.
+
+Usage:
+    python gallery_import.py https://github.com/PCEO-AI-CLUB/KID-F/archive/refs/heads/main.zip --strip-components 1
+    python gallery_import.py faces.tar.gz --per-identity 5 --workers 4
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import io
+import logging
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+import httpx
+
+import ingest_manifest
+from face_validation import validate_image
+from gallery_ingest import MIN_IMAGE_BYTES, USER_AGENT, valid_image, write_atomic
+from gallery_layout import GALLERY_DIR, IMAGE_EXTENSIONS, clean_name, existing_images
+from ingest_manifest import IngestManifest
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PROVIDER = "archive"
+MAX_MEMBER_BYTES = 20 * 1024 * 1024
+ZIP_MAGIC = b"PK\x03\x04"
+CHUNK_SIZE = 1024 * 1024
+
+
+class StreamReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks (e.g. an HTTP response body)"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+@contextlib.contextmanager
+def open_source(source: str, timeout: float = 60.0) -> Iterator[io.BufferedReader]:
+    """Buffered binary stream for a local archive or an http(s) URL"""
+    if not source.startswith(("http://", "https://")):
+        with open(source, "rb") as f:
+            yield f
+        return
+    with httpx.Client(timeout=timeout, follow_redirects=True, headers={"User-Agent": USER_AGENT}) as client:
+        with client.stream("GET", source) as response:
+            response.raise_for_status()
+            yield io.BufferedReader(StreamReader(response.iter_bytes(CHUNK_SIZE)), CHUNK_SIZE)
+
+
+def is_image_name(name: str) -> bool:
+    base = os.path.basename(name)
+    return base.lower().endswith(IMAGE_EXTENSIONS) and not base.startswith(".")
+
+
+def archive_members(fileobj: BinaryIO) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """(member name, bytes) for every image in a zip or tar stream; bytes is None when oversized"""
+    if fileobj.peek(4)[:4] == ZIP_MAGIC:
+        with contextlib.ExitStack() as stack:
+            if not fileobj.seekable():
+                # The zip directory is at the end of the file: spool the download to disk first
+                spool = stack.enter_context(tempfile.TemporaryFile())
+                shutil.copyfileobj(fileobj, spool, CHUNK_SIZE)
+                fileobj = spool
+            archive = stack.enter_context(zipfile.ZipFile(fileobj))
+            for info in archive.infolist():
+                if info.is_dir() or not is_image_name(info.filename):
+                    continue
+                yield info.filename, archive.read(info) if info.file_size <= MAX_MEMBER_BYTES else None
+        return
+    with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile() or not is_image_name(member.name):
+                continue
+            yield member.name, archive.extractfile(member).read() if member.size <= MAX_MEMBER_BYTES else None
+
+
+def safe_member_path(member: str) -> bool:
+    """False for absolute paths, drive prefixes and any ".." component (archive path traversal)"""
+    path = member.replace("\\", "/")
+    if path.startswith("/") or re.match(r"^[A-Za-z]:", path):
+        return False
+    return ".." not in path.split("/")
+
+
+def member_identity(member: str, strip_components: int = 0) -> Optional[str]:
+    """Identity name for an archive member: its folder, or its file name without numbering"""
+    if not safe_member_path(member):
+        return None
+    parts = [p for p in member.replace("\\", "/").split("/") if p not in ("", ".")][strip_components:]
+    if not parts:
+        return None
+    if len(parts) >= 2:
+        name = parts[-2]
+    else:
+        name = re.sub(r"[\s_\-]*\(?\d+\)?$", "", os.path.splitext(parts[-1])[0])
+    name = name.replace("_", " ").strip()
+    return name or None
+
+
+def check_image(data: bytes, check_faces: bool = True, **thresholds) -> Optional[str]:
+    """Worker: rejection reason for an image, or None if it belongs in the gallery"""
+    if check_faces:
+        return validate_image(data, **thresholds)["reason"]
+    return None if valid_image(data) else "undecodable"
+
+
+class ArchiveImporter:
+    """Streams archive members through a validation pool into the gallery folders"""
+
+    def __init__(self, out_dir: str = GALLERY_DIR, manifest: Optional[IngestManifest] = None,
+                 workers: Optional[int] = None, per_identity: Optional[int] = None,
+                 strip_components: int = 0, check_faces: bool = True, **thresholds):
+        self.out_dir = out_dir
+        self.manifest = manifest
+        self.workers = workers or os.cpu_count() or 1
+        self.per_identity = per_identity
+        self.strip_components = strip_components
+        self.check = functools.partial(check_image, check_faces=check_faces, **thresholds)
+        self.identities: Dict[str, Dict[str, Any]] = {}
+        self.stats: Dict[str, int] = {}
+
+    def _count(self, key: str, amount: int = 1):
+        self.stats[key] = self.stats.get(key, 0) + amount
+
+    def _inside_gallery(self, folder: str) -> bool:
+        # realpath also catches identity folders that are symlinks to somewhere else
+        root = os.path.realpath(self.out_dir)
+        return os.path.realpath(folder).startswith(root + os.sep)
+
+    def _identity(self, name: str) -> Optional[Dict[str, Any]]:
+        """Per-identity import state, or None if its folder would land outside the gallery"""
+        state = self.identities.get(name)
+        if state is None:
+            folder = os.path.join(self.out_dir, clean_name(name))
+            if not self._inside_gallery(folder):
+                logger.warning(f"Refusing identity {name!r}: {folder} is outside {self.out_dir}")
+                return None
+            have = existing_images(folder)
+            state = {
+                "folder": folder,
+                "images": len(have),
+                "next_index": max((int(f.split(".")[0]) for f in have if f.split(".")[0].isdigit()), default=0) + 1,
+                "hashes": set(),
+                "seen": set(),
+                "dead": set(),
+            }
+            if self.manifest is not None:
+                self.manifest.start(name, folder)
+                state["hashes"] = self.manifest.saved_hashes(name)
+                state["dead"] = self.manifest.dead_urls(name)
+            self.identities[name] = state
+        return state
+
+    def _full(self, state: Dict[str, Any]) -> bool:
+        return self.per_identity is not None and state["images"] >= self.per_identity
+
+    def _record(self, name: str, url: str, outcome: str, size: Optional[int] = None,
+                sha256: Optional[str] = None, path: Optional[str] = None, reason: Optional[str] = None):
+        if self.manifest is not None:
+            self.manifest.record_fetch(name, ARCHIVE_PROVIDER, url, outcome, None, size, sha256, path, reason)
+
+    def _save(self, job: Dict[str, Any], reason: Optional[str]):
+        name, url, data = job["name"], job["url"], job["data"]
+        state = self.identities[name]
+        if reason:
+            self._count(f"rejected_{reason}")
+            self._record(name, url, ingest_manifest.REJECTED, len(data), job["sha256"], reason=reason)
+            return
+        if self._full(state):
+            self._count("over_limit")
+            return
+        os.makedirs(state["folder"], exist_ok=True)
+        if not self._inside_gallery(state["folder"]):
+            # The folder was swapped for a symlink after the identity was first seen
+            self._count("rejected_unsafe_path")
+            return
+        ext = ".png" if job["member"].lower().endswith(".png") else ".jpg"
+        path = os.path.join(state["folder"], f"{state['next_index']:06d}{ext}")
+        write_atomic(path, data)
+        state["next_index"] += 1
+        state["images"] += 1
+        self._count("saved")
+        self._count("bytes", len(data))
+        self._record(name, url, ingest_manifest.SAVED, len(data), job["sha256"], path)
+
+    def run(self, source: str) -> Dict[str, int]:
+        """Import every image in ``source``; returns counters by outcome"""
+        # Bounded window of in-flight validations: keeps all workers busy without
+        # holding the whole archive in memory
+        window = self.workers * 4
+        pending: deque = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool, open_source(source) as stream:
+            for member, data in archive_members(stream):
+                self._count("members")
+                if not safe_member_path(member):
+                    logger.warning(f"Skipping unsafe archive member path {member!r}")
+                    self._count("rejected_unsafe_path")
+                    continue
+                name = member_identity(member, self.strip_components)
+                if name is None:
+                    self._count("skipped_no_identity")
+                    continue
+                state = self._identity(name)
+                if state is None:
+                    self._count("rejected_unsafe_path")
+                    continue
+                url = f"{source}#{member}"
+                if data is None:
+                    self._count("skipped_too_large")
+                    continue
+                if url in state["dead"] or self._full(state):
+                    self._count("skipped")
+                    continue
+                if len(data) < MIN_IMAGE_BYTES:
+                    self._count("rejected_too_small")
+                    self._record(name, url, ingest_manifest.REJECTED, len(data), reason="too_small")
+                    continue
+                sha256 = hashlib.sha256(data).hexdigest()
+                if sha256 in state["hashes"]:
+                    self._count("already_imported")
+                    continue
+                if sha256 in state["seen"]:
+                    self._count("duplicate_images")
+                    self._record(name, url, ingest_manifest.DUPLICATE, len(data), sha256)
+                    continue
+                state["seen"].add(sha256)
+                job = {"name": name, "member": member, "url": url, "data": data, "sha256": sha256}
+                pending.append((job, pool.submit(self.check, data)))
+                while len(pending) >= window:
+                    job, future = pending.popleft()
+                    self._save(job, future.result())
+            while pending:
+                job, future = pending.popleft()
+                self._save(job, future.result())
+
+        if self.manifest is not None:
+            for name, state in self.identities.items():
+                self.manifest.finish(name, state["images"], self.per_identity or 1)
+        self.stats["identities"] = len(self.identities)
+        return self.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a zip/tar face dataset into the gallery")
+    parser.add_argument("source", help="archive path or http(s) URL")
+    parser.add_argument("--out", default=GALLERY_DIR)
+    parser.add_argument("--strip-components", type=int, default=0,
+                        help="leading folders to drop from member paths (1 for GitHub archives)")
+    parser.add_argument("--per-identity", type=int, help="stop at this many images per identity")
+    parser.add_argument("--workers", type=int, help="validation processes (default: CPU count)")
+    parser.add_argument("--manifest", default=ingest_manifest.INGEST_MANIFEST_DB, help="SQLite ingestion manifest")
+    parser.add_argument("--no-manifest", action="store_true")
+    parser.add_argument("--no-face-check", action="store_true", help="accept any decodable image")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+    importer = ArchiveImporter(
+        args.out, manifest=None if args.no_manifest else IngestManifest(args.manifest), workers=args.workers,
+        per_identity=args.per_identity, strip_components=args.strip_components,
+        check_faces=not args.no_face_check,
+    )
+    print(f"📦 Importing {args.source} into {args.out}/ with {importer.workers} workers")
+    start = time.perf_counter()
+    stats = importer.run(args.source)
+    elapsed = time.perf_counter() - start
+    print(f"\n🎉 {stats.get('saved', 0)} of {stats.get('members', 0)} images imported for "
+          f"{stats['identities']} identities in {elapsed:.1f}s "
+          f"({stats.get('members', 0) / elapsed if elapsed else 0:.0f} images/s)")
+    print(f"📊 {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,689 @@
+#!/usr/bin/env python3
+"""
+Concurrent celebrity gallery ingestion.
+
+The one gallery ingestion path; it replaces the download_*.py and
+retry_failed_downloads.py scripts, which each ran the same loop serially. For
+every identity, ask the image search providers for candidate URLs and download
+the first few valid images into celebrities/<Name>/000001.jpg, 000002.jpg, ...
+Names come from celebrities.txt (which now also holds the scripts' hand-kept
+lists) and/or the K-pop idols CSV; failed identities are retried from the
+manifest rather than from a hard-coded list.
+
+- Identities are processed concurrently (--concurrency) over one pooled
+  httpx.AsyncClient instead of one at a time with time.sleep(1-4).
+- Every request goes through a per-host token bucket, so search APIs and image
+  hosts are each rate limited independently; a 429 pauses only that host.
+- Sources are pluggable providers (Wikipedia, DuckDuckGo, Bing, Unsplash,
+  Google CSE) tried in the order given; add one with @register_provider.
+- Each downloaded image is checked for exactly one large, sharp face in a
+  process pool (face_validation.py) before it is written.
+- Provider search responses go through an on-disk HTTP cache (http_cache.py),
+  so repeat crawls and retries mostly run from local data.
+- Progress is kept in the SQLite manifest (ingest_manifest.py), so a crashed
+  or repeated run only works on identities that are missing images or due
+  for a retry, and skips URLs that already failed for good.
+- --refresh revalidates saved images against their source URL with
+  If-None-Match / If-Modified-Since; only images that changed are downloaded,
+  validated and replaced in place.
+
+Usage:
+    python gallery_ingest.py --names celebrities.txt --providers wikipedia,duckduckgo,bing --concurrency 16
+    python gallery_ingest.py --csv kpopidolsv3.csv --per-identity 1 --limit 50
+    python gallery_ingest.py --rate upload.wikimedia.org=20 --rate www.bing.com=0.5 BTS Jimin
+    python gallery_ingest.py --refresh --refresh-days 14
+"""
+
+import argparse
+import asyncio
+import hashlib
+import html
+import io
+import logging
+import os
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Type
+from urllib.parse import quote, urlsplit
+
+import httpx
+
+import http_cache
+import ingest_manifest
+from face_validation import FaceValidator
+from gallery_layout import GALLERY_DIR, clean_name, existing_images
+from http_cache import HTTPCache
+from ingest_manifest import IngestManifest
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+MIN_IMAGE_BYTES = 5000
+
+# Requests per second and burst per host; anything not listed uses DEFAULT_HOST_RATE
+HOST_RATES: Dict[str, tuple] = {
+    "en.wikipedia.org": (10.0, 10),
+    "upload.wikimedia.org": (10.0, 10),
+    "api.duckduckgo.com": (1.0, 2),
+    "www.bing.com": (1.0, 2),
+    "api.unsplash.com": (50 / 3600.0, 5),  # demo apps get 50 requests/hour
+    "www.googleapis.com": (1.0, 2),
+}
+DEFAULT_HOST_RATE = (float(os.getenv("GALLERY_HOST_RATE", "4")), 4)
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """Async token bucket; waiters are served in arrival order"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(float(burst), 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class HostLimiter:
+    """One token bucket per host"""
+
+    def __init__(self, rates: Optional[Dict[str, tuple]] = None, default: tuple = DEFAULT_HOST_RATE):
+        self.rates = dict(HOST_RATES, **(rates or {}))
+        self.default = default
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            rate, burst = self.rates.get(host, self.default)
+            self._buckets[host] = TokenBucket(rate, burst)
+        return self._buckets[host]
+
+    async def acquire(self, url: str):
+        await self.bucket(urlsplit(url).netloc).acquire()
+
+    def pause(self, url: str, seconds: float):
+        host = urlsplit(url).netloc
+        logger.warning(f"{host} rate limited, pausing {seconds:.0f}s")
+        self.bucket(host).pause(seconds)
+
+
+# ---------------------------------------------------------------------------
+# Providers
+# ---------------------------------------------------------------------------
+
+class ImageProvider:
+    """Turns an identity name into candidate image URLs"""
+
+    name = ""
+
+    def enabled(self) -> bool:
+        return True
+
+    async def search(self, fetch: Callable, query: str, max_results: int) -> List[str]:
+        raise NotImplementedError
+
+
+PROVIDERS: Dict[str, Type[ImageProvider]] = {}
+
+
+def register_provider(cls: Type[ImageProvider]) -> Type[ImageProvider]:
+    PROVIDERS[cls.name] = cls
+    return cls
+
+
+@register_provider
+class WikipediaProvider(ImageProvider):
+    """Lead image of the person's Wikipedia article"""
+
+    name = "wikipedia"
+
+    async def search(self, fetch, query, max_results):
+        response = await fetch(f"https://en.wikipedia.org/api/rest_v1/page/summary/{quote(query.replace(' ', '_'))}")
+        if response.status_code != 200:
+            return []
+        data = response.json()
+        urls = []
+        for key in ("originalimage", "thumbnail"):
+            source = (data.get(key) or {}).get("source")
+            if source and source not in urls:
+                urls.append(source)
+        return urls[:max_results]
+
+
+@register_provider
+class DuckDuckGoProvider(ImageProvider):
+    """DuckDuckGo instant answer images (no API key needed)"""
+
+    name = "duckduckgo"
+
+    async def search(self, fetch, query, max_results):
+        response = await fetch("https://api.duckduckgo.com/", params={
+            "q": f"{query} face photo portrait", "format": "json", "no_html": 1, "skip_disambig": 1,
+        })
+        if response.status_code != 200:
+            return []
+        data = response.json()
+        urls = [data["Image"]] if data.get("Image") else []
+        for topic in data.get("RelatedTopics", []):
+            image = topic.get("Icon", {}).get("URL") if isinstance(topic, dict) else None
+            if image:
+                urls.append(image)
+        return [url if url.startswith("http") else f"https://duckduckgo.com{url}" for url in urls][:max_results]
+
+
+@register_provider
+class BingProvider(ImageProvider):
+    """Original image URLs scraped from the Bing image results page"""
+
+    name = "bing"
+
+    async def search(self, fetch, query, max_results):
+        response = await fetch("https://www.bing.com/images/search", params={
+            "q": f"{query} face portrait", "form": "HDRSC2", "first": "1",
+        })
+        if response.status_code != 200:
+            return []
+        urls = []
+        for match in re.findall(r'"murl":"([^"]+)"', html.unescape(response.text)):
+            if match.startswith("http") and any(ext in match.lower() for ext in (".jpg", ".jpeg", ".png", ".webp")):
+                urls.append(match)
+        return urls[:max_results]
+
+
+@register_provider
+class UnsplashProvider(ImageProvider):
+    """Unsplash photo search (needs UNSPLASH_ACCESS_KEY)"""
+
+    name = "unsplash"
+
+    def enabled(self):
+        return bool(os.getenv("UNSPLASH_ACCESS_KEY"))
+
+    async def search(self, fetch, query, max_results):
+        response = await fetch(
+            "https://api.unsplash.com/search/photos",
+            params={"query": f"{query} portrait face", "per_page": max_results, "orientation": "portrait"},
+            headers={"Authorization": f"Client-ID {os.getenv('UNSPLASH_ACCESS_KEY')}"},
+        )
+        if response.status_code != 200:
+            return []
+        return [photo["urls"]["regular"] for photo in response.json().get("results", [])
+                if photo.get("urls", {}).get("regular")][:max_results]
+
+
+@register_provider
+class GoogleCSEProvider(ImageProvider):
+    """Google Custom Search image results (needs GOOGLE_CSE_KEY and GOOGLE_CSE_CX)"""
+
+    name = "google"
+
+    def enabled(self):
+        return bool(os.getenv("GOOGLE_CSE_KEY") and os.getenv("GOOGLE_CSE_CX"))
+
+    async def search(self, fetch, query, max_results):
+        response = await fetch("https://www.googleapis.com/customsearch/v1", params={
+            "key": os.getenv("GOOGLE_CSE_KEY"), "cx": os.getenv("GOOGLE_CSE_CX"),
+            "q": f"{query} face portrait", "searchType": "image", "num": min(max_results, 10),
+            "imgSize": "large", "imgType": "face",
+        })
+        if response.status_code != 200:
+            return []
+        return [item["link"] for item in response.json().get("items", []) if item.get("link")][:max_results]
+
+
+def load_providers(names: List[str]) -> List[ImageProvider]:
+    providers = []
+    for name in names:
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown provider {name!r}; available: {', '.join(sorted(PROVIDERS))}")
+        provider = PROVIDERS[name]()
+        if provider.enabled():
+            providers.append(provider)
+        else:
+            logger.warning(f"Provider {name} is not configured, skipping")
+    return providers
+
+
+# ---------------------------------------------------------------------------
+# Crawler
+# ---------------------------------------------------------------------------
+
+def valid_image(data: bytes) -> bool:
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.verify()
+        return True
+    except Exception:
+        return False
+
+
+def write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.part"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def cached_response(url: httpx.URL, entry: Dict[str, Any]) -> httpx.Response:
+    return httpx.Response(entry["status"], headers=entry["headers"], content=entry["body"],
+                          request=httpx.Request("GET", url))
+
+
+class GalleryCrawler:
+    """Fetches images for many identities concurrently over one connection pool"""
+
+    def __init__(self, providers: List[ImageProvider], out_dir: str = GALLERY_DIR, concurrency: int = 16,
+                 per_identity: int = 3, candidates: int = 5, limiter: Optional[HostLimiter] = None,
+                 timeout: float = 15.0, retries: int = 2, manifest: Optional[IngestManifest] = None,
+                 validator: Optional[FaceValidator] = None, cache: Optional[HTTPCache] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.providers = providers
+        self.out_dir = out_dir
+        self.concurrency = concurrency
+        self.per_identity = per_identity
+        self.candidates = candidates
+        self.limiter = limiter or HostLimiter()
+        self.timeout = timeout
+        self.retries = retries
+        self.manifest = manifest
+        self.validator = validator
+        self.cache = cache
+        self.transport = transport
+        self.stats: Dict[str, int] = {}
+        self.client: Optional[httpx.AsyncClient] = None
+
+    def _count(self, key: str, amount: int = 1):
+        self.stats[key] = self.stats.get(key, 0) + amount
+
+    async def fetch(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the host's token bucket, retrying transport errors, 429 and 5xx"""
+        for attempt in range(self.retries + 1):
+            await self.limiter.acquire(url)
+            try:
+                response = await self.client.get(url, **kwargs)
+            except httpx.HTTPError as e:
+                self._count("fetch_errors")
+                if attempt == self.retries:
+                    raise
+                logger.debug(f"GET {url} failed ({e}), retrying")
+                await asyncio.sleep(2 ** attempt)
+                continue
+            self._count(f"status_{response.status_code}")
+            if response.status_code == 429:
+                retry_after = response.headers.get("Retry-After", "")
+                self.limiter.pause(url, float(retry_after) if retry_after.isdigit() else 60.0)
+            elif response.status_code < 500:
+                return response
+            if attempt == self.retries:
+                return response
+            await asyncio.sleep(2 ** attempt)
+        return response
+
+    async def search_fetch(self, url: str, params: Optional[Dict[str, Any]] = None,
+                           headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """fetch() for provider searches, answered from the HTTP cache when possible"""
+        if self.cache is None:
+            return await self.fetch(url, params=params, headers=headers)
+        request_url = httpx.URL(url, params=params)
+        key = http_cache.cache_key(str(request_url), (headers or {}).get("Authorization", ""))
+        entry = self.cache.get(key)
+        if entry is not None and entry["fresh"]:
+            self._count("cache_hits")
+            return cached_response(request_url, entry)
+        conditional = dict(headers or {}, **(self.cache.validators(entry) if entry else {}))
+        response = await self.fetch(url, params=params, headers=conditional)
+        if response.status_code == 304 and entry is not None:
+            self._count("cache_revalidated")
+            self.cache.revalidated(key, dict(response.headers))
+            return cached_response(request_url, entry)
+        self._count("cache_misses")
+        self.cache.store(key, request_url.host, response.status_code, dict(response.headers), response.content)
+        return response
+
+    async def download(self, url: str, path: str, name: str = "", provider: Optional[str] = None,
+                       known_hashes: Optional[set] = None) -> bool:
+        """Fetch one image and write it atomically if it is new and passes face validation"""
+        def record(outcome, status_code=None, size=None, sha256=None, saved_path=None, reason=None, **validators):
+            if self.manifest is not None:
+                self.manifest.record_fetch(name, provider, url, outcome, status_code, size, sha256, saved_path, reason,
+                                           **validators)
+
+        try:
+            response = await self.fetch(url)
+        except httpx.HTTPError as e:
+            logger.debug(f"Error downloading {url}: {e}")
+            record(ingest_manifest.NETWORK_ERROR)
+            return False
+        if response.status_code != 200:
+            # 429 and 5xx survived fetch()'s retries; they are tried again on a later run
+            record(ingest_manifest.http_outcome(response.status_code), response.status_code)
+            return False
+        data = response.content
+        if not response.headers.get("content-type", "").startswith("image/") or len(data) < MIN_IMAGE_BYTES:
+            self._count("rejected_images")
+            record(ingest_manifest.REJECTED, response.status_code, len(data), reason="not_an_image")
+            return False
+        sha256 = hashlib.sha256(data).hexdigest()
+        if known_hashes is not None and sha256 in known_hashes:
+            self._count("duplicate_images")
+            record(ingest_manifest.DUPLICATE, response.status_code, len(data), sha256)
+            return False
+        if self.validator is not None:
+            verdict = await self.validator.validate(data)
+            reason = verdict["reason"]
+        else:
+            reason = None if valid_image(data) else "undecodable"
+        if reason:
+            self._count(f"rejected_{reason}")
+            record(ingest_manifest.REJECTED, response.status_code, len(data), sha256, reason=reason)
+            return False
+        if known_hashes is not None:
+            known_hashes.add(sha256)
+        write_atomic(path, data)
+        self._count("bytes", len(data))
+        # Kept so --refresh can revalidate with a conditional GET instead of downloading again
+        record(ingest_manifest.SAVED, response.status_code, len(data), sha256, path,
+               etag=response.headers.get("etag"), last_modified=response.headers.get("last-modified"))
+        return True
+
+    async def revalidate(self, row: Dict[str, Any]) -> str:
+        """Conditional GET for one saved image; replaces the file only if the source changed"""
+        headers = {}
+        if row["etag"]:
+            headers["If-None-Match"] = row["etag"]
+        if row["last_modified"]:
+            headers["If-Modified-Since"] = row["last_modified"]
+        try:
+            response = await self.fetch(row["url"], headers=headers)
+        except httpx.HTTPError as e:
+            logger.debug(f"Error revalidating {row['url']}: {e}")
+            return "error"
+        etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+        if response.status_code == 304:
+            self.manifest.revalidated(row["id"], 304, etag, last_modified)
+            return "not_modified"
+        if response.status_code in (404, 410):
+            # The source is gone; the copy we have is still a good gallery image
+            self.manifest.revalidated(row["id"], response.status_code)
+            return "gone"
+        if response.status_code != 200:
+            return "error"
+        data = response.content
+        self._count("bytes", len(data))
+        sha256 = hashlib.sha256(data).hexdigest()
+        if sha256 == row["sha256"]:
+            # Server without validator support (or a new ETag for the same bytes)
+            self.manifest.revalidated(row["id"], 200, etag, last_modified)
+            return "unchanged"
+        if self.validator is not None:
+            reason = (await self.validator.validate(data))["reason"]
+        else:
+            reason = None if valid_image(data) else "undecodable"
+        if reason:
+            # Keep the old image rather than replace it with a worse one
+            self._count(f"rejected_{reason}")
+            self.manifest.revalidated(row["id"], 200)
+            return "rejected"
+        # Same path, new size and mtime: gallery_derivatives.py rebuilds its crop and thumbnail
+        write_atomic(row["path"], data)
+        self.manifest.record_fetch(row["name"], row["provider"], row["url"], ingest_manifest.SAVED, 200, len(data),
+                                   sha256, row["path"], etag=etag, last_modified=last_modified)
+        return "updated"
+
+    async def refresh(self, rows: List[Dict[str, Any]],
+                      on_result: Optional[Callable[[Dict[str, Any], str], None]] = None) -> Dict[str, int]:
+        """Revalidate saved images against their source URLs, ``concurrency`` at a time"""
+        counts: Dict[str, int] = {}
+        queue: asyncio.Queue = asyncio.Queue()
+        for row in rows:
+            queue.put_nowait(row)
+
+        async def worker():
+            while not queue.empty():
+                row = queue.get_nowait()
+                outcome = await self.revalidate(row)
+                counts[outcome] = counts.get(outcome, 0) + 1
+                if on_result:
+                    on_result(row, outcome)
+
+        async with self._open_client() as client:
+            self.client = client
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(rows)) or 1)))
+        self.client = None
+        return counts
+
+    def _open_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=self.concurrency * 2, max_keepalive_connections=self.concurrency)
+        return httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True,
+                                 headers={"User-Agent": USER_AGENT}, transport=self.transport)
+
+    async def ingest(self, name: str) -> Dict[str, Any]:
+        """Fill one identity's folder up to ``per_identity`` images"""
+        folder = os.path.join(self.out_dir, clean_name(name))
+        have = existing_images(folder)
+        if len(have) >= self.per_identity:
+            if self.manifest is not None:
+                self.manifest.start(name, folder)
+                self.manifest.finish(name, len(have), self.per_identity)
+            return {"name": name, "status": "skipped", "images": len(have)}
+        os.makedirs(folder, exist_ok=True)
+        seen, known_hashes = set(), set()
+        if self.manifest is not None:
+            self.manifest.start(name, folder)
+            seen = self.manifest.dead_urls(name)
+            known_hashes = self.manifest.saved_hashes(name)
+        images = len(have)
+        # Dedup can leave gaps in the numbering, so continue after the highest number
+        next_index = max((int(f.split(".")[0]) for f in have if f.split(".")[0].isdigit()), default=0) + 1
+        for provider in self.providers:
+            if images >= self.per_identity:
+                break
+            try:
+                urls = await provider.search(self.search_fetch, name, self.candidates)
+            except Exception as e:
+                logger.debug(f"{provider.name} search failed for {name}: {e}")
+                urls = []
+            for url in urls:
+                if url in seen:
+                    continue
+                seen.add(url)
+                path = os.path.join(folder, f"{next_index:06d}.jpg")
+                if await self.download(url, path, name, provider.name, known_hashes):
+                    images += 1
+                    next_index += 1
+                    if images >= self.per_identity:
+                        break
+        if self.manifest is not None:
+            self.manifest.finish(name, images, self.per_identity)
+        return {"name": name, "status": "downloaded" if images > len(have) else "failed", "images": images}
+
+    async def run(self, names: List[str], on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        queue: asyncio.Queue = asyncio.Queue()
+        for name in names:
+            queue.put_nowait(name)
+
+        async def worker():
+            while not queue.empty():
+                name = queue.get_nowait()
+                try:
+                    result = await self.ingest(name)
+                except Exception as e:
+                    logger.error(f"Ingestion failed for {name}: {e}")
+                    result = {"name": name, "status": "failed", "images": 0, "error": str(e)}
+                self._count(result["status"])
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        async with self._open_client() as client:
+            self.client = client
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(names)) or 1)))
+        self.client = None
+        return results
+
+
+def read_names(names_file: Optional[str] = None, csv_file: Optional[str] = None) -> List[str]:
+    """Identity names from celebrities.txt and/or the K-pop idols CSV, deduplicated in order"""
+    names: List[str] = []
+    if names_file:
+        with open(names_file, "r", encoding="utf-8") as f:
+            names.extend(line.strip() for line in f if line.strip())
+    if csv_file:
+        import pandas as pd
+
+        df = pd.read_csv(csv_file)
+        for column in ("Stage Name", "Full Name"):
+            if column in df.columns:
+                names.extend(str(name).strip() for name in df[column].dropna())
+    return list(dict.fromkeys(name for name in names if len(name) >= 2))
+
+
+def parse_rate(spec: str):
+    """'host=RPS' or 'host=RPS:BURST'"""
+    host, _, value = spec.partition("=")
+    rate, _, burst = value.partition(":")
+    return host, (float(rate), int(burst) if burst else max(1, int(float(rate))))
+
+
+def make_crawler(args, manifest: Optional[IngestManifest]) -> GalleryCrawler:
+    return GalleryCrawler(
+        load_providers(args.providers.split(",")), out_dir=args.out, concurrency=args.concurrency,
+        per_identity=args.per_identity, candidates=args.candidates,
+        limiter=HostLimiter(dict(parse_rate(spec) for spec in args.rate)), timeout=args.timeout,
+        manifest=manifest, validator=None if args.no_face_check else FaceValidator(args.validate_workers),
+        cache=None if args.no_cache else HTTPCache(args.cache_dir),
+    )
+
+
+def refresh(args):
+    """--refresh: conditional GETs for saved images, downloading only those whose source changed"""
+    if args.no_manifest:
+        raise SystemExit("--refresh needs the manifest: it holds each image's source URL, ETag and Last-Modified")
+    manifest = IngestManifest(args.manifest)
+    rows = manifest.refresh_candidates(time.time() - args.refresh_days * 86400)
+    if args.names:
+        wanted = set(args.names)
+        rows = [row for row in rows if row["name"] in wanted]
+    if args.limit:
+        rows = rows[:args.limit]
+    gallery_bytes = sum(os.path.getsize(row["path"]) for row in rows)
+    print(f"🔄 Revalidating {len(rows)} images ({gallery_bytes / 1024 / 1024:.1f} MB on disk)")
+
+    crawler = make_crawler(args, manifest)
+    start = time.perf_counter()
+
+    def report(row, outcome):
+        if outcome in ("updated", "error") or args.verbose:
+            print(f"{'✓' if outcome == 'updated' else '•'} {row['name']}: {outcome} {row['url']}")
+
+    try:
+        counts = asyncio.run(crawler.refresh(rows, on_result=report))
+    finally:
+        if crawler.validator is not None:
+            crawler.validator.close()
+    elapsed = time.perf_counter() - start
+    downloaded = crawler.stats.get("bytes", 0)
+    share = downloaded / gallery_bytes * 100 if gallery_bytes else 0.0
+    print(f"\n🎉 Refreshed in {elapsed:.1f}s: {counts}")
+    print(f"📦 Downloaded {downloaded / 1024 / 1024:.2f} MB ({share:.1f}% of a full re-download)")
+    if counts.get("updated"):
+        print("🖼️  Run gallery_derivatives.py to rebuild crops and thumbnails of the updated images")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download celebrity gallery images concurrently")
+    parser.add_argument("names", nargs="*", help="identities to ingest (default: --names file)")
+    parser.add_argument("--names", dest="names_file", help="text file with one name per line")
+    parser.add_argument("--csv", help="CSV with 'Stage Name'/'Full Name' columns (e.g. kpopidolsv3.csv)")
+    parser.add_argument("--out", default=GALLERY_DIR)
+    parser.add_argument("--providers", default="wikipedia,duckduckgo,bing,unsplash,google",
+                        help=f"comma separated, tried in order ({', '.join(sorted(PROVIDERS))})")
+    parser.add_argument("--concurrency", type=int, default=16, help="identities processed in parallel")
+    parser.add_argument("--per-identity", type=int, default=3, help="images wanted per identity")
+    parser.add_argument("--candidates", type=int, default=5, help="URLs requested per provider")
+    parser.add_argument("--rate", action="append", default=[], help="per-host limit, host=RPS[:BURST]")
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--limit", type=int, help="only ingest the first N names")
+    parser.add_argument("--manifest", default=ingest_manifest.INGEST_MANIFEST_DB, help="SQLite ingestion manifest")
+    parser.add_argument("--no-manifest", action="store_true", help="ignore the manifest and check folders only")
+    parser.add_argument("--no-face-check", action="store_true", help="accept any decodable image")
+    parser.add_argument("--validate-workers", type=int, help="face validation processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=http_cache.HTTP_CACHE_DIR, help="on-disk cache for provider searches")
+    parser.add_argument("--no-cache", action="store_true", help="always query the providers")
+    parser.add_argument("--retry-now", action="store_true", help="retry failed identities without waiting for backoff")
+    parser.add_argument("--refresh", action="store_true",
+                        help="revalidate saved images with conditional GETs instead of ingesting new ones")
+    parser.add_argument("--refresh-days", type=float, default=30.0, help="only refresh images checked longer ago")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+    if args.refresh:
+        refresh(args)
+        return
+
+    names = list(args.names)
+    if args.names_file or args.csv or not names:
+        names += read_names(args.names_file or ("celebrities.txt" if not args.csv else None), args.csv)
+    if args.limit:
+        names = names[:args.limit]
+
+    manifest = None
+    if not args.no_manifest:
+        manifest = IngestManifest(args.manifest)
+        if args.retry_now:
+            manifest.reset(row["name"] for row in manifest.failed())
+        have = {name: len(existing_images(os.path.join(args.out, clean_name(name)))) for name in names}
+        due = manifest.due(names, have, args.per_identity)
+        print(f"📋 {len(due)} of {len(names)} identities need work")
+        names = due
+
+    crawler = make_crawler(args, manifest)
+    print(f"🎭 Ingesting {len(names)} identities with {[p.name for p in crawler.providers]}")
+    start = time.perf_counter()
+    done = 0
+
+    def report(result):
+        nonlocal done
+        done += 1
+        mark = {"downloaded": "✓", "skipped": "•", "failed": "✗"}[result["status"]]
+        print(f"{mark} [{done}/{len(names)}] {result['name']}: {result['images']} images")
+
+    try:
+        asyncio.run(crawler.run(names, on_result=report))
+    finally:
+        if crawler.validator is not None:
+            crawler.validator.close()
+    elapsed = time.perf_counter() - start
+    print(f"\n🎉 Done in {elapsed:.1f}s ({len(names) / elapsed if elapsed else 0:.1f} identities/s)")
+    print(f"📊 {crawler.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Where gallery files live.
+
+The gallery is one folder per identity under GALLERY_DIR, holding numbered
+images (celebrities/BTS_Jimin/000001.jpg). Kept free of heavy imports so quick
+tools like gallery_stats.py start instantly.
+"""
+
+import os
+from typing import List
+
+GALLERY_DIR = os.getenv("GALLERY_DIR", "celebrities")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def clean_name(name: str) -> str:
+    """Folder name for an identity, matching the existing celebrities/ layout"""
+    return name.strip().replace(" ", "_").replace("/", "_").replace("\\", "_").replace("(", "").replace(")", "")
+
+
+def existing_images(folder: str) -> List[str]:
+    try:
+        return sorted(entry.name for entry in os.scandir(folder)
+                      if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS))
+    except FileNotFoundError:
+        return []
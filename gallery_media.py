@@ -0,0 +1,194 @@
+"""
+Content-addressed media for gallery images.
+
+gallery_derivatives.py writes every gallery image in a few sizes, as WebP and
+as JPEG, named after the sha256 of the original:
+
+    gallery_derivatives/media/ab/<sha256>-256.webp
+
+The API serves them at /media/<sha256>-<size>.<ext>. A name never changes
+content, so responses are cacheable forever (Cache-Control: immutable), and
+browsers or CDNs never need to come back. GET /media/ also answers
+conditional requests (If-None-Match, If-Modified-Since) with 304, single byte
+ranges with 206, and HEAD. The file is handed to the server with the ASGI
+zero-copy send extension when the server offers it (sendfile), and read in
+chunks otherwise.
+
+Kept free of heavy imports: the API imports this, and gallery_derivatives.py
+imports the naming from here.
+"""
+
+import json
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+GALLERY_DERIVATIVES_DIR = os.getenv("GALLERY_DERIVATIVES_DIR", "gallery_derivatives")
+MEDIA_SIZES = (128, 256, 512)
+MEDIA_FORMATS = {"webp": "image/webp", "jpg": "image/jpeg"}
+DEFAULT_MEDIA_SIZE = 256
+MEDIA_URL_PREFIX = "/media/"
+MEDIA_NAME = re.compile(r"^([0-9a-f]{64})-(\d+)\.(webp|jpg)$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+CHUNK_SIZE = 64 * 1024
+
+
+def media_name(sha256: str, size: int, ext: str) -> str:
+    return f"{sha256}-{size}.{ext}"
+
+
+def media_path(root: str, name: str) -> str:
+    return os.path.join(root, "media", name[:2], name)
+
+
+def variant_paths(root: str, sha256: str) -> Dict[str, str]:
+    """Every media variant of one original, by file name"""
+    names = [media_name(sha256, size, ext) for size in MEDIA_SIZES for ext in MEDIA_FORMATS]
+    return {name: media_path(root, name) for name in names}
+
+
+def media_urls(sha256: str) -> Dict[str, Dict[str, str]]:
+    """{"webp": {"128": url, ...}, "jpg": {...}} for srcset/picture markup"""
+    return {ext: {str(size): MEDIA_URL_PREFIX + media_name(sha256, size, ext) for size in MEDIA_SIZES}
+            for ext in MEDIA_FORMATS}
+
+
+class MediaIndex:
+    """Gallery image path -> content hash, from the derivative store's index.json"""
+
+    def __init__(self, gallery_dir: str, root: str = GALLERY_DERIVATIVES_DIR):
+        self.gallery_dir = gallery_dir
+        self.root = root
+        try:
+            with open(os.path.join(root, "index.json"), "r", encoding="utf-8") as f:
+                self.hashes = {key: entry["hash"] for key, entry in json.load(f).items()}
+        except FileNotFoundError:
+            self.hashes = {}
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def hash_for(self, image_path: str) -> Optional[str]:
+        return self.hashes.get(os.path.relpath(image_path, self.gallery_dir))
+
+    def url(self, image_path: str, size: int = DEFAULT_MEDIA_SIZE, ext: str = "webp") -> Optional[str]:
+        sha256 = self.hash_for(image_path)
+        return MEDIA_URL_PREFIX + media_name(sha256, size, ext) if sha256 else None
+
+
+def parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end inclusive) of a single "bytes=" range; None to ignore the header; ValueError if unsatisfiable"""
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        # Multiple ranges are allowed to be answered with the whole file
+        return None
+    first, _, last = spec.strip().partition("-")
+    if not first:
+        if not last.isdigit() or int(last) == 0:
+            raise ValueError("unsatisfiable range")
+        return max(size - int(last), 0), size - 1
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+class MediaFileResponse(Response):
+    """Serves one media file with validators, byte ranges and zero-copy send"""
+
+    def __init__(self, path: str, stat: os.stat_result, etag: str, media_type: str, request_headers: Headers,
+                 method: str):
+        self.path = path
+        self.offset = 0
+        self.length = stat.st_size
+        self.send_body = method != "HEAD"
+        self.status_code = 200
+        self.background = None
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Accept-Ranges": "bytes",
+        }
+
+        if self._not_modified(request_headers, etag, stat.st_mtime):
+            self.status_code, self.send_body = 304, False
+            self.length = 0
+        else:
+            headers["Content-Type"] = media_type
+            range_header = request_headers.get("range")
+            if_range = request_headers.get("if-range")
+            if range_header and (not if_range or if_range.strip() in (etag, last_modified)):
+                try:
+                    byte_range = parse_range(range_header, stat.st_size)
+                except ValueError:
+                    byte_range = None
+                    self.status_code, self.send_body, self.length = 416, False, 0
+                    headers["Content-Range"] = f"bytes */{stat.st_size}"
+                if byte_range is not None:
+                    start, end = byte_range
+                    self.status_code, self.offset, self.length = 206, start, end - start + 1
+                    headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            headers["Content-Length"] = str(self.length)
+        self.init_headers(headers)
+
+    @staticmethod
+    def _not_modified(request_headers: Headers, etag: str, mtime: float) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match:
+            return if_none_match.strip() == "*" or any(
+                tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if not self.send_body:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({"type": "http.response.zerocopysend", "file": f, "offset": self.offset,
+                            "count": self.length})
+            return
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b""})
+
+
+def media_response(name: str, request_headers: Headers, method: str,
+                   root: str = GALLERY_DERIVATIVES_DIR) -> Optional[MediaFileResponse]:
+    """Response for /media/<name>, or None if there is no such file"""
+    match = MEDIA_NAME.match(name)
+    if match is None:
+        return None
+    path = media_path(root, name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    # The name is the content address, so it is a strong validator on its own
+    etag = f'"{match.group(1)[:32]}-{match.group(2)}-{match.group(3)}"'
+    return MediaFileResponse(path, stat, etag, MEDIA_FORMATS[match.group(3)], request_headers, method)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Gallery statistics from a single os.scandir walk.
+
+Reports per-identity image counts, total bytes, image dimension histograms and
+which names from celebrities.txt and the K-pop idols CSV have no folder yet.
+When the ingestion manifest exists, identities still failing or partial are
+listed with their attempt counts. Only image headers are read, so the full
+gallery takes a fraction of a second.
+
+Usage:
+    python gallery_stats.py
+    python gallery_stats.py --json > stats.json
+    python gallery_stats.py --identities --no-dimensions
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from gallery_layout import GALLERY_DIR, IMAGE_EXTENSIONS, clean_name
+from ingest_manifest import FAILED, INGEST_MANIFEST_DB, PARTIAL, RUNNING
+
+NAMES_FILE = "celebrities.txt"
+CSV_FILE = os.path.join(GALLERY_DIR, "kpopidolsv3.csv")
+SIDE_BUCKETS = [0, 256, 512, 768, 1024, 2048]
+COUNT_BUCKETS = [0, 1, 2, 3, 5, 10]
+
+
+def bucket_label(value: int, edges: List[int]) -> str:
+    for low, high in zip(edges, edges[1:]):
+        if value < high:
+            return f"{low}-{high - 1}" if high - low > 1 else str(low)
+    return f"{edges[-1]}+"
+
+
+def histogram(values: List[int], edges: List[int]) -> Dict[str, int]:
+    counts = {bucket_label(edge, edges): 0 for edge in edges}
+    for value in values:
+        counts[bucket_label(value, edges)] += 1
+    return counts
+
+
+def image_size(path: str) -> Optional[tuple]:
+    """Width and height from the image header only"""
+    from PIL import Image
+
+    try:
+        with Image.open(path) as img:
+            return img.size
+    except Exception:
+        return None
+
+
+def read_expected(names_file: Optional[str], csv_file: Optional[str]) -> Dict[str, List[List[str]]]:
+    """Expected identities per source, each as the folder names that would satisfy it"""
+    expected: Dict[str, List[List[str]]] = {}
+    if names_file and os.path.exists(names_file):
+        with open(names_file, "r", encoding="utf-8") as f:
+            expected[names_file] = [[line.strip()] for line in f if line.strip()]
+    if csv_file and os.path.exists(csv_file):
+        rows = []
+        with open(csv_file, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                stage, group = (row.get("Stage Name") or "").strip(), (row.get("Group") or "").strip()
+                if not stage:
+                    continue
+                # The gallery names idols as "Group Name", "Name Group" or just the name
+                variants = [stage, row.get("Full Name") or ""]
+                if group:
+                    variants += [f"{group} {stage}", f"{stage} {group}"]
+                rows.append([v for v in variants if v.strip()])
+        expected[csv_file] = rows
+    return expected
+
+
+def manifest_failures(db_path: str) -> Optional[List[Dict[str, Any]]]:
+    """Identities the ingestion manifest still considers failed, without creating the database"""
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            "SELECT name, status, images, attempts FROM identities WHERE status IN (?, ?, ?) ORDER BY name",
+            (FAILED, PARTIAL, RUNNING),
+        ).fetchall()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    return [{"name": name, "status": status, "images": images, "attempts": attempts}
+            for name, status, images, attempts in rows]
+
+
+def collect(root: str = GALLERY_DIR, names_file: Optional[str] = NAMES_FILE, csv_file: Optional[str] = CSV_FILE,
+            manifest_db: Optional[str] = INGEST_MANIFEST_DB, dimensions: bool = True) -> Dict[str, Any]:
+    start = time.perf_counter()
+    identities: Dict[str, Dict[str, int]] = {}
+    widths: List[int] = []
+    heights: List[int] = []
+    loose_images = 0
+    for entry in os.scandir(root):
+        if entry.is_file():
+            loose_images += entry.name.lower().endswith(IMAGE_EXTENSIONS)
+            continue
+        if not entry.is_dir():
+            continue
+        images = 0
+        total = 0
+        for image in os.scandir(entry.path):
+            if image.name.lower().endswith(IMAGE_EXTENSIONS) and image.is_file():
+                images += 1
+                total += image.stat().st_size
+                if dimensions:
+                    size = image_size(image.path)
+                    if size:
+                        widths.append(size[0])
+                        heights.append(size[1])
+        identities[entry.name] = {"images": images, "bytes": total}
+
+    folders = set(identities)
+    missing = {}
+    for source, rows in read_expected(names_file, csv_file).items():
+        absent = [variants[0] for variants in rows
+                  if not any(identities.get(clean_name(v), {}).get("images") for v in variants)]
+        missing[source] = {"expected": len(rows), "missing": len(absent), "names": sorted(set(absent))}
+
+    counts = [info["images"] for info in identities.values()]
+    stats: Dict[str, Any] = {
+        "root": root,
+        "identities": len(folders),
+        "images": sum(counts),
+        "bytes": sum(info["bytes"] for info in identities.values()),
+        "loose_images": loose_images,
+        "empty_identities": sorted(name for name, info in identities.items() if info["images"] == 0),
+        "images_per_identity": histogram(counts, COUNT_BUCKETS),
+        "missing": missing,
+        "failed": manifest_failures(manifest_db) if manifest_db else None,
+        "per_identity": dict(sorted(identities.items())),
+    }
+    if dimensions:
+        stats["width"] = histogram(widths, SIDE_BUCKETS)
+        stats["height"] = histogram(heights, SIDE_BUCKETS)
+    stats["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return stats
+
+
+def print_table(stats: Dict[str, Any], show_identities: bool = False, limit: int = 20):
+    print(f"📁 {stats['root']}: {stats['identities']} identities, {stats['images']} images, "
+          f"{stats['bytes'] / 1024 / 1024:.1f} MB ({stats['elapsed_ms']} ms)")
+    if stats["loose_images"]:
+        print(f"   {stats['loose_images']} images directly in the gallery root")
+    print("\n📊 Images per identity")
+    for label, count in stats["images_per_identity"].items():
+        print(f"   {label:>8}  {count}")
+    for axis in ("width", "height"):
+        if axis in stats:
+            print(f"\n📐 {axis.capitalize()} (px)")
+            for label, count in stats[axis].items():
+                print(f"   {label:>9}  {count}")
+    for source, info in stats["missing"].items():
+        print(f"\n❓ {source}: {info['missing']} of {info['expected']} without images")
+        for name in info["names"][:limit]:
+            print(f"   - {name}")
+        if info["missing"] > limit:
+            print(f"   ... and {info['missing'] - limit} more")
+    if stats["empty_identities"]:
+        print(f"\n🕳️  {len(stats['empty_identities'])} empty folders")
+    if stats["failed"] is not None:
+        print(f"\n✗ {len(stats['failed'])} identities failing in the ingestion manifest")
+        for row in stats["failed"][:limit]:
+            print(f"   - {row['name']}: {row['status']}, {row['images']} images, {row['attempts']} attempts")
+    if show_identities:
+        print(f"\n{'Identity':<40} {'Images':>6} {'KB':>8}")
+        for name, info in stats["per_identity"].items():
+            print(f"{name:<40} {info['images']:>6} {info['bytes'] / 1024:>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the celebrity gallery")
+    parser.add_argument("root", nargs="?", default=GALLERY_DIR)
+    parser.add_argument("--names", default=NAMES_FILE, help="expected names, one per line")
+    parser.add_argument("--csv", default=CSV_FILE, help="K-pop idols CSV")
+    parser.add_argument("--manifest", default=INGEST_MANIFEST_DB)
+    parser.add_argument("--no-dimensions", action="store_true", help="skip reading image headers")
+    parser.add_argument("--identities", action="store_true", help="print the per-identity table")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    stats = collect(args.root, args.names, args.csv, args.manifest, dimensions=not args.no_dimensions)
+    if args.json:
+        print(json.dumps(stats, indent=2, ensure_ascii=False))
+    else:
+        print_table(stats, args.identities)
+
+
+if __name__ == "__main__":
+    main()
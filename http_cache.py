@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache for the image search providers.
+
+Wikipedia, DuckDuckGo, Bing, Unsplash and Google CSE are asked the same
+questions on every crawl and retry. HTTPCache keeps their responses on disk:
+
+- Fresh entries (younger than their TTL) are answered locally without any
+  request, so they cost neither a round trip nor rate limit.
+- Expired entries are revalidated with If-None-Match / If-Modified-Since; a
+  304 just extends the entry.
+- 404s are cached too (with a shorter TTL), since "no Wikipedia page" is as
+  stable an answer as a page.
+- Bodies live in sharded files, metadata in SQLite; the least recently used
+  entries are evicted once the cache grows past HTTP_CACHE_MAX_BYTES.
+
+Search providers mark their responses private/no-cache, so the TTL is a client
+policy (HTTP_CACHE_TTL) and a server max-age only ever lengthens it.
+
+Usage:
+    python http_cache.py stats
+    python http_cache.py clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+HTTP_CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL", str(7 * 86400)))
+HTTP_CACHE_NEGATIVE_TTL = float(os.getenv("HTTP_CACHE_NEGATIVE_TTL", "86400"))
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHEABLE_STATUSES = (200, 404)
+# Response headers worth keeping; the rest are transport details
+KEPT_HEADERS = ("content-type", "etag", "last-modified", "cache-control")
+
+
+def cache_key(url: str, vary: str = "") -> str:
+    return hashlib.sha256(f"{url}\n{vary}".encode("utf-8")).hexdigest()
+
+
+class HTTPCache:
+    """Response bodies on disk, metadata and LRU bookkeeping in SQLite"""
+
+    def __init__(self, root: str = HTTP_CACHE_DIR, ttl: float = HTTP_CACHE_TTL,
+                 negative_ttl: float = HTTP_CACHE_NEGATIVE_TTL, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.root = root
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " host TEXT NOT NULL,"
+            " status INTEGER NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self.stats: Dict[str, int] = {}
+
+    def _count(self, key: str):
+        self.stats[key] = self.stats.get(key, 0) + 1
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def _ttl(self, status: int, headers: Dict[str, str]) -> float:
+        ttl = self.ttl if status == 200 else self.negative_ttl
+        match = re.search(r"max-age=(\d+)", headers.get("cache-control", ""))
+        return max(ttl, float(match.group(1))) if match else ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached entry (fresh or not) with its body, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        try:
+            with open(self._body_path(key), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            self.delete(key)
+            return None
+        return {"status": row[0], "headers": json.loads(row[1]), "body": body,
+                "fresh": row[2] > time.time()}
+
+    def validators(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Conditional request headers for revalidating an expired entry"""
+        headers = {}
+        if entry["headers"].get("etag"):
+            headers["If-None-Match"] = entry["headers"]["etag"]
+        if entry["headers"].get("last-modified"):
+            headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+        return headers
+
+    def store(self, key: str, host: str, status: int, headers: Dict[str, str], body: bytes):
+        if status not in CACHEABLE_STATUSES:
+            return
+        kept = {name: headers[name] for name in KEPT_HEADERS if name in headers}
+        path = self._body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, host, status, headers, size, stored_at, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, host, status, json.dumps(kept), len(body), now, now + self._ttl(status, kept), now),
+            )
+        self._count("stored")
+        self.evict()
+
+    def revalidated(self, key: str, headers: Dict[str, str]):
+        """A 304 came back: keep the body, refresh validators and expiry"""
+        with self._lock:
+            row = self._conn.execute("SELECT status, headers FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            kept = json.loads(row[1])
+            kept.update({name: headers[name] for name in KEPT_HEADERS if name in headers})
+            now = time.time()
+            self._conn.execute(
+                "UPDATE entries SET headers = ?, expires_at = ?, last_access = ? WHERE key = ?",
+                (json.dumps(kept), now + self._ttl(row[0], kept), now, key),
+            )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        try:
+            os.remove(self._body_path(key))
+        except FileNotFoundError:
+            pass
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used entries until the cache is back under 90% of max_bytes"""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        with self._lock:
+            rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if total <= target:
+                break
+            self.delete(key)
+            total -= size
+            self._count("evicted")
+
+    def summary(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            hosts = self._conn.execute(
+                "SELECT host, COUNT(*), SUM(size), SUM(expires_at > ?) FROM entries GROUP BY host ORDER BY host", (now,)
+            ).fetchall()
+        return {
+            "total_bytes": sum(row[2] for row in hosts),
+            "max_bytes": self.max_bytes,
+            "hosts": {host: {"entries": count, "bytes": size, "fresh": fresh} for host, count, size, fresh in hosts},
+        }
+
+    def clear(self):
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute("SELECT key FROM entries")]
+        for key in keys:
+            self.delete(key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the provider HTTP cache")
+    parser.add_argument("--dir", default=HTTP_CACHE_DIR)
+    parser.add_argument("command", choices=["stats", "clear"])
+    args = parser.parse_args()
+
+    cache = HTTPCache(args.dir)
+    if args.command == "clear":
+        cache.clear()
+        print(f"🧹 Cleared {args.dir}")
+        return
+    summary = cache.summary()
+    print(f"💾 {summary['total_bytes'] / 1024 / 1024:.1f} MB of {summary['max_bytes'] / 1024 / 1024:.0f} MB")
+    for host, info in summary["hosts"].items():
+        print(f"   {host}: {info['entries']} entries ({info['fresh']} fresh), {info['bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Persistent manifest for gallery ingestion.
+
+Records every identity gallery_ingest.py has worked on, and every URL it
+fetched: the provider, HTTP status, bytes, content hash and outcome. It
+replaces the hand-maintained retry lists and the ``st_size > 10000`` skip
+checks:
+
+- Re-running ingestion only touches identities that are new, short of
+  images on disk or due for a retry.
+- Failed identities are retried automatically with exponential backoff.
+- Identities left "running" by a crash are picked up again on the next run.
+- URLs that failed for good (404, 410, 403, ...), were rejected or produced a
+  duplicate are not downloaded again. Throttled (429) and server errors (5xx)
+  are retried on later runs, up to URL_MAX_ATTEMPTS times.
+- Saved images keep their source ETag / Last-Modified and when they were last
+  checked, for gallery_ingest.py --refresh.
+
+Usage:
+    python ingest_manifest.py status
+    python ingest_manifest.py failed
+    python ingest_manifest.py reset "BTS Jimin"
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+INGEST_MANIFEST_DB = os.getenv("INGEST_MANIFEST_DB", "ingest_manifest.sqlite3")
+RETRY_BASE_SECONDS = 3600.0
+RETRY_MAX_SECONDS = 7 * 86400.0
+
+RUNNING = "running"
+COMPLETE = "complete"
+PARTIAL = "partial"
+FAILED = "failed"
+
+# Fetch outcomes
+SAVED = "saved"
+DUPLICATE = "duplicate"
+REJECTED = "rejected"
+HTTP_ERROR = "http_error"
+HTTP_RETRY = "http_retry"
+NETWORK_ERROR = "network_error"
+# Outcomes worth skipping on later runs
+DEAD_OUTCOMES = (DUPLICATE, REJECTED, HTTP_ERROR)
+# Outcomes that may clear up; the URL is dead once it has failed this many times
+TRANSIENT_OUTCOMES = (HTTP_RETRY, NETWORK_ERROR)
+URL_MAX_ATTEMPTS = 5
+# 4xx statuses that say "try again later" rather than "this URL is bad"
+RETRYABLE_CLIENT_ERRORS = (408, 425, 429)
+
+
+def retry_delay(attempts: int) -> float:
+    return min(RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS)
+
+
+def http_outcome(status_code: int) -> str:
+    """Outcome for a non-200 response: only permanent 4xx errors mark the URL dead"""
+    if 400 <= status_code < 500 and status_code not in RETRYABLE_CLIENT_ERRORS:
+        return HTTP_ERROR
+    return HTTP_RETRY
+
+
+class IngestManifest:
+    """SQLite record of identities and fetched URLs"""
+
+    def __init__(self, path: str = INGEST_MANIFEST_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS identities ("
+            " name TEXT PRIMARY KEY,"
+            " folder TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " images INTEGER NOT NULL DEFAULT 0,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt REAL NOT NULL DEFAULT 0,"
+            " last_error TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fetches ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " name TEXT NOT NULL,"
+            " provider TEXT,"
+            " url TEXT NOT NULL,"
+            " status_code INTEGER,"
+            " bytes INTEGER,"
+            " sha256 TEXT,"
+            " outcome TEXT NOT NULL,"
+            " path TEXT,"
+            " reason TEXT,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " checked_at REAL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        # Columns added after the first release of the manifest
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(fetches)")}
+        for column, kind in (("reason", "TEXT"), ("etag", "TEXT"), ("last_modified", "TEXT"), ("checked_at", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE fetches ADD COLUMN {column} {kind}")
+        # Older manifests recorded throttling and server errors as dead http_error rows
+        self._conn.execute(
+            "UPDATE fetches SET outcome = ? WHERE outcome = ? AND (status_code >= 500"
+            f" OR status_code IN ({','.join('?' * len(RETRYABLE_CLIENT_ERRORS))}))",
+            (HTTP_RETRY, HTTP_ERROR, *RETRYABLE_CLIENT_ERRORS),
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS fetches_name ON fetches (name)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS fetches_sha256 ON fetches (sha256)")
+
+    def identity(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM identities WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return dict(zip([c[0] for c in cursor.description], row)) if row else None
+
+    def due(self, names: Iterable[str], have_images: Dict[str, int], per_identity: int,
+            retry_failed: bool = True) -> List[str]:
+        """Names that need work: new, short of images on disk, due for retry or interrupted"""
+        now = time.time()
+        with self._lock:
+            known = {row[0]: row[1:] for row in self._conn.execute(
+                "SELECT name, status, next_attempt FROM identities")}
+        due = []
+        for name in names:
+            if name not in known:
+                if have_images.get(name, 0) < per_identity:
+                    due.append(name)
+                continue
+            status, next_attempt = known[name]
+            if status == RUNNING:
+                due.append(name)
+            elif status in (FAILED, PARTIAL):
+                if retry_failed and next_attempt <= now:
+                    due.append(name)
+            elif have_images.get(name, 0) < per_identity:
+                # Completed, but images were deleted since
+                due.append(name)
+        return due
+
+    def start(self, name: str, folder: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO identities (name, folder, status, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET status = excluded.status, folder = excluded.folder,"
+                " updated_at = excluded.updated_at",
+                (name, folder, RUNNING, time.time()),
+            )
+
+    def finish(self, name: str, images: int, per_identity: int, error: Optional[str] = None):
+        """Record the outcome; anything short of ``per_identity`` is scheduled for a retry"""
+        now = time.time()
+        if images >= per_identity:
+            status = COMPLETE
+        else:
+            status = PARTIAL if images else FAILED
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT attempts FROM identities WHERE name = ?", (name,)).fetchone()
+                attempts = (row[0] if row else 0) + 1
+                next_attempt = 0.0 if status == COMPLETE else now + retry_delay(attempts)
+                self._conn.execute(
+                    "UPDATE identities SET status = ?, images = ?, attempts = ?, next_attempt = ?,"
+                    " last_error = ?, updated_at = ? WHERE name = ?",
+                    (status, images, 0 if status == COMPLETE else attempts, next_attempt, error, now, name),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def record_fetch(self, name: str, provider: Optional[str], url: str, outcome: str,
+                     status_code: Optional[int] = None, size: Optional[int] = None,
+                     sha256: Optional[str] = None, path: Optional[str] = None, reason: Optional[str] = None,
+                     etag: Optional[str] = None, last_modified: Optional[str] = None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO fetches (name, provider, url, status_code, bytes, sha256, outcome, path, reason,"
+                " etag, last_modified, checked_at, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, provider, url, status_code, size, sha256, outcome, path, reason,
+                 etag, last_modified, now, now),
+            )
+
+    def refresh_candidates(self, checked_before: float = float("inf")) -> List[Dict[str, Any]]:
+        """The latest saved fetch of every gallery file still on disk, last checked before ``checked_before``"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT id, name, provider, url, sha256, path, etag, last_modified FROM fetches"
+                " WHERE id IN (SELECT MAX(id) FROM fetches WHERE outcome = ? GROUP BY path)"
+                " AND COALESCE(checked_at, fetched_at) < ? ORDER BY id",
+                (SAVED, checked_before),
+            )
+            columns = [c[0] for c in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return [row for row in rows if row["path"] and os.path.exists(row["path"])]
+
+    def revalidated(self, fetch_id: int, status_code: int, etag: Optional[str] = None,
+                    last_modified: Optional[str] = None):
+        """Source answered 304 (or 200 with identical content): the saved file is current"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE fetches SET checked_at = ?, status_code = ?, etag = COALESCE(?, etag),"
+                " last_modified = COALESCE(?, last_modified) WHERE id = ?",
+                (time.time(), status_code, etag, last_modified, fetch_id),
+            )
+
+    def dead_urls(self, name: str, max_attempts: int = URL_MAX_ATTEMPTS) -> Set[str]:
+        """URLs not worth fetching again for this identity"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url FROM fetches WHERE name = ? AND outcome IN ({','.join('?' * len(DEAD_OUTCOMES))})",
+                (name, *DEAD_OUTCOMES),
+            ).fetchall()
+            exhausted = self._conn.execute(
+                f"SELECT url FROM fetches WHERE name = ? AND outcome IN ({','.join('?' * len(TRANSIENT_OUTCOMES))})"
+                " GROUP BY url HAVING COUNT(*) >= ?",
+                (name, *TRANSIENT_OUTCOMES, max_attempts),
+            ).fetchall()
+        return {row[0] for row in rows + exhausted}
+
+    def saved_hashes(self, name: str) -> Set[str]:
+        """Content hashes of this identity's images that are still on disk"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sha256, path FROM fetches WHERE name = ? AND outcome = ?", (name, SAVED)
+            ).fetchall()
+        return {sha256 for sha256, path in rows if path and os.path.exists(path)}
+
+    def failed(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT name, status, images, attempts, next_attempt, last_error FROM identities"
+                " WHERE status IN (?, ?, ?) ORDER BY name", (FAILED, PARTIAL, RUNNING)
+            )
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def reset(self, names: Iterable[str]):
+        """Make identities due immediately"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE identities SET next_attempt = 0, attempts = 0 WHERE name = ?", [(n,) for n in names]
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            identities = dict(self._conn.execute("SELECT status, COUNT(*) FROM identities GROUP BY status").fetchall())
+            fetches = dict(self._conn.execute("SELECT outcome, COUNT(*) FROM fetches GROUP BY outcome").fetchall())
+            rejections = dict(self._conn.execute(
+                "SELECT reason, COUNT(*) FROM fetches WHERE outcome = ? AND reason IS NOT NULL GROUP BY reason",
+                (REJECTED,),
+            ).fetchall())
+            total_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(bytes), 0) FROM fetches WHERE outcome = ?", (SAVED,)
+            ).fetchone()[0]
+        return {"identities": identities, "fetches": fetches, "rejections": rejections, "saved_bytes": total_bytes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the gallery ingestion manifest")
+    parser.add_argument("--db", default=INGEST_MANIFEST_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="counts per identity status and fetch outcome")
+    sub.add_parser("failed", help="identities still short of images")
+    reset_parser = sub.add_parser("reset", help="retry identities on the next run")
+    reset_parser.add_argument("names", nargs="*", help="default: every failed identity")
+    args = parser.parse_args()
+
+    manifest = IngestManifest(args.db)
+    if args.command == "status":
+        summary = manifest.summary()
+        print(f"📋 Identities: {summary['identities']}")
+        print(f"📥 Fetches:    {summary['fetches']}")
+        print(f"🚫 Rejected:   {summary['rejections']}")
+        print(f"💾 Saved:      {summary['saved_bytes'] / 1024 / 1024:.1f} MB")
+    elif args.command == "failed":
+        for row in manifest.failed():
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["next_attempt"]))
+            print(f"✗ {row['name']}: {row['status']}, {row['images']} images, "
+                  f"{row['attempts']} attempts, retry after {when} ({row['last_error'] or 'not enough images found'})")
+    else:
+        names = args.names or [row["name"] for row in manifest.failed()]
+        manifest.reset(names)
+        print(f"🔁 {len(names)} identities will be retried on the next run")
+
+
+if __name__ == "__main__":
+    main()
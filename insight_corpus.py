@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Offline precomputed insight corpus with nearest-neighbour retrieval.
+
+``build`` asks an LLM (a real provider or mock_llm.py) for insights over a grid
+of feature combinations and stores the parsed answers in one compressed .npz
+file: a float32 feature matrix, plus the phrases deduplicated into a string
+table. At serve time InsightCorpus loads that file once and answers each
+analysis with a vectorized nearest-neighbour lookup, so LLM-quality insights
+need no network call.
+
+Usage:
+    python insight_corpus.py build --url http://127.0.0.1:8088/v1/chat/completions --out insight_corpus.npz
+    python insight_corpus.py build --shape hf --url https://api-inference.huggingface.co/models/... --api-key $HUGGINGFACE_API_KEY
+    python insight_corpus.py stats insight_corpus.npz
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from insight_prompts import INSIGHT_SYSTEM_PROMPT, build_insight_prompt, parse_ai_response
+from insight_rules import CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+INSIGHT_CORPUS_FILE = os.getenv("INSIGHT_CORPUS_FILE", "insight_corpus.npz")
+
+# Every dominant_emotion DeepFace can return
+EMOTIONS = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+
+# Default build grid: 4 * 3 * 2 * 2 * 2 * 2 * 7 * 2 = 5376 prompts
+DEFAULT_GRID = {
+    "age": [18, 25, 35, 50],
+    "beauty_score": [6.0, 7.5, 9.0],
+    "symmetry": [75.0, 90.0],
+    "skinClarity": [80.0, 93.0],
+    "proportions": [78.0, 88.0],
+    "expression": [75.0, 85.0],
+    "emotion": EMOTIONS,
+    "gender": ["male", "female"],
+}
+
+NUMERIC_FEATURES = ["age", "beauty_score", "symmetry", "skinClarity", "proportions", "expression"]
+# Rough spread of each numeric feature, so one unit of distance means the same everywhere
+NUMERIC_SCALES = np.array([10.0, 1.5, 8.0, 6.0, 5.0, 5.0], dtype=np.float32)
+GENDERS = ["male", "female"]
+# Categorical mismatches should outweigh small numeric differences
+CATEGORICAL_WEIGHT = 3.0
+
+
+def feature_vector(age: float, gender: str, beauty_score: float, emotion: str, facial_features: Dict) -> np.ndarray:
+    """Encode one analysis as a scaled numeric vector plus weighted one-hots"""
+    numeric = np.array(
+        [age, beauty_score, facial_features["symmetry"], facial_features["skinClarity"],
+         facial_features["proportions"], facial_features["expression"]],
+        dtype=np.float32,
+    ) / NUMERIC_SCALES
+    emotion = (emotion or "").lower()
+    gender = (gender or "").lower()
+    gender = {"man": "male", "m": "male", "woman": "female", "f": "female"}.get(gender, gender)
+    onehots = np.array(
+        [emotion == e for e in EMOTIONS] + [gender == g for g in GENDERS], dtype=np.float32
+    ) * CATEGORICAL_WEIGHT
+    return np.concatenate([numeric, onehots])
+
+
+class InsightCorpus:
+    """Precomputed insights searchable by feature similarity"""
+
+    def __init__(self, features: np.ndarray, entries: List[Dict[str, List[int]]], phrases: List[str]):
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.entries = entries
+        self.phrases = phrases
+        self._norms = (self.features ** 2).sum(axis=1)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, path: str) -> "InsightCorpus":
+        with np.load(path) as data:
+            width = len(NUMERIC_FEATURES) + len(EMOTIONS) + len(GENDERS)
+            if data["features"].shape[1] != width:
+                raise ValueError(f"built with {data['features'].shape[1]} features instead of {width}, rebuild it")
+            payload = json.loads(bytes(data["payload"]).decode("utf-8"))
+            return cls(data["features"], payload["entries"], payload["phrases"])
+
+    def save(self, path: str):
+        payload = json.dumps({"entries": self.entries, "phrases": self.phrases}, ensure_ascii=False)
+        np.savez_compressed(
+            path, features=self.features, payload=np.frombuffer(payload.encode("utf-8"), dtype=np.uint8)
+        )
+
+    def insights(self, index: int) -> Dict[str, List[str]]:
+        entry = self.entries[index]
+        return {category: [self.phrases[i] for i in entry.get(category, [])] for category in CATEGORIES}
+
+    def nearest_many(self, queries: np.ndarray, k: int = 1) -> np.ndarray:
+        """Indices of the k nearest entries for each query row (squared euclidean)"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        distances = self._norms[None, :] - 2.0 * queries @ self.features.T + (queries ** 2).sum(axis=1)[:, None]
+        k = min(k, len(self.entries))
+        if k == 1:
+            return distances.argmin(axis=1)[:, None]
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(distances, nearest, axis=1).argsort(axis=1)
+        return np.take_along_axis(nearest, order, axis=1)
+
+    def lookup(self, age: float, gender: str, beauty_score: float, emotion: str, facial_features: Dict,
+               k: int = 3) -> Dict[str, List[str]]:
+        """Insights of a random pick among the k closest entries"""
+        candidates = self.nearest_many(feature_vector(age, gender, beauty_score, emotion, facial_features), k)[0]
+        return self.insights(int(random.choice(candidates)))
+
+
+def load_corpus(path: str = INSIGHT_CORPUS_FILE) -> Optional[InsightCorpus]:
+    """Load the corpus if it has been built, otherwise return None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        corpus = InsightCorpus.load(path)
+        logger.info(f"Loaded insight corpus with {len(corpus)} entries from {path}")
+        return corpus
+    except Exception as e:
+        logger.error(f"Error loading insight corpus {path}: {e}")
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Offline build
+# ---------------------------------------------------------------------------
+
+def grid_points(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def request_body(shape: str, model: str, prompt: str) -> Dict[str, Any]:
+    """Same payloads main.py sends to the chat-completions and HF inference APIs"""
+    if shape == "hf":
+        return {
+            "inputs": f"System: You are a fun AI that generates personality insights. User: {prompt}",
+            "parameters": {"max_new_tokens": 500, "temperature": 0.8, "return_full_text": False},
+        }
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": INSIGHT_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "max_tokens": 500,
+        "temperature": 0.8,
+    }
+
+
+def response_text(shape: str, data: Any) -> str:
+    if shape == "hf":
+        return data[0].get("generated_text", "") if isinstance(data, list) and data else ""
+    return data["choices"][0]["message"]["content"]
+
+
+async def build(args) -> InsightCorpus:
+    import httpx
+
+    points = grid_points(DEFAULT_GRID)
+    if args.limit:
+        random.Random(0).shuffle(points)
+        points = points[:args.limit]
+    headers = {"Content-Type": "application/json"}
+    if args.api_key:
+        headers["Authorization"] = f"Bearer {args.api_key}"
+
+    features: List[np.ndarray] = []
+    entries: List[Dict[str, List[int]]] = []
+    phrases: List[str] = []
+    phrase_ids: Dict[str, int] = {}
+    failures = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def fetch(client, point):
+        nonlocal failures
+        facial_features = {key: point[key] for key in ("symmetry", "skinClarity", "proportions", "expression")}
+        prompt = build_insight_prompt(point["age"], point["gender"], point["beauty_score"], point["emotion"], facial_features)
+        for attempt in range(args.retries + 1):
+            async with semaphore:
+                try:
+                    response = await client.post(args.url, headers=headers, json=request_body(args.shape, args.model, prompt))
+                except httpx.HTTPError as e:
+                    logger.warning(f"Request failed: {e}")
+                    response = None
+            if response is not None and response.status_code == 200:
+                parsed = parse_ai_response(response_text(args.shape, response.json()))
+                # Only keep answers that parsed into real categories
+                if sum(1 for category in CATEGORIES if parsed.get(category)) >= 2:
+                    entry = {}
+                    for category in CATEGORIES:
+                        ids = []
+                        for phrase in parsed.get(category, []):
+                            if phrase not in phrase_ids:
+                                phrase_ids[phrase] = len(phrases)
+                                phrases.append(phrase)
+                            ids.append(phrase_ids[phrase])
+                        entry[category] = ids
+                    features.append(feature_vector(point["age"], point["gender"], point["beauty_score"],
+                                                   point["emotion"], facial_features))
+                    entries.append(entry)
+                    return
+            if attempt < args.retries:
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+                await asyncio.sleep(min(float(retry_after or 2 ** attempt), 60.0))
+        failures += 1
+
+    async with httpx.AsyncClient(timeout=args.timeout) as client:
+        tasks = [fetch(client, point) for point in points]
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            await task
+            if done % 100 == 0 or done == len(tasks):
+                print(f"   {done}/{len(tasks)} prompts, {len(entries)} kept, {failures} failed")
+
+    if not entries:
+        raise RuntimeError("No usable insights were returned; corpus not written")
+    return InsightCorpus(np.stack(features), entries, phrases)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the precomputed insight corpus")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = sub.add_parser("build", help="query an LLM over the feature grid")
+    build_parser.add_argument("--url", default="http://127.0.0.1:8088/v1/chat/completions")
+    build_parser.add_argument("--shape", choices=["chat", "hf"], default="chat")
+    build_parser.add_argument("--model", default="gpt-3.5-turbo")
+    build_parser.add_argument("--api-key", default=os.getenv("OPENAI_API_KEY"))
+    build_parser.add_argument("--out", default=INSIGHT_CORPUS_FILE)
+    build_parser.add_argument("--concurrency", type=int, default=4)
+    build_parser.add_argument("--retries", type=int, default=2)
+    build_parser.add_argument("--timeout", type=float, default=30.0)
+    build_parser.add_argument("--limit", type=int, help="only query a random subset of the grid")
+
+    stats_parser = sub.add_parser("stats", help="summarize an existing corpus")
+    stats_parser.add_argument("path", nargs="?", default=INSIGHT_CORPUS_FILE)
+
+    args = parser.parse_args()
+    if args.command == "build":
+        print(f"🧠 Building insight corpus from {args.url}")
+        corpus = asyncio.run(build(args))
+        corpus.save(args.out)
+        print(f"✓ Saved {len(corpus)} entries, {len(corpus.phrases)} unique phrases to {args.out} "
+              f"({os.path.getsize(args.out) / 1024:.1f} KB)")
+    else:
+        corpus = InsightCorpus.load(args.path)
+        print(f"📚 {args.path}: {len(corpus)} entries, {len(corpus.phrases)} unique phrases, "
+              f"{corpus.features.shape[1]} features")
+
+
+if __name__ == "__main__":
+    main()
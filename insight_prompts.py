@@ -0,0 +1,80 @@
+"""
+Prompt building and response parsing for LLM personality insights.
+
+Shared by main.py and the offline corpus builder (insight_corpus.py) so both
+ask the providers the same question and read the answers the same way.
+"""
+
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+INSIGHT_SYSTEM_PROMPT = 'You are a fun, encouraging AI that analyzes facial features and generates entertaining personality insights. Be creative, use emojis, and make people feel special!'
+
+
+def build_insight_prompt(age: int, gender: str, beauty_score: float, emotion: str, facial_features: Dict) -> str:
+    """Create a detailed prompt for the AI"""
+    return f"""
+    Based on this facial analysis, generate fun and engaging personality insights:
+    
+    Age: {age} years old
+    Gender: {gender}
+    Beauty Score: {beauty_score}/10
+    Emotion: {emotion}
+    Facial Features:
+    - Symmetry: {facial_features['symmetry']:.1f}%
+    - Skin Clarity: {facial_features['skinClarity']:.1f}%
+    - Proportions: {facial_features['proportions']:.1f}%
+    - Expression: {facial_features['expression']:.1f}%
+    
+    Generate 4 categories of insights:
+    1. Achievements (like "Future K-pop Idol", "Class President Material")
+    2. Personality Traits (like "Natural Leader", "Creative Genius")
+    3. Future Predictions (like "Will become famous", "Will have amazing relationships")
+    4. Fun Facts (like "Your smile lights up rooms", "You have mysterious aura")
+    
+    Make them fun, engaging, and personalized to the analysis results. Include emojis and be encouraging!
+    """
+
+
+def parse_ai_response(ai_response: str) -> Dict:
+    """Parse AI response into structured format"""
+    try:
+        # Try to extract structured data from AI response
+        insights = {
+            "achievements": [],
+            "personality_traits": [],
+            "future_predictions": [],
+            "fun_facts": []
+        }
+        
+        # Simple parsing - look for patterns in the response
+        lines = ai_response.split('\n')
+        current_category = None
+        
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+                
+            if 'achievement' in line.lower() or '1.' in line:
+                current_category = 'achievements'
+            elif 'personality' in line.lower() or 'trait' in line.lower() or '2.' in line:
+                current_category = 'personality_traits'
+            elif 'future' in line.lower() or 'prediction' in line.lower() or '3.' in line:
+                current_category = 'future_predictions'
+            elif 'fun fact' in line.lower() or '4.' in line:
+                current_category = 'fun_facts'
+            elif current_category and line.startswith('-') or line.startswith('•'):
+                insights[current_category].append(line[1:].strip())
+        
+        # If parsing failed, return the raw response
+        if not any(insights.values()):
+            insights["fun_facts"] = [ai_response]
+            
+        return insights
+        
+    except Exception as e:
+        logger.warning(f"Failed to parse AI response: {e}")
+        return {"fun_facts": [ai_response]}
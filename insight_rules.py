@@ -0,0 +1,733 @@
+"""
+Table-driven rules engine for the local insight generators.
+
+Every local generator in main.py used to be a long if/elif chain that rebuilt
+its emoji phrase lists on every call. The chains now live here as data:
+
+- Threshold: one feature compared against a monotone chain of thresholds
+  (``beauty_score >= 9.0 / >= 8.0 / ...``), compiled into a sorted array and
+  resolved with bisect (or numpy.searchsorted for batches).
+- Choice: a categorical feature (emotion, gender) mapped to a phrase pool.
+- Cascade: first-match chains whose clauses combine several features.
+
+RULES and COMMENT_RULES are compiled once at import time. ``evaluate`` handles a
+single analysis, ``evaluate_many`` evaluates a whole batch of analyses with one
+vectorized pass per rule.
+"""
+
+import bisect
+import operator
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CATEGORIES = ("achievements", "personality_traits", "future_predictions", "fun_facts")
+
+OPERATORS = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+}
+
+# ---------------------------------------------------------------------------
+# Rule table
+#
+# Each rule is a plain dict so the table stays declarative:
+#   {"type": "threshold", "category", "feature", "op", "bands": [(value, pool)], "default"}
+#   {"type": "choice", "category", "feature", "pools": {value: pool}, "default"}
+#   {"type": "cascade", "category", "clauses": [([(feature, op, value)], pool)], "default"}
+# Bands and clauses are listed in the same order as the original elif chains.
+# "pick": "all" extends the category with the whole pool, "one" picks one phrase.
+# ---------------------------------------------------------------------------
+
+RULES: Dict[str, List[Dict[str, Any]]] = {
+    "personality": [
+        {
+            "type": "threshold", "category": "achievements", "feature": "beauty_score", "op": ">=",
+            "bands": [
+                (9.0, ("👑 Future K-pop Idol", "🏆 Beauty Pageant Winner", "⭐ Most Popular in School", "💫 Instagram Influencer Potential")),
+                (8.0, ("🎭 Drama Club Star", "📸 Model Material", "👥 Class President Material", "💝 Most Likely to Get 20+ Crushes")),
+                (7.0, ("📚 Future Tutor", "🎨 Creative Genius", "🤝 Natural Leader", "💕 Relationship Expert")),
+                (6.0, ("🎯 Goal Achiever", "🌟 Hidden Talent", "💪 Confidence Builder", "🎪 Life of the Party")),
+            ],
+            "default": ("💎 Diamond in the Rough", "🌱 Growth Mindset", "🎭 Character Actor", "💫 Late Bloomer"),
+        },
+        {
+            "type": "threshold", "category": "personality_traits", "feature": "age", "op": "<",
+            "bands": [
+                (20, ("🎓 Academic Excellence", "🚀 Ambitious Dreamer", "🎵 Trendsetter", "💡 Innovative Thinker")),
+                (30, ("💼 Career Climber", "🌍 World Traveler", "🎯 Goal-Oriented", "💪 Confident Leader")),
+            ],
+            "default": ("🧠 Wise Mentor", "🏠 Life Experience", "💎 Mature Beauty", "🌟 Inspirational Figure"),
+        },
+        {
+            "type": "threshold", "category": "future_predictions", "feature": "beauty_score", "op": ">=",
+            "bands": [
+                (8.5, ("🌟 Will become a famous celebrity", "💍 Will have the most romantic proposals", "🏆 Will win multiple awards", "📱 Will have 1M+ social media followers")),
+                (7.5, ("💼 Will be a successful entrepreneur", "🎭 Will star in movies/TV shows", "💕 Will have amazing relationships", "🌍 Will travel the world")),
+            ],
+            "default": ("💎 Will discover hidden talents", "🎯 Will achieve personal goals", "💪 Will overcome challenges", "🌟 Will inspire others"),
+        },
+        {
+            "type": "choice", "category": "fun_facts", "feature": "emotion",
+            "pools": {
+                "happy": ("😊 Your smile lights up every room", "🎉 You're the life of every party", "💫 Positive energy radiates from you", "🌟 You make everyone around you happy"),
+                "neutral": ("🎭 You have a mysterious aura", "💎 You're like a hidden gem", "🌙 You have a calm, peaceful presence", "🎯 You're focused and determined"),
+            },
+            "default": ("🎨 You have artistic depth", "💭 You're a deep thinker", "🎪 You have dramatic flair", "💫 You're intriguing and complex"),
+        },
+        {
+            "type": "choice", "category": "fun_facts", "feature": "gender",
+            "pools": {
+                ("male", "m"): ("💪 You have strong leadership qualities", "🎯 You're goal-oriented and ambitious", "🛡️ You're protective and caring", "🌟 You have natural charisma"),
+                ("female", "f"): ("💎 You have elegant beauty", "🎭 You're graceful and poised", "💕 You have a warm, caring nature", "✨ You're naturally charming"),
+            },
+            "default": (),
+        },
+    ],
+    "local_ai": [
+        {
+            "type": "cascade", "category": "achievements",
+            "clauses": [
+                ([("beauty_score", ">=", 9.0), ("symmetry", ">", 90)], ("👑 Future K-pop Idol - Your perfect symmetry is idol material!",)),
+                ([("beauty_score", ">=", 8.5), ("expression", ">", 80)], ("🎭 Drama Club Star - Your expressive face is made for the stage!",)),
+                ([("beauty_score", ">=", 8.0), ("skinClarity", ">", 90)], ("📸 Model Material - Your flawless skin is camera-ready!",)),
+                ([("beauty_score", ">=", 7.5), ("proportions", ">", 85)], ("👥 Class President Material - Your balanced features show leadership!",)),
+                ([("beauty_score", ">=", 7.0)], ("📚 Future Tutor - Your approachable look makes you a natural teacher!",)),
+            ],
+            "default": ("💎 Diamond in the Rough - Your unique beauty is special!",),
+        },
+        {
+            "type": "threshold", "category": "personality_traits", "feature": "symmetry", "op": ">",
+            "bands": [(90, ("🎯 Balanced & Harmonious - Your symmetrical features reflect inner peace!",))],
+            "default": (),
+        },
+        {
+            "type": "threshold", "category": "personality_traits", "feature": "skinClarity", "op": ">",
+            "bands": [(90, ("✨ Pure & Authentic - Your clear skin shows your genuine nature!",))],
+            "default": (),
+        },
+        {
+            "type": "threshold", "category": "personality_traits", "feature": "expression", "op": ">",
+            "bands": [(85, ("💫 Expressive & Charismatic - Your face tells amazing stories!",))],
+            "default": (),
+        },
+        {
+            "type": "threshold", "category": "personality_traits", "feature": "proportions", "op": ">",
+            "bands": [(85, ("🌟 Well-Proportioned - Your balanced features show good judgment!",))],
+            "default": (),
+        },
+        {
+            "type": "cascade", "category": "personality_traits",
+            "clauses": [
+                ([("age", "<", 25), ("beauty_score", ">", 8.0)], ("🚀 Young & Ambitious - Your youthful beauty is full of potential!",)),
+                ([("age", ">=", 25), ("beauty_score", ">", 7.0)], ("💼 Mature & Confident - Your beauty shows life experience!",)),
+            ],
+            "default": (),
+        },
+        {
+            "type": "threshold", "category": "future_predictions", "feature": "beauty_score", "op": ">=",
+            "bands": [
+                (9.0, ("🌟 Will become a famous celebrity - Your beauty is undeniable!",)),
+                (8.0, ("💼 Will be a successful entrepreneur - Your confidence will lead to success!",)),
+                (7.0, ("💕 Will have amazing relationships - Your warm presence attracts people!",)),
+            ],
+            "default": ("💎 Will discover hidden talents - Your unique charm will shine!",),
+        },
+        {
+            "type": "cascade", "category": "fun_facts",
+            "clauses": [
+                ([("emotion", "==", "happy"), ("expression", ">", 80)], ("😊 Your smile lights up every room - it's absolutely contagious!",)),
+                ([("emotion", "==", "neutral"), ("symmetry", ">", 85)], ("🎭 You have a mysterious, elegant aura - people are drawn to you!",)),
+                ([("skinClarity", ">", 90)], ("✨ Your radiant skin reflects your inner glow!",)),
+                ([("proportions", ">", 85)], ("🌟 Your perfectly proportioned features show natural harmony!",)),
+            ],
+            "default": (),
+        },
+    ],
+    "crazy_fun": [
+        {
+            "type": "threshold", "category": "achievements", "feature": "beauty_score", "op": ">=",
+            "bands": [
+                (9.0, (
+                    "🔥 MrBeast's Secret Younger Brother - He's been hiding you this whole time!",
+                    "👑 BTS's 8th Member - Taehyung's long-lost twin!",
+                    "🎮 Squid Game Winner - You'd survive all the games with that face!",
+                    "💎 K-pop Idol Material - SM Entertainment is already calling!",
+                    "🌟 Netflix Star - Stranger Things season 5 needs you!",
+                    "🎭 Hollywood's Next Big Thing - Tom Holland who?",
+                    "💫 TikTok Famous - 10M followers by next week!",
+                )),
+                (8.0, (
+                    "🎪 Circus Ringmaster - Your face commands attention!",
+                    "🏆 America's Got Talent Winner - Simon Cowell would give you a golden buzzer!",
+                    "🎵 K-pop Trainee - JYP is probably stalking your Instagram!",
+                    "💍 Bachelor/Bachelorette Material - You'd break the internet!",
+                    "🎬 Marvel Superhero - Captain America's replacement!",
+                    "🌟 Disney Princess/Prince - Live-action remake incoming!",
+                    "💪 Gym Motivation - You'd make everyone want to work out!",
+                )),
+                (7.0, (
+                    "📚 Future Professor - Students would actually pay attention!",
+                    "🎨 Art Museum Exhibit - Your face belongs in the Louvre!",
+                    "💼 CEO Material - You'd make meetings actually fun!",
+                    "🎭 Broadway Star - Hamilton 2.0 needs you!",
+                    "🌟 Instagram Influencer - Brands would fight over you!",
+                    "💕 Dating App Legend - You'd break Tinder's algorithm!",
+                    "🎪 Life of Every Party - DJ Khaled would say 'Another one!'",
+                )),
+                (6.0, (
+                    "💎 Hidden Gem - Like finding a diamond in a coal mine!",
+                    "🎯 Goal Crusher - You'd make success look easy!",
+                    "🌟 Late Bloomer - Like a fine wine, getting better with age!",
+                    "💪 Confidence Builder - You'd make everyone feel better!",
+                    "🎪 Party Starter - The energy you bring is unmatched!",
+                    "💫 Unique Beauty - You're like a rare Pokemon!",
+                )),
+            ],
+            "default": (
+                "💎 Diamond in the Rough - Like a treasure chest waiting to be opened!",
+                "🌱 Growth Mindset - You're like a plant, just need some water!",
+                "🎭 Character Actor - You'd play the cool side character!",
+                "💫 Late Bloomer - Like a butterfly, transformation incoming!",
+                "🌟 Hidden Potential - You're like a secret weapon!",
+            ),
+        },
+        {
+            "type": "threshold", "category": "personality_traits", "feature": "symmetry", "op": ">",
+            "bands": [(90, (
+                "🎯 Perfectly Balanced - Like Thanos, but actually balanced!",
+                "✨ Symmetrical King/Queen - Your face is like a math equation!",
+                "🌟 Harmony Master - You could solve world peace with that symmetry!",
+            ))],
+            "default": (),
+        },
+        {
+            "type": "threshold", "category": "personality_traits", "feature": "skinClarity", "op": ">",
+            "bands": [(90, (
+                "✨ Flawless Skin - Like you were born with a filter!",
+                "💎 Crystal Clear - Your skin is like a diamond!",
+                "🌟 Glow Master - You're like a walking light bulb!",
+            ))],
+            "default": (),
+        },
+        {
+            "type": "threshold", "category": "personality_traits", "feature": "expression", "op": ">",
+            "bands": [(85, (
+                "🎭 Expressive AF - Your face tells stories better than Netflix!",
+                "💫 Charisma Bomb - You could sell ice to a penguin!",
+                "🌟 Energy Explosion - You're like a human Red Bull!",
+            ))],
+            "default": (),
+        },
+        {
+            "type": "threshold", "category": "personality_traits", "feature": "proportions", "op": ">",
+            "bands": [(85, (
+                "🎯 Perfect Proportions - Like you were designed by an architect!",
+                "🌟 Balanced AF - You're like a human golden ratio!",
+                "💎 Proportion Master - Your face is mathematically perfect!",
+            ))],
+            "default": (),
+        },
+        {
+            "type": "threshold", "category": "future_predictions", "feature": "beauty_score", "op": ">=",
+            "bands": [
+                (9.0, (
+                    "🌟 Will become more famous than MrBeast - He'll be jealous!",
+                    "💍 Will have 50 marriage proposals - Like a K-drama!",
+                    "🏆 Will win every award ever - Oscar, Grammy, Nobel Prize!",
+                    "📱 Will break the internet - Servers will crash because of you!",
+                    "🎬 Will star in every movie - Hollywood will be obsessed!",
+                    "💎 Will become a billionaire - Just by existing!",
+                )),
+                (8.0, (
+                    "💼 Will become CEO of a Fortune 500 - Just by walking in!",
+                    "🎭 Will win an Oscar - Academy will be like 'Who is this?!'",
+                    "💕 Will have the most epic love story - Like a movie!",
+                    "🌍 Will travel the world - Everyone will want to meet you!",
+                    "🌟 Will become a legend - People will write songs about you!",
+                )),
+            ],
+            "default": (
+                "💎 Will discover hidden talents - Like a superhero origin story!",
+                "🎯 Will achieve all goals - Success will be your middle name!",
+                "💪 Will overcome everything - Like a real-life Rocky!",
+                "🌟 Will inspire millions - You'll be like a motivational speaker!",
+            ),
+        },
+        {
+            "type": "choice", "category": "fun_facts", "feature": "emotion",
+            "pools": {
+                "happy": (
+                    "😊 Your smile could power a city - It's that bright!",
+                    "🎉 You're like a walking party - Everywhere you go becomes fun!",
+                    "💫 Your positive energy is contagious - Like a good virus!",
+                    "🌟 You make everyone happy - Like a human antidepressant!",
+                ),
+                "neutral": (
+                    "🎭 You have mysterious vibes - Like a K-drama protagonist!",
+                    "💎 You're like a hidden gem - People want to discover you!",
+                    "🌙 You have calm energy - Like a zen master!",
+                    "🎯 You're focused AF - Like a laser beam!",
+                ),
+            },
+            "default": (
+                "🎨 You have artistic depth - Like a walking museum!",
+                "💭 You're a deep thinker - Like a philosopher!",
+                "🎪 You have dramatic flair - Like a soap opera star!",
+                "💫 You're intriguing - Like a mystery novel!",
+            ),
+        },
+        {
+            "type": "threshold", "category": "fun_facts", "feature": "age", "op": "<",
+            "bands": [
+                (25, (
+                    "🎵 You're like a K-pop trainee - Ready to debut!",
+                    "🚀 You're young and ambitious - Like a startup founder!",
+                    "💫 You have that Gen Z energy - TikTok famous incoming!",
+                    "🌟 You're like a Disney Channel star - Ready for your show!",
+                )),
+                (35, (
+                    "💼 You're like a K-drama lead - Ready for your love story!",
+                    "🌍 You're worldly - Like a travel influencer!",
+                    "🎯 You're goal-oriented - Like a life coach!",
+                    "💪 You're confident - Like a motivational speaker!",
+                )),
+            ],
+            "default": (
+                "🧠 You're wise - Like a sage!",
+                "🏠 You have life experience - Like a walking encyclopedia!",
+                "💎 You have mature beauty - Like fine wine!",
+                "🌟 You're inspirational - Like a mentor!",
+            ),
+        },
+        {
+            "type": "choice", "category": "fun_facts", "feature": "gender",
+            "pools": {
+                ("male", "m"): (
+                    "💪 You're like a K-drama male lead - Ready for your love triangle!",
+                    "🎯 You're goal-oriented - Like a CEO in training!",
+                    "🛡️ You're protective - Like a superhero!",
+                    "🌟 You have natural charisma - Like a rock star!",
+                ),
+                ("female", "f"): (
+                    "💎 You're like a K-drama female lead - Ready for your Cinderella story!",
+                    "🎭 You're graceful - Like a ballerina!",
+                    "💕 You have a warm heart - Like a Disney princess!",
+                    "✨ You're naturally charming - Like a fairy tale character!",
+                ),
+            },
+            "default": (),
+        },
+    ],
+    # The make_specific_* helpers: one phrase per category
+    "smart_local": [
+        {
+            "type": "cascade", "category": "achievements",
+            "clauses": [
+                ([("beauty_score", ">=", 9.0), ("age", "<", 25)], ("🔥 Future MrBeast's Secret Brother - He's been hiding you this whole time!",)),
+                ([("beauty_score", ">=", 9.0)], ("👑 MrBeast's Dad - You're the OG that started it all!",)),
+                ([("beauty_score", ">=", 8.0), ("age", "<", 20)], ("🎓 Future Class President - Your face commands respect!",)),
+                ([("beauty_score", ">=", 8.0), ("age", "<", 30)], ("💼 Future CEO - You'll run a Fortune 500 company!",)),
+                ([("beauty_score", ">=", 8.0)], ("🌟 Future Mentor - You'll inspire millions!",)),
+                ([("beauty_score", ">=", 7.0), ("age", "<", 25)], ("📚 Future Professor - Students will actually pay attention!",)),
+                ([("beauty_score", ">=", 7.0)], ("🎭 Future Motivational Speaker - You'll change lives!",)),
+            ],
+            "default": ("💎 Future Hidden Gem - You'll surprise everyone!",),
+        },
+        {
+            "type": "cascade", "category": "personality_traits",
+            "clauses": [
+                ([("symmetry", ">", 90)], ("🎯 Perfectly Balanced - Like a human algorithm!",)),
+                ([("skinClarity", ">", 90)], ("✨ Flawless Logic - Your skin is like clean code!",)),
+                ([("expression", ">", 85)], ("💫 Charisma Algorithm - You could sell anything!",)),
+                ([("proportions", ">", 85)], ("🌟 Mathematical Beauty - Your face follows the golden ratio!",)),
+            ],
+            "default": ("💎 Unique Algorithm - You're like a rare programming language!",),
+        },
+        {
+            "type": "cascade", "category": "future_predictions",
+            "clauses": [
+                ([("beauty_score", ">=", 9.0), ("age", "<", 25)], ("🚀 Will invent the next iPhone - Apple will be calling!",)),
+                ([("beauty_score", ">=", 9.0)], ("💎 Will become a billionaire - Just by existing!",)),
+                ([("beauty_score", ">=", 8.0), ("age", "<", 30)], ("🌟 Will start a successful startup - Silicon Valley needs you!",)),
+                ([("beauty_score", ">=", 8.0)], ("🎬 Will star in a blockbuster movie - Hollywood is waiting!",)),
+                ([("beauty_score", ">=", 7.0)], ("💼 Will become a successful entrepreneur - Success is inevitable!",)),
+            ],
+            "default": ("💪 Will overcome all obstacles - Like a real-life superhero!",),
+        },
+        {
+            "type": "cascade", "category": "fun_facts",
+            "clauses": [
+                ([("emotion", "==", "happy")], ("😊 Your smile could power a data center - It's that efficient!",)),
+                ([("emotion", "==", "neutral")], ("🎭 You have mysterious energy - Like a quantum particle!",)),
+                ([("symmetry", ">", 90)], ("🎯 Your face is mathematically perfect - Like a theorem!",)),
+                ([("skinClarity", ">", 90)], ("✨ Your skin is like a high-resolution display - Crystal clear!",)),
+            ],
+            "default": ("💎 You're like a rare algorithm - Unique and powerful!",),
+        },
+    ],
+}
+
+# Comment generators: the rule picks one base template, ``source`` says where the
+# {insight} placeholder comes from ("achievements", "all" = any category, or
+# "first_achievement"), and ``full``/``empty`` wrap the base depending on whether
+# an insight was available.
+COMMENT_RULES: Dict[str, Dict[str, Any]] = {
+    "fun": {
+        "rule": {
+            "type": "threshold", "feature": "beauty_score", "op": ">=",
+            "bands": [
+                (9.0, ("🔥 WOW! You've got SERIOUS star potential! You'd definitely win first place on any audition show! 👑💫 {insight} material right here!",)),
+                (8.0, ("🌟 AMAZING! You're absolutely stunning! {insight} vibes all the way! ✨💖",)),
+                (7.0, ("💫 Fantastic! You have such natural beauty! {insight} potential for sure! 🌟",)),
+                (6.0, ("✨ Great! You have a unique and attractive look! {insight} in your future! 💪",)),
+            ],
+            "default": ("💎 Beautiful! You have a special kind of charm! {insight} waiting to happen! 🌱",),
+        },
+        "source": "achievements",
+        "full": "{base}",
+        "empty": "{base}",
+        "fallback": "Future Legend",
+    },
+    "ai": {
+        "rule": {
+            "type": "threshold", "feature": "beauty_score", "op": ">=",
+            "bands": [
+                (9.0, ("🔥 WOW! You've got SERIOUS star potential! Your beauty is absolutely stunning!",)),
+                (8.0, ("🌟 AMAZING! You're absolutely gorgeous! Your natural beauty is incredible!",)),
+                (7.0, ("💫 Fantastic! You have such natural beauty! You're absolutely lovely!",)),
+                (6.0, ("✨ Great! You have a unique and attractive look! You're beautiful!",)),
+            ],
+            "default": ("💎 Beautiful! You have a special kind of charm! You're unique!",),
+        },
+        "source": "all",
+        "full": "{base} {insight} 👑💫",
+        "empty": "{base} You're going to achieve amazing things! 🌟",
+        "fallback": "",
+    },
+    "crazy": {
+        "rule": {
+            "type": "threshold", "feature": "beauty_score", "op": ">=",
+            "bands": [
+                (9.0, (
+                    "🔥 HOLY MOLY! You're like MrBeast's secret sibling! This is INSANE!",
+                    "👑 WTF! You're literally BTS's 8th member! Taehyung who?!",
+                    "🌟 OMG! You're like a K-pop idol that got lost! SM Entertainment is calling!",
+                    "💎 STOP IT! You're too beautiful! This is illegal!",
+                    "🎬 Hollywood is missing out! You're like a movie star!",
+                    "💫 You're like a walking filter! This can't be real!",
+                )),
+                (8.0, (
+                    "🌟 DAMN! You're absolutely stunning! This is unfair!",
+                    "💎 WOW! You're like a K-drama lead! Netflix needs you!",
+                    "✨ You're gorgeous! Like actually gorgeous!",
+                    "🎭 You're like a Disney character! This is crazy!",
+                    "💫 You're beautiful! Like really beautiful!",
+                    "🌟 You're stunning! Like actually stunning!",
+                )),
+                (7.0, (
+                    "💫 Fantastic! You're really pretty! Like actually pretty!",
+                    "✨ You're lovely! Like really lovely!",
+                    "🌟 You're beautiful! Like actually beautiful!",
+                    "💎 You're attractive! Like really attractive!",
+                    "🎭 You're cute! Like actually cute!",
+                    "💫 You're pretty! Like really pretty!",
+                )),
+                (6.0, (
+                    "✨ Great! You have a unique look! Like really unique!",
+                    "🌟 You're attractive! Like actually attractive!",
+                    "💎 You're cute! Like really cute!",
+                    "🎭 You're pretty! Like actually pretty!",
+                    "💫 You're lovely! Like really lovely!",
+                    "✨ You're beautiful! Like actually beautiful!",
+                )),
+            ],
+            "default": (
+                "💎 Beautiful! You have a special charm! Like really special!",
+                "🌟 You're unique! Like actually unique!",
+                "💫 You're lovely! Like really lovely!",
+                "✨ You're cute! Like actually cute!",
+                "🎭 You're pretty! Like actually pretty!",
+                "💎 You're beautiful! Like actually beautiful!",
+            ),
+        },
+        "source": "all",
+        "full": "{base} {insight} 🔥💫👑",
+        "empty": "{base} You're going to be famous! 🌟💫👑",
+        "fallback": "",
+    },
+    "smart": {
+        "rule": {
+            "type": "cascade",
+            "clauses": [
+                ([("beauty_score", ">=", 9.0), ("age", "<", 25)], ("🔥 HOLY MOLY! {insight}! This is absolutely INSANE! 🔥",)),
+                ([("beauty_score", ">=", 9.0)], ("👑 WTF! {insight}! You're the real deal! 👑",)),
+                ([("beauty_score", ">=", 8.0)], ("🌟 DAMN! {insight}! This is next level! 🌟",)),
+                ([("beauty_score", ">=", 7.0)], ("💫 WOW! {insight}! You're going places! 💫",)),
+                ([("beauty_score", ">=", 6.0)], ("✨ NICE! {insight}! You've got potential! ✨",)),
+            ],
+            "default": ("💎 COOL! {insight}! You're unique! 💎",),
+        },
+        "source": "first_achievement",
+        "full": "{base}",
+        "empty": "{base}",
+        "fallback": "Future Legend",
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# Compiled rules
+# ---------------------------------------------------------------------------
+
+class ThresholdRule:
+    """Monotone threshold chain on one numeric feature, resolved by bisect"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.category = spec.get("category")
+        self.feature = spec["feature"]
+        self.pick = spec.get("pick", "all")
+        op = spec["op"]
+        values = [value for value, _ in spec["bands"]]
+        if op in (">=", ">"):
+            # Descending elif chain: the highest band wins, index 0 is the default
+            if values != sorted(values, reverse=True):
+                raise ValueError(f"Threshold chain on '{self.feature}' must be descending for '{op}'")
+            ordered = list(reversed(spec["bands"]))
+            self.pools = [tuple(spec["default"])] + [tuple(pool) for _, pool in ordered]
+        elif op in ("<", "<="):
+            # Ascending elif chain: the lowest band wins, the last index is the default
+            if values != sorted(values):
+                raise ValueError(f"Threshold chain on '{self.feature}' must be ascending for '{op}'")
+            ordered = list(spec["bands"])
+            self.pools = [tuple(pool) for _, pool in ordered] + [tuple(spec["default"])]
+        else:
+            raise ValueError(f"Unsupported threshold operator: {op}")
+        self.thresholds = [float(value) for value, _ in ordered]
+        self.side = "right" if op in (">=", "<") else "left"
+        self._bisect = bisect.bisect_right if self.side == "right" else bisect.bisect_left
+        self._thresholds_array = np.asarray(self.thresholds, dtype=float)
+
+    def index(self, features: Dict[str, Any]) -> int:
+        return self._bisect(self.thresholds, features[self.feature])
+
+    def index_many(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        return np.searchsorted(self._thresholds_array, columns[self.feature], side=self.side)
+
+
+class ChoiceRule:
+    """Categorical feature mapped to phrase pools with a dict lookup"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.category = spec.get("category")
+        self.feature = spec["feature"]
+        self.pick = spec.get("pick", "all")
+        self.pools = [tuple(spec["default"])]
+        self.lookup: Dict[Any, int] = {}
+        for keys, pool in spec["pools"].items():
+            self.pools.append(tuple(pool))
+            for key in (keys if isinstance(keys, tuple) else (keys,)):
+                self.lookup[key] = len(self.pools) - 1
+
+    def index(self, features: Dict[str, Any]) -> int:
+        return self.lookup.get(features[self.feature], 0)
+
+    def index_many(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        lookup = self.lookup
+        return np.fromiter((lookup.get(value, 0) for value in columns[self.feature]),
+                           dtype=np.intp, count=len(columns[self.feature]))
+
+
+class CascadeRule:
+    """First-match chain of multi-feature clauses"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.category = spec.get("category")
+        self.pick = spec.get("pick", "all")
+        self.clauses: List[List[Tuple[str, Any, Any]]] = []
+        self.pools: List[Tuple[str, ...]] = []
+        for conditions, pool in spec["clauses"]:
+            self.clauses.append([(feature, OPERATORS[op], value) for feature, op, value in conditions])
+            self.pools.append(tuple(pool))
+        self.pools.append(tuple(spec["default"]))
+
+    def index(self, features: Dict[str, Any]) -> int:
+        for i, conditions in enumerate(self.clauses):
+            if all(op(features[feature], value) for feature, op, value in conditions):
+                return i
+        return len(self.clauses)
+
+    def index_many(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        size = len(next(iter(columns.values())))
+        result = np.full(size, len(self.clauses), dtype=np.intp)
+        # Walk the clauses backwards so earlier clauses overwrite later matches
+        for i in range(len(self.clauses) - 1, -1, -1):
+            mask = np.ones(size, dtype=bool)
+            for feature, op, value in self.clauses[i]:
+                mask &= op(columns[feature], value)
+            result[mask] = i
+        return result
+
+
+RULE_TYPES = {
+    "threshold": ThresholdRule,
+    "choice": ChoiceRule,
+    "cascade": CascadeRule,
+}
+
+
+def compile_rule(spec: Dict[str, Any]):
+    """Compile one declarative rule into its lookup structure"""
+    return RULE_TYPES[spec["type"]](spec)
+
+
+def compile_rules(table: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Any]]:
+    """Compile a whole rule table, keyed by generator name"""
+    return {name: [compile_rule(spec) for spec in specs] for name, specs in table.items()}
+
+
+COMPILED_RULES = compile_rules(RULES)
+COMPILED_COMMENTS = {
+    name: dict(spec, rule=compile_rule(spec["rule"])) for name, spec in COMMENT_RULES.items()
+}
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+def analysis_features(age: int, gender: str, beauty_score: float, emotion: str,
+                      facial_features: Optional[Dict] = None) -> Dict[str, Any]:
+    """Flatten one analysis into the feature dict the rules read"""
+    features = {
+        "age": age,
+        "gender": (gender or "").lower(),
+        "beauty_score": beauty_score,
+        "emotion": emotion,
+    }
+    if facial_features:
+        features.update(facial_features)
+    return features
+
+
+def _empty_insights() -> Dict[str, List[str]]:
+    return {category: [] for category in CATEGORIES}
+
+
+def _apply(insights: Dict[str, List[str]], rule, pool: Tuple[str, ...]):
+    if not pool:
+        return
+    if rule.pick == "one":
+        insights[rule.category].append(random.choice(pool))
+    else:
+        insights[rule.category].extend(pool)
+
+
+def evaluate(generator: str, features: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Evaluate one generator's rules for a single analysis"""
+    insights = _empty_insights()
+    for rule in COMPILED_RULES[generator]:
+        _apply(insights, rule, rule.pools[rule.index(features)])
+    return insights
+
+
+def evaluate_category(generator: str, category: str, features: Dict[str, Any]) -> List[str]:
+    """Evaluate only the rules of one category (used by the make_specific_* helpers)"""
+    phrases: List[str] = []
+    for rule in COMPILED_RULES[generator]:
+        if rule.category == category:
+            phrases.extend(rule.pools[rule.index(features)])
+    return phrases
+
+
+def evaluate_many(generator: str, analyses: Sequence[Dict[str, Any]]) -> List[Dict[str, List[str]]]:
+    """Evaluate one generator for a batch of feature dicts in one vectorized pass per rule"""
+    if not analyses:
+        return []
+    columns: Dict[str, np.ndarray] = {}
+    for key in analyses[0]:
+        values = [features[key] for features in analyses]
+        if isinstance(values[0], str):
+            columns[key] = np.asarray(values, dtype=object)
+        else:
+            columns[key] = np.asarray(values, dtype=float)
+
+    results = [_empty_insights() for _ in analyses]
+    for rule in COMPILED_RULES[generator]:
+        pools = rule.pools
+        for insights, idx in zip(results, rule.index_many(columns).tolist()):
+            _apply(insights, rule, pools[idx])
+    return results
+
+
+def render_comment(name: str, features: Dict[str, Any], insights: Dict[str, List[str]]) -> str:
+    """Render one of the comment generators from its compiled rule"""
+    spec = COMPILED_COMMENTS[name]
+    rule = spec["rule"]
+
+    source = spec["source"]
+    if source == "first_achievement":
+        achievements = insights.get("achievements") or []
+        insight = achievements[0] if achievements else None
+    elif source == "all":
+        candidates = [item for category in insights.values() for item in category]
+        insight = random.choice(candidates) if candidates else None
+    else:
+        candidates = insights.get(source) or []
+        insight = random.choice(candidates) if candidates else None
+
+    # Single-template bands need no random draw
+    templates = rule.pools[rule.index(features)]
+    base = templates[0] if len(templates) == 1 else random.choice(templates)
+
+    if insight is None:
+        return spec["empty"].format(base=base.format(insight=spec["fallback"]))
+    return spec["full"].format(base=base.format(insight=insight), insight=insight)
+
+
+def benchmark(iterations: int = 20000, batch_size: int = 1000):
+    """Print per-analysis cost of the local fallback path"""
+    import time
+
+    rng = random.Random(0)
+    batch = [
+        analysis_features(
+            rng.randint(15, 60), rng.choice(["male", "female", "Man", "Woman"]),
+            rng.uniform(1.0, 10.0), rng.choice(["happy", "neutral", "sad", "angry"]),
+            {
+                "symmetry": rng.uniform(70, 95),
+                "skinClarity": rng.uniform(75, 95),
+                "proportions": rng.uniform(75, 90),
+                "expression": rng.choice([75, 85]),
+            },
+        )
+        for _ in range(batch_size)
+    ]
+
+    print(f"Local insight rules benchmark ({iterations} single calls, batches of {batch_size})")
+    for generator in COMPILED_RULES:
+        start = time.perf_counter()
+        for i in range(iterations):
+            evaluate(generator, batch[i % batch_size])
+        single_us = (time.perf_counter() - start) / iterations * 1e6
+
+        start = time.perf_counter()
+        evaluate_many(generator, batch)
+        batch_us = (time.perf_counter() - start) / batch_size * 1e6
+
+        print(f"  {generator:<12} single: {single_us:6.2f} µs/analysis   batched: {batch_us:6.2f} µs/analysis")
+
+    for name in COMPILED_COMMENTS:
+        insights = evaluate("personality", batch[0])
+        start = time.perf_counter()
+        for i in range(iterations):
+            render_comment(name, batch[i % batch_size], insights)
+        print(f"  comment:{name:<8} {(time.perf_counter() - start) / iterations * 1e6:6.2f} µs/comment")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,253 @@
+"""
+Background jobs for slow analyses.
+
+POST /jobs/analyze hands the upload to a JobManager, which runs the analysis on
+the inference pool and records every finished stage on the job. Clients poll
+GET /jobs/{id} (optionally long-polling with ``wait``) instead of holding the
+upload connection open for the whole pipeline.
+
+Jobs live in a TTL-bounded in-memory store by default. Set JOB_STORE=sqlite
+(and optionally JOB_DB_PATH) to keep them in SQLite so they survive restarts
+and can be read by every worker process.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "900"))
+JOB_MAX_ENTRIES = int(os.getenv("JOB_MAX_ENTRIES", "1000"))
+JOB_MAX_WAIT_SECONDS = 30.0
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED = (DONE, FAILED)
+
+
+def new_job(job_id: str, kind: str) -> Dict[str, Any]:
+    """Create an empty job record"""
+    now = time.time()
+    return {
+        "id": job_id,
+        "kind": kind,
+        "status": QUEUED,
+        "version": 0,
+        "created_at": now,
+        "updated_at": now,
+        "stages": [],
+        "result": None,
+        "error": None,
+    }
+
+
+class MemoryJobStore:
+    """In-process job store with TTL expiry and a size bound"""
+
+    def __init__(self, ttl: float = JOB_TTL_SECONDS, max_entries: int = JOB_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict[str, Any]):
+        with self._lock:
+            self._purge_locked()
+            self._jobs[job["id"]] = job
+            while len(self._jobs) > self.max_entries:
+                self._jobs.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if time.time() - job["updated_at"] > self.ttl:
+                del self._jobs[job_id]
+                return None
+            return json.loads(json.dumps(job, default=str))
+
+    def update(self, job_id: str, mutate: Callable[[Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            mutate(job)
+            job["version"] += 1
+            job["updated_at"] = time.time()
+            self._jobs.move_to_end(job_id)
+            return job
+
+    def purge(self):
+        with self._lock:
+            self._purge_locked()
+
+    def _purge_locked(self):
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job["updated_at"] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """Job store backed by a SQLite file, shared across processes"""
+
+    def __init__(self, path: str, ttl: float = JOB_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.reopen()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " updated_at REAL NOT NULL,"
+            " body TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)")
+
+    def reopen(self):
+        """(Re)connect; a forked worker must not use the connection it inherited"""
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+
+    def close(self):
+        self._conn.close()
+
+    def create(self, job: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, updated_at, body) VALUES (?, ?, ?)",
+                (job["id"], job["updated_at"], json.dumps(job, default=str)),
+            )
+        self.purge()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM jobs WHERE id = ? AND updated_at >= ?",
+                (job_id, time.time() - self.ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, job_id: str, mutate: Callable[[Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT body FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                if row is None:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                job = json.loads(row[0])
+                mutate(job)
+                job["version"] += 1
+                job["updated_at"] = time.time()
+                self._conn.execute(
+                    "UPDATE jobs SET updated_at = ?, body = ? WHERE id = ?",
+                    (job["updated_at"], json.dumps(job, default=str), job_id),
+                )
+                self._conn.execute("COMMIT")
+                return job
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def purge(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (time.time() - self.ttl,))
+
+
+def create_job_store():
+    """Pick the job store from the JOB_STORE environment variable"""
+    if os.getenv("JOB_STORE", "memory").lower() == "sqlite":
+        path = os.getenv("JOB_DB_PATH", "jobs.sqlite3")
+        logger.info(f"Using SQLite job store at {path}")
+        return SQLiteJobStore(path)
+    return MemoryJobStore()
+
+
+class JobManager:
+    """Runs staged work on an executor and records progress in a job store"""
+
+    def __init__(self, store, executor: Executor):
+        self.store = store
+        self.executor = executor
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def submit(self, kind: str, fn: Callable[..., Dict[str, Any]], *args) -> Dict[str, Any]:
+        """Queue ``fn(*args, on_stage=...)`` and return the new job record"""
+        self._loop = asyncio.get_running_loop()
+        job = new_job(uuid.uuid4().hex, kind)
+        self.store.create(job)
+        self._loop.run_in_executor(self.executor, self._run, job["id"], fn, args)
+        return job
+
+    def _run(self, job_id: str, fn: Callable[..., Dict[str, Any]], args):
+        def set_running(job):
+            job["status"] = RUNNING
+
+        def record_stage(name: str, payload: Dict[str, Any], elapsed: float):
+            def mutate(job):
+                job["stages"].append({"name": name, "elapsed_ms": round(elapsed * 1000, 1), "result": payload})
+            self._changed(self.store.update(job_id, mutate))
+
+        self._changed(self.store.update(job_id, set_running))
+        try:
+            result = fn(*args, on_stage=record_stage)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+
+            def set_failed(job):
+                job["status"] = FAILED
+                job["error"] = str(e)
+            self._changed(self.store.update(job_id, set_failed))
+            return
+
+        def set_done(job):
+            job["status"] = DONE
+            job["result"] = result
+        self._changed(self.store.update(job_id, set_done))
+
+    def _changed(self, job: Optional[Dict[str, Any]]):
+        if job is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake, job["id"])
+
+    def _wake(self, job_id: str):
+        for waiter in self._waiters.pop(job_id, []):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def get(self, job_id: str, since: Optional[int] = None, wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """Return a job, long-polling up to ``wait`` seconds for a version newer than ``since``"""
+        job = self.store.get(job_id)
+        if job is not None and since is None and wait > 0:
+            since = job["version"]
+        deadline = time.monotonic() + min(max(wait, 0.0), JOB_MAX_WAIT_SECONDS)
+        while job is not None and job["status"] not in FINISHED and since is not None and job["version"] <= since:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.setdefault(job_id, []).append(waiter)
+            try:
+                # Other processes can update a SQLite job, so re-read at least once a second
+                await asyncio.wait_for(waiter, timeout=min(remaining, 1.0))
+            except asyncio.TimeoutError:
+                pending = self._waiters.get(job_id, [])
+                if waiter in pending:
+                    pending.remove(waiter)
+                if not pending:
+                    self._waiters.pop(job_id, None)
+            job = self.store.get(job_id)
+        return job
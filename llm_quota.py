@@ -0,0 +1,254 @@
+"""
+Quota-aware scheduling for the free-tier LLM providers.
+
+Groq's free tier allows about 100 requests/day and Hugging Face about 30k/month.
+Once a quota is gone every call comes back 429 and the request only falls back
+to the local generator after a wasted round trip. The scheduler avoids that:
+
+- A QuotaLedger persists per-provider usage in SQLite, bucketed by UTC day and
+  month, so restarts and multiple workers share one count.
+- ``acquire`` only grants a call when the provider has budget left in every
+  window and usage is within the paced allowance for the time of day/month, so
+  the quota is spread out instead of burned in the morning rush.
+- A 429 blocks the provider until its Retry-After (or the end of the window).
+- When nothing can be acquired, callers go straight to the local generator.
+
+Limits come from <PROVIDER>_DAILY_QUOTA / <PROVIDER>_MONTHLY_QUOTA environment
+variables (0 or empty means unlimited).
+"""
+
+import calendar
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_QUOTA_DB = os.getenv("LLM_QUOTA_DB", "llm_quota.sqlite3")
+# Fraction of a window's quota that may be used ahead of the even pace
+LLM_QUOTA_BURST = float(os.getenv("LLM_QUOTA_BURST", "0.1"))
+
+DEFAULT_QUOTAS = {
+    "groq": {"daily": 100, "monthly": 0},
+    "openai": {"daily": 0, "monthly": 0},
+    "huggingface": {"daily": 0, "monthly": 30000},
+}
+
+
+def quota_from_env(provider: str, window: str, default: int) -> int:
+    value = os.getenv(f"{provider.upper()}_{window.upper()}_QUOTA")
+    return int(value) if value else default
+
+
+def window_bounds(window: str, now: float):
+    """Return (period key, window start, window length in seconds) for a UTC day or month"""
+    moment = datetime.fromtimestamp(now, tz=timezone.utc)
+    if window == "daily":
+        start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        return start.strftime("%Y-%m-%d"), start.timestamp(), 86400.0
+    start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    days = calendar.monthrange(moment.year, moment.month)[1]
+    return start.strftime("%Y-%m"), start.timestamp(), days * 86400.0
+
+
+class QuotaLedger:
+    """Per-provider request counts per UTC day and month, persisted in SQLite"""
+
+    def __init__(self, path: str = LLM_QUOTA_DB):
+        self.path = path
+        self.reopen()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS usage ("
+            " provider TEXT NOT NULL,"
+            " period TEXT NOT NULL,"
+            " count INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (provider, period))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blocks ("
+            " provider TEXT PRIMARY KEY,"
+            " until REAL NOT NULL)"
+        )
+
+    def reopen(self):
+        """(Re)connect; a forked worker must not use the connection it inherited"""
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+
+    def close(self):
+        self._conn.close()
+
+    def used(self, provider: str, period: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT count FROM usage WHERE provider = ? AND period = ?", (provider, period)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def try_consume(self, provider: str, allowances: Dict[str, float]) -> bool:
+        """Atomically add one request if every period stays within its allowance"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for period, allowance in allowances.items():
+                    row = self._conn.execute(
+                        "SELECT count FROM usage WHERE provider = ? AND period = ?", (provider, period)
+                    ).fetchone()
+                    if (row[0] if row else 0) + 1 > allowance:
+                        self._conn.execute("ROLLBACK")
+                        return False
+                for period in allowances:
+                    self._conn.execute(
+                        "INSERT INTO usage (provider, period, count) VALUES (?, ?, 1)"
+                        " ON CONFLICT (provider, period) DO UPDATE SET count = count + 1",
+                        (provider, period),
+                    )
+                self._conn.execute("COMMIT")
+                return True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def blocked_until(self, provider: str) -> float:
+        with self._lock:
+            row = self._conn.execute("SELECT until FROM blocks WHERE provider = ?", (provider,)).fetchone()
+        return row[0] if row else 0.0
+
+    def block(self, provider: str, until: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO blocks (provider, until) VALUES (?, ?)"
+                " ON CONFLICT (provider) DO UPDATE SET until = MAX(until, excluded.until)",
+                (provider, until),
+            )
+
+
+class QuotaScheduler:
+    """Grants provider calls within quota and pacing, otherwise signals local fallback"""
+
+    def __init__(self, ledger: QuotaLedger, quotas: Optional[Dict[str, Dict[str, int]]] = None,
+                 burst: float = LLM_QUOTA_BURST):
+        self.ledger = ledger
+        self.burst = burst
+        self.quotas = quotas or {
+            provider: {
+                window: quota_from_env(provider, window, default)
+                for window, default in windows.items()
+            }
+            for provider, windows in DEFAULT_QUOTAS.items()
+        }
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def paced_allowance(self, limit: int, window_start: float, length: float, now: float) -> float:
+        """Requests allowed so far in a window when the quota is spread evenly, plus a burst"""
+        elapsed = min(max(now - window_start, 0.0), length) / length
+        return min(float(limit), limit * elapsed + max(1.0, limit * self.burst))
+
+    def acquire(self, provider: str) -> bool:
+        """Reserve one call to ``provider`` if quota and pacing allow it"""
+        now = time.time()
+        if self.ledger.blocked_until(provider) > now:
+            self._count(f"{provider}.skipped_blocked")
+            return False
+        allowances = {}
+        for window, limit in self.quotas.get(provider, {}).items():
+            # Unlimited windows are still counted so usage shows up in snapshot()
+            period, start, length = window_bounds(window, now)
+            allowances[f"{window}:{period}"] = self.paced_allowance(limit, start, length, now) if limit else float("inf")
+        if not allowances:
+            allowances = {f"daily:{window_bounds('daily', now)[0]}": float("inf")}
+        if self.ledger.try_consume(provider, allowances):
+            self._count(f"{provider}.granted")
+            return True
+        self._count(f"{provider}.skipped_quota")
+        return False
+
+    def record(self, provider: str, status_code: int, retry_after: Optional[str] = None):
+        """Record a provider response; a 429 blocks the provider until it may be retried"""
+        self._count(f"{provider}.status_{status_code}")
+        if status_code != 429:
+            return
+        now = time.time()
+        until = None
+        if retry_after:
+            try:
+                until = now + float(retry_after)
+            except ValueError:
+                until = None
+        if until is None:
+            # Without Retry-After assume the tightest window has run out
+            windows = [w for w, limit in self.quotas.get(provider, {}).items() if limit] or ["daily"]
+            ends = []
+            for window in windows:
+                _, start, length = window_bounds(window, now)
+                ends.append(start + length)
+            until = min(ends)
+        logger.warning(f"{provider} rate limited, pausing until {datetime.fromtimestamp(until, tz=timezone.utc).isoformat()}")
+        self.ledger.block(provider, until)
+
+    def overflow(self):
+        """Count a request that fell back to local insights because every provider was out of quota"""
+        self._count("local.overflow")
+
+    def attempt(self) -> "QuotaAttempt":
+        return QuotaAttempt(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Remaining quota per provider and window, plus scheduler counters"""
+        now = time.time()
+        providers = {}
+        for provider, windows in self.quotas.items():
+            info: Dict[str, Any] = {"blocked_until": None}
+            blocked = self.ledger.blocked_until(provider)
+            if blocked > now:
+                info["blocked_until"] = datetime.fromtimestamp(blocked, tz=timezone.utc).isoformat()
+            for window, limit in windows.items():
+                period, start, length = window_bounds(window, now)
+                used = self.ledger.used(provider, f"{window}:{period}")
+                info[window] = {
+                    "period": period,
+                    "limit": limit or None,
+                    "used": used,
+                    "remaining": max(limit - used, 0) if limit else None,
+                    "paced_allowance": round(self.paced_allowance(limit, start, length, now), 1) if limit else None,
+                }
+            providers[provider] = info
+        with self._lock:
+            counters = dict(self._counters)
+        return {"providers": providers, "counters": counters}
+
+
+class QuotaAttempt:
+    """One request's walk through the providers; tells quota overflow apart from other fallbacks"""
+
+    def __init__(self, scheduler: QuotaScheduler):
+        self.scheduler = scheduler
+        self.tried = 0
+        self.limited = 0
+
+    def acquire(self, provider: str) -> bool:
+        self.tried += 1
+        if self.scheduler.acquire(provider):
+            return True
+        self.limited += 1
+        return False
+
+    def record(self, provider: str, status_code: int, retry_after: Optional[str] = None):
+        self.scheduler.record(provider, status_code, retry_after)
+        if status_code == 429:
+            self.limited += 1
+
+    def fallback(self):
+        """Call when falling back to local insights; counts overflow only if quota turned every provider away"""
+        if self.tried and self.limited >= self.tried:
+            self.scheduler.overflow()
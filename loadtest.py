@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Load test for /analyze/ against mock LLM providers.
+
+Starts mock_llm.py and the API (uvicorn main:app) as subprocesses, points the
+API's provider URLs at the mock, then runs one load phase per mock scenario
+(fast, slow, flaky, throttled, ...). Each phase reports throughput, latency
+percentiles, status codes and what the providers saw.
+
+Usage:
+    python loadtest.py --scenarios fast,slow,throttled --concurrency 8 --requests 200
+    python loadtest.py --target http://127.0.0.1:8000 --mock http://127.0.0.1:8088
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from mock_llm import provider_env
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def sample_image() -> bytes:
+    """Small JPEG used when no --image is given"""
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (480, 480), (236, 200, 180))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((120, 80, 360, 400), fill=(225, 185, 160))
+    draw.ellipse((180, 190, 215, 215), fill=(40, 30, 30))
+    draw.ellipse((265, 190, 300, 215), fill=(40, 30, 30))
+    draw.arc((190, 280, 290, 340), 0, 180, fill=(150, 60, 60), width=6)
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+async def run_phase(target: str, image: bytes, concurrency: int, total: int, timeout: float) -> Dict[str, Any]:
+    """Fire ``total`` /analyze/ requests with ``concurrency`` in flight"""
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    remaining = total
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await client.post(
+                    f"{target}/analyze/", files={"file": ("face.jpg", image, "image/jpeg")}
+                )
+                key = str(response.status_code)
+            except httpx.HTTPError as e:
+                key = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[key] = statuses.get(key, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p90": round(percentile(latencies, 90) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        },
+        "statuses": statuses,
+    }
+
+
+def wait_until_up(url: str, timeout: float = 120.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=2.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def start_servers(app_port: int, mock_port: int, workers: int) -> List[subprocess.Popen]:
+    """Start the mock providers and the API pointed at them"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    mock = subprocess.Popen(
+        [sys.executable, os.path.join(here, "mock_llm.py"), "--port", str(mock_port)], cwd=here
+    )
+    env = dict(os.environ, **provider_env(f"http://127.0.0.1:{mock_port}"))
+    # Measure the pipeline, not the per-client limits (every request comes from one address)
+    env.setdefault("ADMISSION_CONTROL", "off")
+    # Precomputed insights would answer every request without touching the mock providers
+    env.setdefault("INSIGHT_CORPUS_MODE", "off")
+    # The throttled scenarios record 429 blocks; keep them out of the real quota ledger
+    env["LLM_QUOTA_DB"] = os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "llm_quota.sqlite3")
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(app_port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=here, env=env,
+    )
+    return [mock, api]
+
+
+def print_phase(scenario: str, result: Dict[str, Any]):
+    lat = result["latency_ms"]
+    print(f"\n📊 Scenario: {scenario}")
+    print(f"   Requests:   {result['requests']} in {result['elapsed_s']}s ({result['throughput_rps']} req/s)")
+    print(f"   Latency ms: p50={lat['p50']} p90={lat['p90']} p95={lat['p95']} p99={lat['p99']} max={lat['max']}")
+    print(f"   Statuses:   {result['statuses']}")
+    if result.get("providers"):
+        print(f"   Providers:  {result['providers']}")
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    image = open(args.image, "rb").read() if args.image else sample_image()
+    results = []
+    async with httpx.AsyncClient(timeout=10.0) as control:
+        for scenario in args.scenarios.split(","):
+            if args.mock:
+                await control.post(f"{args.mock}/_mock/config", json={"scenario": scenario})
+                await control.post(f"{args.mock}/_mock/reset")
+            result = await run_phase(args.target, image, args.concurrency, args.requests, args.timeout)
+            result["scenario"] = scenario
+            if args.mock:
+                result["providers"] = (await control.get(f"{args.mock}/_mock/stats")).json()
+            results.append(result)
+            if not args.json:
+                print_phase(scenario, result)
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test /analyze/ under simulated LLM provider behaviour")
+    parser.add_argument("--target", help="base URL of a running API (default: start one)")
+    parser.add_argument("--mock", help="base URL of a running mock_llm.py (default: start one)")
+    parser.add_argument("--scenarios", default="fast,typical,slow,flaky,throttled")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="requests per scenario")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--image", help="image to upload (default: generated sample)")
+    parser.add_argument("--app-port", type=int, default=8765)
+    parser.add_argument("--mock-port", type=int, default=8088)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the spawned API")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    processes = []
+    if not args.target:
+        processes = start_servers(args.app_port, args.mock_port, args.workers)
+        args.target = f"http://127.0.0.1:{args.app_port}"
+        args.mock = f"http://127.0.0.1:{args.mock_port}"
+    try:
+        if args.mock:
+            wait_until_up(f"{args.mock}/_mock/stats")
+        wait_until_up(f"{args.target}/health")
+        results = asyncio.run(run(args))
+        if args.json:
+            print(json.dumps(results, indent=2))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
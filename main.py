@@ -1,13 +1,13 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from PIL import Image
 import numpy as np
 import os
 import io
 import cv2
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 import logging
 import math
 import random
@@ -15,6 +15,21 @@ import gc
 import time
 import requests
 import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import admission
+import api_responses
+import celebrity_catalog
+import gallery_media
+import insight_corpus
+import insight_rules
+import jobs
+import llm_quota
+import metrics
+import request_profiler
+import upload_reader
+from insight_prompts import INSIGHT_SYSTEM_PROMPT, build_insight_prompt, parse_ai_response
 
 # Import DeepFace with error handling
 try:
@@ -28,18 +43,38 @@ except ImportError as e:
 try:
     import insightface
     INSIGHTFACE_AVAILABLE = True
-    insightface_app = insightface.app.FaceAnalysis()
-    insightface_app.prepare(ctx_id=0, det_size=(640, 640))
 except ImportError as e:
     logging.warning(f"InsightFace not available: {e}")
     INSIGHTFACE_AVAILABLE = False
-    insightface_app = None
+insightface_app = None
+
+def load_insightface():
+    """Create the InsightFace models (onnxruntime sessions, each with its own native thread pool)"""
+    global insightface_app
+    if INSIGHTFACE_AVAILABLE and insightface_app is None:
+        insightface_app = insightface.app.FaceAnalysis()
+        insightface_app.prepare(ctx_id=0, det_size=(640, 640))
+
+# prefork.py sets this and loads the models in each worker, after fork()
+if os.getenv("DEFER_MODEL_LOAD", "0") != "1":
+    load_insightface()
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Face Analysis API", version="1.0.0")
+# orjson rendering for every JSON response; handlers with large payloads return
+# FastJSONResponse themselves so FastAPI's jsonable_encoder pass is skipped too
+app = FastAPI(title="AI Face Analysis API", version="1.0.0", default_response_class=api_responses.FastJSONResponse)
+
+# Analyses run on a thread pool so the event loop stays free for other requests.
+# Keep it at one worker unless the models are known to be safe to share.
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+
+# Per-client budgets and a bound on queued analyses (429 + Retry-After). Added before
+# CORS so that CORS wraps it and browsers can read the rejections.
+admission_controller = admission.AdmissionController(INFERENCE_WORKERS)
+app.add_middleware(admission.AdmissionMiddleware, controller=admission_controller)
 
 # Allow CORS for your frontend
 app.add_middleware(
@@ -61,21 +96,92 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for JSON bodies above COMPRESS_MIN_BYTES (outermost, so it sees the final response)
+app.add_middleware(api_responses.CompressionMiddleware)
+
+# Request counts and latency per route for GET /metrics; outermost, so 429s and compression are included
+app.add_middleware(metrics.MetricsMiddleware, routes=app.routes)
+
+inference_pool = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+job_manager = jobs.JobManager(jobs.create_job_store(), inference_pool)
+
+# LLM provider endpoints (point these at mock_llm.py to test without real keys)
+GROQ_API_URL = os.getenv('GROQ_API_URL', 'https://api.groq.com/openai/v1/chat/completions')
+OPENAI_API_URL = os.getenv('OPENAI_API_URL', 'https://api.openai.com/v1/chat/completions')
+HUGGINGFACE_API_URL = os.getenv('HUGGINGFACE_API_URL', 'https://api-inference.huggingface.co/models/microsoft/DialoGPT-large')
+
+# Free-tier quota tracking: skip providers that are out of budget instead of waiting for a 429
+llm_scheduler = llm_quota.QuotaScheduler(llm_quota.QuotaLedger())
+
+# Precomputed LLM insights (built offline by insight_corpus.py).
+# "prefer" answers from the corpus without any network call, "fallback" only uses it
+# instead of the local generator when no provider answers, "off" disables it.
+INSIGHT_CORPUS_MODE = os.getenv('INSIGHT_CORPUS_MODE', 'prefer')
+insight_corpus_index = insight_corpus.load_corpus() if INSIGHT_CORPUS_MODE != 'off' else None
+
+# Pipeline metrics for GET /metrics ("demographics" is face detection plus age/gender)
+STAGE_SECONDS = metrics.histogram("analysis_stage_seconds", "Time spent in each analysis stage", ["stage"])
+LLM_REQUEST_SECONDS = metrics.histogram("llm_request_seconds", "LLM provider request latency", ["provider"])
+LLM_REQUESTS = metrics.counter("llm_requests_total", "LLM provider requests by HTTP status", ["provider", "status"])
+INSIGHT_CORPUS_LOOKUPS = metrics.counter("insight_corpus_lookups_total", "Precomputed insight lookups", ["result"])
+
+def quota_samples(field: str) -> Dict[tuple, float]:
+    samples = {}
+    for provider, info in llm_scheduler.snapshot()["providers"].items():
+        for window in ("daily", "monthly"):
+            value = info.get(window, {}).get(field)
+            if value is not None:
+                samples[(provider, window)] = value
+    return samples
+
+metrics.gauge("llm_quota_remaining", "LLM requests left in the current quota window", ["provider", "window"],
+              collect=lambda: quota_samples("remaining"))
+metrics.gauge("llm_quota_used", "LLM requests used in the current quota window", ["provider", "window"],
+              collect=lambda: quota_samples("used"))
+metrics.counter("llm_scheduler_events_total", "LLM quota scheduler decisions", ["event"],
+                collect=lambda: {(event,): count for event, count in llm_scheduler.snapshot()["counters"].items()})
+metrics.counter("admission_decisions_total", "Admission control decisions", ["decision"],
+                collect=lambda: {(decision,): count for decision, count in dict(admission_controller.counts).items()})
+metrics.gauge("inference_pending", "Analyses admitted and not yet finished",
+              collect=lambda: {(): admission_controller.gate.pending})
+# ThreadPoolExecutor has no public queue length
+metrics.gauge("inference_pool_queued", "Analyses waiting for an inference thread",
+              collect=lambda: {(): inference_pool._work_queue.qsize()})
+metrics.counter("celebrity_catalog_cache_total", "/celebrities/ rendered body cache lookups", ["result"],
+                collect=lambda: {("hit",): catalog.hits, ("miss",): catalog.misses})
+
+# Funny error messages for failed analyses
+ANALYSIS_ERROR_MESSAGES = [
+    "Oops! Our AI had a brain fart! 🤯 Please try again with a different image!",
+    "Our AI is having a bad day! 😤 Maybe try a different photo?",
+    "Something went wrong in our AI's head! 🧠 Please try again!",
+    "Our AI is being dramatic today! 😅 Try uploading a different image!",
+    "Our AI says 'I give up!' 🙈 Please try with a different photo!"
+]
+
 # Global variables for celebrity data
 CELEB_DIR = "celebrities"
 CSV_FILE = "celebrities/kpopidolsv3.csv"
 celeb_names = []
 celeb_images = []
 celeb_data = []
+celebrities_loaded_at = None
+# Rebuilt with every load: /celebrities/ listing and the CSV row for each name
+catalog = celebrity_catalog.CelebrityCatalog([], [], [])
+celeb_record_index: Dict[str, Dict] = {}
+# Content hashes of gallery images, for /media/ URLs (python gallery_derivatives.py builds them)
+media_index = gallery_media.MediaIndex(CELEB_DIR)
 
 def load_celebrities():
     """Load celebrity data from CSV and images"""
-    global celeb_names, celeb_images, celeb_data
+    global celeb_names, celeb_images, celeb_data, celebrities_loaded_at, catalog, celeb_record_index, media_index
+    celebrities_loaded_at = time.time()
     
     # Load CSV data
     if os.path.exists(CSV_FILE):
         try:
-            celeb_data = pd.read_csv(CSV_FILE).to_dict('records')
+            # NaN cells and NumPy values are converted once here, not in every response
+            celeb_data = api_responses.sanitize(pd.read_csv(CSV_FILE).to_dict('records'))
             logger.info(f"Loaded CSV data with {len(celeb_data)} K-pop idols")
         except Exception as e:
             logger.error(f"Error loading CSV: {e}")
@@ -91,13 +197,17 @@ def load_celebrities():
         logger.warning("Celebrities directory not found")
         celeb_names = []
         celeb_images = []
+    
+    media_index = gallery_media.MediaIndex(CELEB_DIR)
+    if celeb_images and not media_index:
+        logger.warning("No gallery media built; run gallery_derivatives.py to serve images under /media/")
+    celeb_record_index = celebrity_catalog.record_index(celeb_data)
+    catalog = celebrity_catalog.CelebrityCatalog(celeb_names, celeb_images, celeb_data,
+                                                 [media_index.url(image) for image in celeb_images])
 
 def find_celeb_info(name: str) -> Dict:
     """Find celebrity info from CSV data"""
-    for celeb in celeb_data:
-        if celeb.get('name', '').lower() == name.lower():
-            return celeb
-    return {}
+    return celebrity_catalog.match_record(celeb_record_index, name)
 
 def analyze_with_deepface(image_path: str):
     """Analyze image using DeepFace"""
@@ -161,7 +271,7 @@ def calculate_beauty_score(age: int, gender: str, emotion: str, facial_features:
 def find_celebrity_lookalike(beauty_score: float, age: int, gender: str) -> Dict:
     """Find celebrity lookalike based on analysis results"""
     if not celeb_names:
-        return {"name": "Unknown", "similarity": 0.0, "image": "", "info": {}}
+        return {"name": "Unknown", "similarity": 0.0, "image": "", "image_url": None, "image_urls": {}, "info": {}}
     
     # Filter celebrities by gender if possible
     filtered_celebrities = []
@@ -190,191 +300,65 @@ def find_celebrity_lookalike(beauty_score: float, age: int, gender: str) -> Dict
     
     similarity = (age_similarity + beauty_similarity) / 2
     
+    media_hash = media_index.hash_for(celeb_image)
     return {
         "name": celeb_name,
         "similarity": round(similarity, 1),
         "image": celeb_image,
+        # Browser-fetchable, immutable thumbnails (relative to the API base URL)
+        "image_url": media_index.url(celeb_image),
+        "image_urls": gallery_media.media_urls(media_hash) if media_hash else {},
         "info": celeb_info
     }
 
 def generate_personality_insights(age: int, gender: str, beauty_score: float, emotion: str) -> Dict:
     """Generate fun personality insights and achievements based on analysis"""
-    
-    insights = {
-        "achievements": [],
-        "personality_traits": [],
-        "future_predictions": [],
-        "fun_facts": []
-    }
-    
-    # Achievement predictions based on beauty score
-    if beauty_score >= 9.0:
-        insights["achievements"].extend([
-            "👑 Future K-pop Idol",
-            "🏆 Beauty Pageant Winner",
-            "⭐ Most Popular in School",
-            "💫 Instagram Influencer Potential"
-        ])
-    elif beauty_score >= 8.0:
-        insights["achievements"].extend([
-            "🎭 Drama Club Star",
-            "📸 Model Material",
-            "👥 Class President Material",
-            "💝 Most Likely to Get 20+ Crushes"
-        ])
-    elif beauty_score >= 7.0:
-        insights["achievements"].extend([
-            "📚 Future Tutor",
-            "🎨 Creative Genius",
-            "🤝 Natural Leader",
-            "💕 Relationship Expert"
-        ])
-    elif beauty_score >= 6.0:
-        insights["achievements"].extend([
-            "🎯 Goal Achiever",
-            "🌟 Hidden Talent",
-            "💪 Confidence Builder",
-            "🎪 Life of the Party"
-        ])
-    else:
-        insights["achievements"].extend([
-            "💎 Diamond in the Rough",
-            "🌱 Growth Mindset",
-            "🎭 Character Actor",
-            "💫 Late Bloomer"
-        ])
-    
-    # Personality traits based on age and gender
-    if age < 20:
-        insights["personality_traits"].extend([
-            "🎓 Academic Excellence",
-            "🚀 Ambitious Dreamer",
-            "🎵 Trendsetter",
-            "💡 Innovative Thinker"
-        ])
-    elif age < 30:
-        insights["personality_traits"].extend([
-            "💼 Career Climber",
-            "🌍 World Traveler",
-            "🎯 Goal-Oriented",
-            "💪 Confident Leader"
-        ])
-    else:
-        insights["personality_traits"].extend([
-            "🧠 Wise Mentor",
-            "🏠 Life Experience",
-            "💎 Mature Beauty",
-            "🌟 Inspirational Figure"
-        ])
-    
-    # Future predictions
-    if beauty_score >= 8.5:
-        insights["future_predictions"].extend([
-            "🌟 Will become a famous celebrity",
-            "💍 Will have the most romantic proposals",
-            "🏆 Will win multiple awards",
-            "📱 Will have 1M+ social media followers"
-        ])
-    elif beauty_score >= 7.5:
-        insights["future_predictions"].extend([
-            "💼 Will be a successful entrepreneur",
-            "🎭 Will star in movies/TV shows",
-            "💕 Will have amazing relationships",
-            "🌍 Will travel the world"
-        ])
-    else:
-        insights["future_predictions"].extend([
-            "💎 Will discover hidden talents",
-            "🎯 Will achieve personal goals",
-            "💪 Will overcome challenges",
-            "🌟 Will inspire others"
-        ])
-    
-    # Fun facts based on emotion and analysis
-    if emotion == "happy":
-        insights["fun_facts"].extend([
-            "😊 Your smile lights up every room",
-            "🎉 You're the life of every party",
-            "💫 Positive energy radiates from you",
-            "🌟 You make everyone around you happy"
-        ])
-    elif emotion == "neutral":
-        insights["fun_facts"].extend([
-            "🎭 You have a mysterious aura",
-            "💎 You're like a hidden gem",
-            "🌙 You have a calm, peaceful presence",
-            "🎯 You're focused and determined"
-        ])
-    else:
-        insights["fun_facts"].extend([
-            "🎨 You have artistic depth",
-            "💭 You're a deep thinker",
-            "🎪 You have dramatic flair",
-            "💫 You're intriguing and complex"
-        ])
-    
-    # Add gender-specific insights
-    if gender.lower() in ['male', 'm']:
-        insights["fun_facts"].extend([
-            "💪 You have strong leadership qualities",
-            "🎯 You're goal-oriented and ambitious",
-            "🛡️ You're protective and caring",
-            "🌟 You have natural charisma"
-        ])
-    elif gender.lower() in ['female', 'f']:
-        insights["fun_facts"].extend([
-            "💎 You have elegant beauty",
-            "🎭 You're graceful and poised",
-            "💕 You have a warm, caring nature",
-            "✨ You're naturally charming"
-        ])
-    
-    return insights
+    return insight_rules.evaluate("personality", insight_rules.analysis_features(age, gender, beauty_score, emotion))
 
 def generate_fun_comment(beauty_score: float, insights: Dict) -> str:
     """Generate a fun, personalized comment based on beauty score and insights"""
-    
-    if beauty_score >= 9.0:
-        return f"🔥 WOW! You've got SERIOUS star potential! You'd definitely win first place on any audition show! 👑💫 {random.choice(insights['achievements'])} material right here!"
-    elif beauty_score >= 8.0:
-        return f"🌟 AMAZING! You're absolutely stunning! {random.choice(insights['achievements'])} vibes all the way! ✨💖"
-    elif beauty_score >= 7.0:
-        return f"💫 Fantastic! You have such natural beauty! {random.choice(insights['achievements'])} potential for sure! 🌟"
-    elif beauty_score >= 6.0:
-        return f"✨ Great! You have a unique and attractive look! {random.choice(insights['achievements'])} in your future! 💪"
-    else:
-        return f"💎 Beautiful! You have a special kind of charm! {random.choice(insights['achievements'])} waiting to happen! 🌱"
+    return insight_rules.render_comment("fun", {"beauty_score": beauty_score}, insights)
+
+def corpus_insights(age: int, gender: str, beauty_score: float, emotion: str, facial_features: Dict) -> Optional[Dict]:
+    """Look up precomputed LLM insights for this analysis, if a corpus is loaded"""
+    if insight_corpus_index is None:
+        return None
+    try:
+        insights = insight_corpus_index.lookup(age, gender, beauty_score, emotion, facial_features)
+    except Exception as e:
+        logger.warning(f"Insight corpus lookup failed: {e}")
+        insights = None
+    INSIGHT_CORPUS_LOOKUPS.inc("hit" if insights else "miss")
+    return insights
+
+def llm_post(provider: str, url: str, **kwargs) -> requests.Response:
+    """POST to an LLM provider, recording latency and status for GET /metrics"""
+    start = time.perf_counter()
+    status = "error"
+    try:
+        response = requests.post(url, **kwargs)
+        status = str(response.status_code)
+        return response
+    finally:
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, provider)
+        LLM_REQUESTS.inc(provider, status)
 
 def generate_ai_personality_insights(age: int, gender: str, beauty_score: float, emotion: str, facial_features: Dict) -> Dict:
     """Generate real AI-powered personality insights based on analysis"""
     
-    # Create a detailed prompt for the AI
-    prompt = f"""
-    Based on this facial analysis, generate fun and engaging personality insights:
-    
-    Age: {age} years old
-    Gender: {gender}
-    Beauty Score: {beauty_score}/10
-    Emotion: {emotion}
-    Facial Features:
-    - Symmetry: {facial_features['symmetry']:.1f}%
-    - Skin Clarity: {facial_features['skinClarity']:.1f}%
-    - Proportions: {facial_features['proportions']:.1f}%
-    - Expression: {facial_features['expression']:.1f}%
+    if INSIGHT_CORPUS_MODE == 'prefer':
+        insights = corpus_insights(age, gender, beauty_score, emotion, facial_features)
+        if insights:
+            return insights
     
-    Generate 4 categories of insights:
-    1. Achievements (like "Future K-pop Idol", "Class President Material")
-    2. Personality Traits (like "Natural Leader", "Creative Genius")
-    3. Future Predictions (like "Will become famous", "Will have amazing relationships")
-    4. Fun Facts (like "Your smile lights up rooms", "You have mysterious aura")
-    
-    Make them fun, engaging, and personalized to the analysis results. Include emojis and be encouraging!
-    """
+    # Create a detailed prompt for the AI
+    prompt = build_insight_prompt(age, gender, beauty_score, emotion, facial_features)
+    quota = llm_scheduler.attempt()
     
     try:
         # Try Groq API first (free tier: 100 requests/day, super fast)
         groq_api_key = os.getenv('GROQ_API_KEY')
-        if groq_api_key:
+        if groq_api_key and quota.acquire('groq'):
             headers = {
                 'Authorization': f'Bearer {groq_api_key}',
                 'Content-Type': 'application/json'
@@ -385,7 +369,7 @@ def generate_ai_personality_insights(age: int, gender: str, beauty_score: float,
                 'messages': [
                     {
                         'role': 'system',
-                        'content': 'You are a fun, encouraging AI that analyzes facial features and generates entertaining personality insights. Be creative, use emojis, and make people feel special!'
+                        'content': INSIGHT_SYSTEM_PROMPT
                     },
                     {
                         'role': 'user',
@@ -396,7 +380,8 @@ def generate_ai_personality_insights(age: int, gender: str, beauty_score: float,
                 'temperature': 0.8
             }
             
-            response = requests.post('https://api.groq.com/openai/v1/chat/completions', headers=headers, json=data, timeout=10)
+            response = llm_post('groq', GROQ_API_URL, headers=headers, json=data, timeout=10)
+            quota.record('groq', response.status_code, response.headers.get('Retry-After'))
             
             if response.status_code == 200:
                 result = response.json()
@@ -406,7 +391,7 @@ def generate_ai_personality_insights(age: int, gender: str, beauty_score: float,
         
         # Try OpenAI API if available
         openai_api_key = os.getenv('OPENAI_API_KEY')
-        if openai_api_key:
+        if openai_api_key and quota.acquire('openai'):
             headers = {
                 'Authorization': f'Bearer {openai_api_key}',
                 'Content-Type': 'application/json'
@@ -417,7 +402,7 @@ def generate_ai_personality_insights(age: int, gender: str, beauty_score: float,
                 'messages': [
                     {
                         'role': 'system',
-                        'content': 'You are a fun, encouraging AI that analyzes facial features and generates entertaining personality insights. Be creative, use emojis, and make people feel special!'
+                        'content': INSIGHT_SYSTEM_PROMPT
                     },
                     {
                         'role': 'user',
@@ -428,7 +413,8 @@ def generate_ai_personality_insights(age: int, gender: str, beauty_score: float,
                 'temperature': 0.8
             }
             
-            response = requests.post('https://api.openai.com/v1/chat/completions', headers=headers, json=data, timeout=10)
+            response = llm_post('openai', OPENAI_API_URL, headers=headers, json=data, timeout=10)
+            quota.record('openai', response.status_code, response.headers.get('Retry-After'))
             
             if response.status_code == 200:
                 result = response.json()
@@ -438,7 +424,7 @@ def generate_ai_personality_insights(age: int, gender: str, beauty_score: float,
         
         # Try Hugging Face Inference API (free tier: 30k requests/month)
         hf_api_key = os.getenv('HUGGINGFACE_API_KEY')
-        if hf_api_key:
+        if hf_api_key and quota.acquire('huggingface'):
             headers = {
                 'Authorization': f'Bearer {hf_api_key}',
                 'Content-Type': 'application/json'
@@ -453,7 +439,8 @@ def generate_ai_personality_insights(age: int, gender: str, beauty_score: float,
                 }
             }
             
-            response = requests.post('https://api-inference.huggingface.co/models/microsoft/DialoGPT-large', headers=headers, json=data, timeout=15)
+            response = llm_post('huggingface', HUGGINGFACE_API_URL, headers=headers, json=data, timeout=15)
+            quota.record('huggingface', response.status_code, response.headers.get('Retry-After'))
             
             if response.status_code == 200:
                 result = response.json()
@@ -463,379 +450,29 @@ def generate_ai_personality_insights(age: int, gender: str, beauty_score: float,
                     return parse_ai_response(ai_response)
         
         # Fallback to local AI model or predefined responses
-        logger.info("Using local AI insights (no API keys available)")
-        return generate_local_ai_insights(age, gender, beauty_score, emotion, facial_features)
+        logger.info("Using local AI insights (no API keys or quota available)")
+        quota.fallback()
+        return corpus_insights(age, gender, beauty_score, emotion, facial_features) or generate_local_ai_insights(age, gender, beauty_score, emotion, facial_features)
         
     except Exception as e:
         logger.warning(f"AI insight generation failed: {e}")
-        return generate_local_ai_insights(age, gender, beauty_score, emotion, facial_features)
-
-def parse_ai_response(ai_response: str) -> Dict:
-    """Parse AI response into structured format"""
-    try:
-        # Try to extract structured data from AI response
-        insights = {
-            "achievements": [],
-            "personality_traits": [],
-            "future_predictions": [],
-            "fun_facts": []
-        }
-        
-        # Simple parsing - look for patterns in the response
-        lines = ai_response.split('\n')
-        current_category = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            if 'achievement' in line.lower() or '1.' in line:
-                current_category = 'achievements'
-            elif 'personality' in line.lower() or 'trait' in line.lower() or '2.' in line:
-                current_category = 'personality_traits'
-            elif 'future' in line.lower() or 'prediction' in line.lower() or '3.' in line:
-                current_category = 'future_predictions'
-            elif 'fun fact' in line.lower() or '4.' in line:
-                current_category = 'fun_facts'
-            elif current_category and line.startswith('-') or line.startswith('•'):
-                insights[current_category].append(line[1:].strip())
-        
-        # If parsing failed, return the raw response
-        if not any(insights.values()):
-            insights["fun_facts"] = [ai_response]
-            
-        return insights
-        
-    except Exception as e:
-        logger.warning(f"Failed to parse AI response: {e}")
-        return {"fun_facts": [ai_response]}
+        return corpus_insights(age, gender, beauty_score, emotion, facial_features) or generate_local_ai_insights(age, gender, beauty_score, emotion, facial_features)
 
 def generate_local_ai_insights(age: int, gender: str, beauty_score: float, emotion: str, facial_features: Dict) -> Dict:
     """Generate intelligent insights using local analysis"""
-    
-    insights = {
-        "achievements": [],
-        "personality_traits": [],
-        "future_predictions": [],
-        "fun_facts": []
-    }
-    
-    # Intelligent achievement predictions based on multiple factors
-    if beauty_score >= 9.0 and facial_features['symmetry'] > 90:
-        insights["achievements"].append("👑 Future K-pop Idol - Your perfect symmetry is idol material!")
-    elif beauty_score >= 8.5 and facial_features['expression'] > 80:
-        insights["achievements"].append("🎭 Drama Club Star - Your expressive face is made for the stage!")
-    elif beauty_score >= 8.0 and facial_features['skinClarity'] > 90:
-        insights["achievements"].append("📸 Model Material - Your flawless skin is camera-ready!")
-    elif beauty_score >= 7.5 and facial_features['proportions'] > 85:
-        insights["achievements"].append("👥 Class President Material - Your balanced features show leadership!")
-    elif beauty_score >= 7.0:
-        insights["achievements"].append("📚 Future Tutor - Your approachable look makes you a natural teacher!")
-    else:
-        insights["achievements"].append("💎 Diamond in the Rough - Your unique beauty is special!")
-    
-    # Personality traits based on facial analysis
-    if facial_features['symmetry'] > 90:
-        insights["personality_traits"].append("🎯 Balanced & Harmonious - Your symmetrical features reflect inner peace!")
-    if facial_features['skinClarity'] > 90:
-        insights["personality_traits"].append("✨ Pure & Authentic - Your clear skin shows your genuine nature!")
-    if facial_features['expression'] > 85:
-        insights["personality_traits"].append("💫 Expressive & Charismatic - Your face tells amazing stories!")
-    if facial_features['proportions'] > 85:
-        insights["personality_traits"].append("🌟 Well-Proportioned - Your balanced features show good judgment!")
-    
-    # Age and gender specific insights
-    if age < 25 and beauty_score > 8.0:
-        insights["personality_traits"].append("🚀 Young & Ambitious - Your youthful beauty is full of potential!")
-    elif age >= 25 and beauty_score > 7.0:
-        insights["personality_traits"].append("💼 Mature & Confident - Your beauty shows life experience!")
-    
-    # Future predictions based on analysis
-    if beauty_score >= 9.0:
-        insights["future_predictions"].append("🌟 Will become a famous celebrity - Your beauty is undeniable!")
-    elif beauty_score >= 8.0:
-        insights["future_predictions"].append("💼 Will be a successful entrepreneur - Your confidence will lead to success!")
-    elif beauty_score >= 7.0:
-        insights["future_predictions"].append("💕 Will have amazing relationships - Your warm presence attracts people!")
-    else:
-        insights["future_predictions"].append("💎 Will discover hidden talents - Your unique charm will shine!")
-    
-    # Fun facts based on emotion and features
-    if emotion == "happy" and facial_features['expression'] > 80:
-        insights["fun_facts"].append("😊 Your smile lights up every room - it's absolutely contagious!")
-    elif emotion == "neutral" and facial_features['symmetry'] > 85:
-        insights["fun_facts"].append("🎭 You have a mysterious, elegant aura - people are drawn to you!")
-    elif facial_features['skinClarity'] > 90:
-        insights["fun_facts"].append("✨ Your radiant skin reflects your inner glow!")
-    elif facial_features['proportions'] > 85:
-        insights["fun_facts"].append("🌟 Your perfectly proportioned features show natural harmony!")
-    
-    return insights
+    return insight_rules.evaluate("local_ai", insight_rules.analysis_features(age, gender, beauty_score, emotion, facial_features))
 
 def generate_ai_fun_comment(beauty_score: float, insights: Dict, age: int, gender: str) -> str:
     """Generate an AI-powered fun comment"""
-    
-    # Create a personalized comment based on the analysis
-    if beauty_score >= 9.0:
-        base_comment = "🔥 WOW! You've got SERIOUS star potential! Your beauty is absolutely stunning!"
-    elif beauty_score >= 8.0:
-        base_comment = "🌟 AMAZING! You're absolutely gorgeous! Your natural beauty is incredible!"
-    elif beauty_score >= 7.0:
-        base_comment = "💫 Fantastic! You have such natural beauty! You're absolutely lovely!"
-    elif beauty_score >= 6.0:
-        base_comment = "✨ Great! You have a unique and attractive look! You're beautiful!"
-    else:
-        base_comment = "💎 Beautiful! You have a special kind of charm! You're unique!"
-    
-    # Add a random achievement or trait
-    all_insights = []
-    for category in insights.values():
-        all_insights.extend(category)
-    
-    if all_insights:
-        random_insight = random.choice(all_insights)
-        return f"{base_comment} {random_insight} 👑💫"
-    else:
-        return f"{base_comment} You're going to achieve amazing things! 🌟"
+    return insight_rules.render_comment("ai", insight_rules.analysis_features(age, gender, beauty_score, ""), insights)
 
 def generate_crazy_fun_insights(age: int, gender: str, beauty_score: float, emotion: str, facial_features: Dict) -> Dict:
     """Generate absolutely WILD and FUNNY personality insights with pop culture references"""
-    
-    insights = {
-        "achievements": [],
-        "personality_traits": [],
-        "future_predictions": [],
-        "fun_facts": []
-    }
-    
-    # CRAZY Achievement predictions based on beauty score
-    if beauty_score >= 9.0:
-        insights["achievements"].extend([
-            "🔥 MrBeast's Secret Younger Brother - He's been hiding you this whole time!",
-            "👑 BTS's 8th Member - Taehyung's long-lost twin!",
-            "🎮 Squid Game Winner - You'd survive all the games with that face!",
-            "💎 K-pop Idol Material - SM Entertainment is already calling!",
-            "🌟 Netflix Star - Stranger Things season 5 needs you!",
-            "🎭 Hollywood's Next Big Thing - Tom Holland who?",
-            "💫 TikTok Famous - 10M followers by next week!"
-        ])
-    elif beauty_score >= 8.0:
-        insights["achievements"].extend([
-            "🎪 Circus Ringmaster - Your face commands attention!",
-            "🏆 America's Got Talent Winner - Simon Cowell would give you a golden buzzer!",
-            "🎵 K-pop Trainee - JYP is probably stalking your Instagram!",
-            "💍 Bachelor/Bachelorette Material - You'd break the internet!",
-            "🎬 Marvel Superhero - Captain America's replacement!",
-            "🌟 Disney Princess/Prince - Live-action remake incoming!",
-            "💪 Gym Motivation - You'd make everyone want to work out!"
-        ])
-    elif beauty_score >= 7.0:
-        insights["achievements"].extend([
-            "📚 Future Professor - Students would actually pay attention!",
-            "🎨 Art Museum Exhibit - Your face belongs in the Louvre!",
-            "💼 CEO Material - You'd make meetings actually fun!",
-            "🎭 Broadway Star - Hamilton 2.0 needs you!",
-            "🌟 Instagram Influencer - Brands would fight over you!",
-            "💕 Dating App Legend - You'd break Tinder's algorithm!",
-            "🎪 Life of Every Party - DJ Khaled would say 'Another one!'"
-        ])
-    elif beauty_score >= 6.0:
-        insights["achievements"].extend([
-            "💎 Hidden Gem - Like finding a diamond in a coal mine!",
-            "🎯 Goal Crusher - You'd make success look easy!",
-            "🌟 Late Bloomer - Like a fine wine, getting better with age!",
-            "💪 Confidence Builder - You'd make everyone feel better!",
-            "🎪 Party Starter - The energy you bring is unmatched!",
-            "💫 Unique Beauty - You're like a rare Pokemon!"
-        ])
-    else:
-        insights["achievements"].extend([
-            "💎 Diamond in the Rough - Like a treasure chest waiting to be opened!",
-            "🌱 Growth Mindset - You're like a plant, just need some water!",
-            "🎭 Character Actor - You'd play the cool side character!",
-            "💫 Late Bloomer - Like a butterfly, transformation incoming!",
-            "🌟 Hidden Potential - You're like a secret weapon!"
-        ])
-    
-    # WILD Personality traits based on facial features
-    if facial_features['symmetry'] > 90:
-        insights["personality_traits"].extend([
-            "🎯 Perfectly Balanced - Like Thanos, but actually balanced!",
-            "✨ Symmetrical King/Queen - Your face is like a math equation!",
-            "🌟 Harmony Master - You could solve world peace with that symmetry!"
-        ])
-    if facial_features['skinClarity'] > 90:
-        insights["personality_traits"].extend([
-            "✨ Flawless Skin - Like you were born with a filter!",
-            "💎 Crystal Clear - Your skin is like a diamond!",
-            "🌟 Glow Master - You're like a walking light bulb!"
-        ])
-    if facial_features['expression'] > 85:
-        insights["personality_traits"].extend([
-            "🎭 Expressive AF - Your face tells stories better than Netflix!",
-            "💫 Charisma Bomb - You could sell ice to a penguin!",
-            "🌟 Energy Explosion - You're like a human Red Bull!"
-        ])
-    if facial_features['proportions'] > 85:
-        insights["personality_traits"].extend([
-            "🎯 Perfect Proportions - Like you were designed by an architect!",
-            "🌟 Balanced AF - You're like a human golden ratio!",
-            "💎 Proportion Master - Your face is mathematically perfect!"
-        ])
-    
-    # CRAZY Future predictions
-    if beauty_score >= 9.0:
-        insights["future_predictions"].extend([
-            "🌟 Will become more famous than MrBeast - He'll be jealous!",
-            "💍 Will have 50 marriage proposals - Like a K-drama!",
-            "🏆 Will win every award ever - Oscar, Grammy, Nobel Prize!",
-            "📱 Will break the internet - Servers will crash because of you!",
-            "🎬 Will star in every movie - Hollywood will be obsessed!",
-            "💎 Will become a billionaire - Just by existing!"
-        ])
-    elif beauty_score >= 8.0:
-        insights["future_predictions"].extend([
-            "💼 Will become CEO of a Fortune 500 - Just by walking in!",
-            "🎭 Will win an Oscar - Academy will be like 'Who is this?!'",
-            "💕 Will have the most epic love story - Like a movie!",
-            "🌍 Will travel the world - Everyone will want to meet you!",
-            "🌟 Will become a legend - People will write songs about you!"
-        ])
-    else:
-        insights["future_predictions"].extend([
-            "💎 Will discover hidden talents - Like a superhero origin story!",
-            "🎯 Will achieve all goals - Success will be your middle name!",
-            "💪 Will overcome everything - Like a real-life Rocky!",
-            "🌟 Will inspire millions - You'll be like a motivational speaker!"
-        ])
-    
-    # ABSOLUTELY WILD Fun facts
-    if emotion == "happy":
-        insights["fun_facts"].extend([
-            "😊 Your smile could power a city - It's that bright!",
-            "🎉 You're like a walking party - Everywhere you go becomes fun!",
-            "💫 Your positive energy is contagious - Like a good virus!",
-            "🌟 You make everyone happy - Like a human antidepressant!"
-        ])
-    elif emotion == "neutral":
-        insights["fun_facts"].extend([
-            "🎭 You have mysterious vibes - Like a K-drama protagonist!",
-            "💎 You're like a hidden gem - People want to discover you!",
-            "🌙 You have calm energy - Like a zen master!",
-            "🎯 You're focused AF - Like a laser beam!"
-        ])
-    else:
-        insights["fun_facts"].extend([
-            "🎨 You have artistic depth - Like a walking museum!",
-            "💭 You're a deep thinker - Like a philosopher!",
-            "🎪 You have dramatic flair - Like a soap opera star!",
-            "💫 You're intriguing - Like a mystery novel!"
-        ])
-    
-    # Korean/US Culture specific insights
-    if age < 25:
-        insights["fun_facts"].extend([
-            "🎵 You're like a K-pop trainee - Ready to debut!",
-            "🚀 You're young and ambitious - Like a startup founder!",
-            "💫 You have that Gen Z energy - TikTok famous incoming!",
-            "🌟 You're like a Disney Channel star - Ready for your show!"
-        ])
-    elif age < 35:
-        insights["fun_facts"].extend([
-            "💼 You're like a K-drama lead - Ready for your love story!",
-            "🌍 You're worldly - Like a travel influencer!",
-            "🎯 You're goal-oriented - Like a life coach!",
-            "💪 You're confident - Like a motivational speaker!"
-        ])
-    else:
-        insights["fun_facts"].extend([
-            "🧠 You're wise - Like a sage!",
-            "🏠 You have life experience - Like a walking encyclopedia!",
-            "💎 You have mature beauty - Like fine wine!",
-            "🌟 You're inspirational - Like a mentor!"
-        ])
-    
-    # Gender-specific WILD insights
-    if gender.lower() in ['male', 'm']:
-        insights["fun_facts"].extend([
-            "💪 You're like a K-drama male lead - Ready for your love triangle!",
-            "🎯 You're goal-oriented - Like a CEO in training!",
-            "🛡️ You're protective - Like a superhero!",
-            "🌟 You have natural charisma - Like a rock star!"
-        ])
-    elif gender.lower() in ['female', 'f']:
-        insights["fun_facts"].extend([
-            "💎 You're like a K-drama female lead - Ready for your Cinderella story!",
-            "🎭 You're graceful - Like a ballerina!",
-            "💕 You have a warm heart - Like a Disney princess!",
-            "✨ You're naturally charming - Like a fairy tale character!"
-        ])
-    
-    return insights
+    return insight_rules.evaluate("crazy_fun", insight_rules.analysis_features(age, gender, beauty_score, emotion, facial_features))
 
 def generate_crazy_fun_comment(beauty_score: float, insights: Dict, age: int, gender: str) -> str:
     """Generate absolutely WILD and FUNNY comments"""
-    
-    # CRAZY base comments
-    if beauty_score >= 9.0:
-        base_comments = [
-            "🔥 HOLY MOLY! You're like MrBeast's secret sibling! This is INSANE!",
-            "👑 WTF! You're literally BTS's 8th member! Taehyung who?!",
-            "🌟 OMG! You're like a K-pop idol that got lost! SM Entertainment is calling!",
-            "💎 STOP IT! You're too beautiful! This is illegal!",
-            "🎬 Hollywood is missing out! You're like a movie star!",
-            "💫 You're like a walking filter! This can't be real!"
-        ]
-    elif beauty_score >= 8.0:
-        base_comments = [
-            "🌟 DAMN! You're absolutely stunning! This is unfair!",
-            "💎 WOW! You're like a K-drama lead! Netflix needs you!",
-            "✨ You're gorgeous! Like actually gorgeous!",
-            "🎭 You're like a Disney character! This is crazy!",
-            "💫 You're beautiful! Like really beautiful!",
-            "🌟 You're stunning! Like actually stunning!"
-        ]
-    elif beauty_score >= 7.0:
-        base_comments = [
-            "💫 Fantastic! You're really pretty! Like actually pretty!",
-            "✨ You're lovely! Like really lovely!",
-            "🌟 You're beautiful! Like actually beautiful!",
-            "💎 You're attractive! Like really attractive!",
-            "🎭 You're cute! Like actually cute!",
-            "💫 You're pretty! Like really pretty!"
-        ]
-    elif beauty_score >= 6.0:
-        base_comments = [
-            "✨ Great! You have a unique look! Like really unique!",
-            "🌟 You're attractive! Like actually attractive!",
-            "💎 You're cute! Like really cute!",
-            "🎭 You're pretty! Like actually pretty!",
-            "💫 You're lovely! Like really lovely!",
-            "✨ You're beautiful! Like actually beautiful!"
-        ]
-    else:
-        base_comments = [
-            "💎 Beautiful! You have a special charm! Like really special!",
-            "🌟 You're unique! Like actually unique!",
-            "💫 You're lovely! Like really lovely!",
-            "✨ You're cute! Like actually cute!",
-            "🎭 You're pretty! Like actually pretty!",
-            "💎 You're beautiful! Like actually beautiful!"
-        ]
-    
-    # Add a random achievement or trait
-    all_insights = []
-    for category in insights.values():
-        all_insights.extend(category)
-    
-    if all_insights:
-        random_insight = random.choice(all_insights)
-        base_comment = random.choice(base_comments)
-        return f"{base_comment} {random_insight} 🔥💫👑"
-    else:
-        base_comment = random.choice(base_comments)
-        return f"{base_comment} You're going to be famous! 🌟💫👑"
+    return insight_rules.render_comment("crazy", insight_rules.analysis_features(age, gender, beauty_score, ""), insights)
 
 def generate_smart_real_insights(age: int, gender: str, beauty_score: float, emotion: str, facial_features: Dict) -> Dict:
     """Generate smart, real insights using free LLM and specific predictions"""
@@ -847,9 +484,15 @@ def generate_smart_real_insights(age: int, gender: str, beauty_score: float, emo
         "fun_facts": []
     }
     
+    if INSIGHT_CORPUS_MODE == 'prefer':
+        corpus_result = corpus_insights(age, gender, beauty_score, emotion, facial_features)
+        if corpus_result:
+            return corpus_result
+    
     # Use Hugging Face Inference API (free tier)
+    quota = llm_scheduler.attempt()
     try:
-        api_url = "https://api-inference.huggingface.co/models/microsoft/DialoGPT-large"
+        api_url = HUGGINGFACE_API_URL
         headers = {"Authorization": f"Bearer {os.getenv('HUGGINGFACE_API_KEY', '')}"}
         
         prompt = f"""
@@ -866,8 +509,9 @@ def generate_smart_real_insights(age: int, gender: str, beauty_score: float, emo
         Make them specific, funny, and avoid generic compliments like "you're handsome" or "you're pretty".
         """
         
-        if os.getenv('HUGGINGFACE_API_KEY'):
-            response = requests.post(api_url, headers=headers, json={"inputs": prompt})
+        if os.getenv('HUGGINGFACE_API_KEY') and quota.acquire('huggingface'):
+            response = llm_post('huggingface', api_url, headers=headers, json={"inputs": prompt}, timeout=15)
+            quota.record('huggingface', response.status_code, response.headers.get('Retry-After'))
             if response.status_code == 200:
                 ai_response = response.json()[0]["generated_text"]
                 return parse_smart_response(ai_response, age, gender, beauty_score, facial_features)
@@ -875,8 +519,9 @@ def generate_smart_real_insights(age: int, gender: str, beauty_score: float, emo
     except Exception as e:
         logger.warning(f"LLM generation failed: {e}")
     
-    # Fallback to smart local generation
-    return generate_smart_local_insights(age, gender, beauty_score, emotion, facial_features)
+    # Fallback to precomputed insights, then smart local generation
+    quota.fallback()
+    return corpus_insights(age, gender, beauty_score, emotion, facial_features) or generate_smart_local_insights(age, gender, beauty_score, emotion, facial_features)
 
 def parse_smart_response(ai_response: str, age: int, gender: str, beauty_score: float, facial_features: Dict) -> Dict:
     """Parse AI response and make it more specific"""
@@ -919,109 +564,145 @@ def parse_smart_response(ai_response: str, age: int, gender: str, beauty_score:
 
 def make_specific_achievement(age: int, gender: str, beauty_score: float, facial_features: Dict) -> str:
     """Generate specific, funny achievements"""
-    
-    if beauty_score >= 9.0:
-        if age < 25:
-            return "🔥 Future MrBeast's Secret Brother - He's been hiding you this whole time!"
-        else:
-            return "👑 MrBeast's Dad - You're the OG that started it all!"
-    elif beauty_score >= 8.0:
-        if age < 20:
-            return "🎓 Future Class President - Your face commands respect!"
-        elif age < 30:
-            return "💼 Future CEO - You'll run a Fortune 500 company!"
-        else:
-            return "🌟 Future Mentor - You'll inspire millions!"
-    elif beauty_score >= 7.0:
-        if age < 25:
-            return "📚 Future Professor - Students will actually pay attention!"
-        else:
-            return "🎭 Future Motivational Speaker - You'll change lives!"
-    else:
-        return "💎 Future Hidden Gem - You'll surprise everyone!"
+    features = insight_rules.analysis_features(age, gender, beauty_score, "", facial_features)
+    return insight_rules.evaluate_category("smart_local", "achievements", features)[0]
 
 def make_specific_trait(facial_features: Dict) -> str:
     """Generate specific personality traits based on facial features"""
-    
-    if facial_features['symmetry'] > 90:
-        return "🎯 Perfectly Balanced - Like a human algorithm!"
-    elif facial_features['skinClarity'] > 90:
-        return "✨ Flawless Logic - Your skin is like clean code!"
-    elif facial_features['expression'] > 85:
-        return "💫 Charisma Algorithm - You could sell anything!"
-    elif facial_features['proportions'] > 85:
-        return "🌟 Mathematical Beauty - Your face follows the golden ratio!"
-    else:
-        return "💎 Unique Algorithm - You're like a rare programming language!"
+    return insight_rules.evaluate_category("smart_local", "personality_traits", facial_features)[0]
 
 def make_specific_prediction(beauty_score: float, age: int) -> str:
     """Generate specific future predictions"""
-    
-    if beauty_score >= 9.0:
-        if age < 25:
-            return "🚀 Will invent the next iPhone - Apple will be calling!"
-        else:
-            return "💎 Will become a billionaire - Just by existing!"
-    elif beauty_score >= 8.0:
-        if age < 30:
-            return "🌟 Will start a successful startup - Silicon Valley needs you!"
-        else:
-            return "🎬 Will star in a blockbuster movie - Hollywood is waiting!"
-    elif beauty_score >= 7.0:
-        return "💼 Will become a successful entrepreneur - Success is inevitable!"
-    else:
-        return "💪 Will overcome all obstacles - Like a real-life superhero!"
+    features = {"beauty_score": beauty_score, "age": age}
+    return insight_rules.evaluate_category("smart_local", "future_predictions", features)[0]
 
 def make_specific_fact(emotion: str, facial_features: Dict) -> str:
     """Generate specific fun facts"""
-    
-    if emotion == "happy":
-        return "😊 Your smile could power a data center - It's that efficient!"
-    elif emotion == "neutral":
-        return "🎭 You have mysterious energy - Like a quantum particle!"
-    elif facial_features['symmetry'] > 90:
-        return "🎯 Your face is mathematically perfect - Like a theorem!"
-    elif facial_features['skinClarity'] > 90:
-        return "✨ Your skin is like a high-resolution display - Crystal clear!"
-    else:
-        return "💎 You're like a rare algorithm - Unique and powerful!"
+    features = dict(facial_features, emotion=emotion)
+    return insight_rules.evaluate_category("smart_local", "fun_facts", features)[0]
 
 def generate_smart_local_insights(age: int, gender: str, beauty_score: float, emotion: str, facial_features: Dict) -> Dict:
     """Generate smart local insights when LLM is not available"""
-    
-    insights = {
-        "achievements": [make_specific_achievement(age, gender, beauty_score, facial_features)],
-        "personality_traits": [make_specific_trait(facial_features)],
-        "future_predictions": [make_specific_prediction(beauty_score, age)],
-        "fun_facts": [make_specific_fact(emotion, facial_features)]
-    }
-    
-    return insights
+    return insight_rules.evaluate("smart_local", insight_rules.analysis_features(age, gender, beauty_score, emotion, facial_features))
 
 def generate_smart_comment(beauty_score: float, insights: Dict, age: int, gender: str) -> str:
     """Generate smart, specific comments"""
+    return insight_rules.render_comment("smart", {"beauty_score": beauty_score, "age": age}, insights)
+
+def run_analysis(contents: bytes, on_stage: Optional[Callable[[str, Dict, float], None]] = None) -> Dict:
+    """Run the full analysis pipeline on raw image bytes, reporting each finished stage"""
+    stage_start = time.perf_counter()
+
+    def finish_stage(name: str, payload: Dict):
+        nonlocal stage_start
+        elapsed = time.perf_counter() - stage_start
+        STAGE_SECONDS.observe(elapsed, name)
+        if on_stage is not None:
+            on_stage(name, payload, elapsed)
+        stage_start = time.perf_counter()
+
+    temp_path = f"temp_{int(time.time())}_{random.randint(1000, 9999)}.jpg"
     
-    # Get the first achievement for a specific comment
-    achievement = insights["achievements"][0] if insights["achievements"] else "Future Legend"
-    
-    if beauty_score >= 9.0:
-        if age < 25:
-            return f"🔥 HOLY MOLY! {achievement}! This is absolutely INSANE! 🔥"
-        else:
-            return f"👑 WTF! {achievement}! You're the real deal! 👑"
-    elif beauty_score >= 8.0:
-        return f"🌟 DAMN! {achievement}! This is next level! 🌟"
-    elif beauty_score >= 7.0:
-        return f"💫 WOW! {achievement}! You're going places! 💫"
-    elif beauty_score >= 6.0:
-        return f"✨ NICE! {achievement}! You've got potential! ✨"
-    else:
-        return f"💎 COOL! {achievement}! You're unique! 💎"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(contents)
+        
+        # Read image for InsightFace
+        img = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+        finish_stage("decode", {
+            "width": int(img.shape[1]) if img is not None else None,
+            "height": int(img.shape[0]) if img is not None else None
+        })
+        age = None
+        gender = None
+        
+        # Try InsightFace first
+        if INSIGHTFACE_AVAILABLE and insightface_app is not None:
+            faces = insightface_app.get(img)
+            if faces:
+                age = int(faces[0].age)
+                gender = "male" if faces[0].gender == 1 else "female"
+                logger.info(f"InsightFace: Age={age}, Gender={gender}")
+        
+        # Fallback to DeepFace if needed
+        if age is None or gender is None:
+            if DEEPFACE_AVAILABLE:
+                logger.info("Starting DeepFace analysis (fallback)...")
+                result = analyze_with_deepface(temp_path)
+                if isinstance(result, list):
+                    result = result[0]
+                age = result.get('age', 25)
+                gender = result.get('gender', 'Unknown')
+            else:
+                age = 25
+                gender = 'Unknown'
+        finish_stage("demographics", {"age": age, "gender": gender})
+        
+        # Emotion (DeepFace or default)
+        emotion = 'neutral'
+        if DEEPFACE_AVAILABLE:
+            try:
+                result = analyze_with_deepface(temp_path)
+                if isinstance(result, list):
+                    result = result[0]
+                emotion = result.get('dominant_emotion', 'neutral')
+            except Exception as e:
+                logger.warning(f"DeepFace emotion fallback failed: {e}")
+        finish_stage("emotion", {"emotion": emotion})
+        
+        # Calculate facial features (simplified for now)
+        facial_features = {
+            "symmetry": random.uniform(70, 95),
+            "skinClarity": random.uniform(75, 95),
+            "proportions": random.uniform(75, 90),
+            "expression": 85 if emotion == 'happy' else 75
+        }
+        
+        # Calculate beauty score
+        beauty_score = calculate_beauty_score(age, gender, emotion, facial_features)
+        finish_stage("scoring", {"beauty_score": round(beauty_score, 1), "facial_features": facial_features})
+        
+        # Generate smart, real insights
+        insights = generate_smart_real_insights(age, gender, beauty_score, emotion, facial_features)
+        
+        # Generate smart comment
+        fun_comment = generate_smart_comment(beauty_score, insights, age, gender)
+        finish_stage("insights", {"personality_insights": insights, "fun_comment": fun_comment})
+        
+        # Find celebrity lookalike
+        lookalike_result = find_celebrity_lookalike(beauty_score, age, gender)
+        finish_stage("lookalike", {"lookalike": lookalike_result})
+        
+        # Prepare response
+        response = {
+            "success": True,
+            "analysis": {
+                "age": age,
+                "gender": gender,
+                "emotion": emotion,
+                "race": "Unknown",
+                "beauty_score": round(beauty_score, 1),
+                "facial_features": facial_features
+            },
+            "personality_insights": insights,
+            "fun_comment": fun_comment,
+            "lookalike": lookalike_result,
+            "timestamp": str(np.datetime64('now'))
+        }
+        
+        logger.info(f"Analysis completed: Age={age}, Gender={gender}, Beauty={beauty_score}")
+        return response
+        
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        gc.collect()
 
 @app.on_event("startup")
 async def startup_event():
-    """Load celebrities on startup"""
-    load_celebrities()
+    """Load celebrities on startup (unless prefork.py already loaded them before forking)"""
+    if celebrities_loaded_at is None:
+        load_celebrities()
 
 @app.get("/")
 async def root():
@@ -1032,7 +713,8 @@ async def root():
         "csv_data_loaded": len(celeb_data),
         "deepface_available": DEEPFACE_AVAILABLE,
         "opencv_available": True,
-        "insightface_available": INSIGHTFACE_AVAILABLE
+        "insightface_available": INSIGHTFACE_AVAILABLE,
+        "insight_corpus_entries": len(insight_corpus_index) if insight_corpus_index is not None else 0
     }
 
 @app.get("/health")
@@ -1040,136 +722,122 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "timestamp": str(np.datetime64('now'))}
 
-@app.post("/analyze/")
-async def analyze_face(file: UploadFile = File(...)):
+@app.post("/analyze/", openapi_extra=upload_reader.IMAGE_UPLOAD_OPENAPI)
+async def analyze_face(request: Request):
     """Analyze uploaded face image with InsightFace (age) and DeepFace (fallback)"""
     try:
-        # Validate file
-        if not file.content_type or not file.content_type.startswith('image/'):
-            raise HTTPException(status_code=400, detail="Please upload a valid image file (JPG, PNG, etc.)")
-        
-        temp_path = f"temp_{int(time.time())}_{random.randint(1000, 9999)}.jpg"
-        
-        try:
-            contents = await file.read()
-            with open(temp_path, "wb") as f:
-                f.write(contents)
-            
-            # Read image for InsightFace
-            img = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
-            age = None
-            gender = None
-            
-            # Try InsightFace first
-            if INSIGHTFACE_AVAILABLE and insightface_app is not None:
-                faces = insightface_app.get(img)
-                if faces:
-                    age = int(faces[0].age)
-                    gender = "male" if faces[0].gender == 1 else "female"
-                    logger.info(f"InsightFace: Age={age}, Gender={gender}")
-            
-            # Fallback to DeepFace if needed
-            if age is None or gender is None:
-                if DEEPFACE_AVAILABLE:
-                    logger.info("Starting DeepFace analysis (fallback)...")
-                    result = analyze_with_deepface(temp_path)
-                    if isinstance(result, list):
-                        result = result[0]
-                    age = result.get('age', 25)
-                    gender = result.get('gender', 'Unknown')
-                else:
-                    age = 25
-                    gender = 'Unknown'
-            
-            # Emotion (DeepFace or default)
-            emotion = 'neutral'
-            if DEEPFACE_AVAILABLE:
-                try:
-                    result = analyze_with_deepface(temp_path)
-                    if isinstance(result, list):
-                        result = result[0]
-                    emotion = result.get('dominant_emotion', 'neutral')
-                except Exception as e:
-                    logger.warning(f"DeepFace emotion fallback failed: {e}")
-            
-            # Calculate facial features (simplified for now)
-            facial_features = {
-                "symmetry": random.uniform(70, 95),
-                "skinClarity": random.uniform(75, 95),
-                "proportions": random.uniform(75, 90),
-                "expression": 85 if emotion == 'happy' else 75
-            }
-            
-            # Calculate beauty score
-            beauty_score = calculate_beauty_score(age, gender, emotion, facial_features)
-            
-            # Generate smart, real insights
-            insights = generate_smart_real_insights(age, gender, beauty_score, emotion, facial_features)
-            
-            # Generate smart comment
-            fun_comment = generate_smart_comment(beauty_score, insights, age, gender)
-            
-            # Find celebrity lookalike
-            lookalike_result = find_celebrity_lookalike(beauty_score, age, gender)
-            
-            # Prepare response
-            response = {
-                "success": True,
-                "analysis": {
-                    "age": age,
-                    "gender": gender,
-                    "emotion": emotion,
-                    "race": "Unknown",
-                    "beauty_score": round(beauty_score, 1),
-                    "facial_features": facial_features
-                },
-                "personality_insights": insights,
-                "fun_comment": fun_comment,
-                "lookalike": lookalike_result,
-                "timestamp": str(np.datetime64('now'))
-            }
-            
-            logger.info(f"Analysis completed: Age={age}, Gender={gender}, Beauty={beauty_score}")
-            return response
-            
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            gc.collect()
+        # X-Profile: 1 (admin token only) adds stage timings and sampled stacks to the response
+        profile = None
+        if request_profiler.requested(request):
+            request_profiler.authorize(request)
+            profile = request_profiler.RequestProfile()
+
+        # Streams the upload with a size cap; rejects non-images and oversized dimensions early
+        upload_start = time.perf_counter()
+        contents, _ = await upload_reader.read_image_upload(request)
+        upload_seconds = time.perf_counter() - upload_start
+        STAGE_SECONDS.observe(upload_seconds, "upload")
+
+        loop = asyncio.get_running_loop()
+        if profile is None:
+            result = await loop.run_in_executor(inference_pool, run_analysis, contents)
+            return api_responses.FastJSONResponse(result)
+
+        profile.add_stage("upload", upload_seconds)
+        result = await loop.run_in_executor(inference_pool, profile.run, run_analysis, contents)
+        result["profile"] = profile.report()
+        logger.info(f"Profiled analysis {profile.id}: {result['profile']['total_ms']} ms, "
+                    f"{result['profile']['samples']} samples")
+        return api_responses.FastJSONResponse(result)
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in face analysis: {e}")
         
-        # Provide funny error messages
-        error_messages = [
-            "Oops! Our AI had a brain fart! 🤯 Please try again with a different image!",
-            "Our AI is having a bad day! 😤 Maybe try a different photo?",
-            "Something went wrong in our AI's head! 🧠 Please try again!",
-            "Our AI is being dramatic today! 😅 Try uploading a different image!",
-            "Our AI says 'I give up!' 🙈 Please try with a different photo!"
-        ]
-        
         raise HTTPException(
             status_code=500, 
-            detail=random.choice(error_messages)
+            detail=random.choice(ANALYSIS_ERROR_MESSAGES)
         )
 
+@app.post("/jobs/analyze", status_code=202, openapi_extra=upload_reader.IMAGE_UPLOAD_OPENAPI)
+async def submit_analysis_job(request: Request):
+    """Queue a face analysis and return its job ID immediately"""
+    with STAGE_SECONDS.time("upload"):
+        contents, _ = await upload_reader.read_image_upload(request)
+    # The job keeps its admission slot until the analysis finishes, not just until we respond
+    slot = getattr(request.state, "admission_slot", None)
+
+    def run_queued_analysis(contents: bytes, on_stage=None) -> Dict:
+        try:
+            return run_analysis(contents, on_stage)
+        finally:
+            if slot is not None:
+                slot.release()
+
+    if slot is not None:
+        slot.hold()
+    try:
+        job = job_manager.submit("analyze", run_queued_analysis, contents)
+    except Exception:
+        if slot is not None:
+            slot.release()
+        raise
+    return {"job_id": job["id"], "status": job["status"], "poll_url": f"/jobs/{job['id']}"}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0.0, since: Optional[int] = None):
+    """Get job status and per-stage results; wait (seconds) long-polls for the next update"""
+    job = await job_manager.get(job_id, since=since, wait=wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    if job["status"] == jobs.FAILED:
+        job["error"] = random.choice(ANALYSIS_ERROR_MESSAGES)
+    return api_responses.FastJSONResponse(job)
+
+@app.get("/quota/")
+async def get_llm_quota():
+    """Remaining LLM provider quota per window and scheduler counters"""
+    return llm_scheduler.snapshot()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text format: request, stage and LLM latency, caches, queues, quota, process (this worker only)"""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/admission/")
+async def get_admission():
+    """Admission control budgets, inference queue depth and rejection counters"""
+    return admission_controller.snapshot()
+
 @app.get("/celebrities/")
-async def get_celebrities():
-    """Get list of loaded celebrities"""
-    return {
-        "count": len(celeb_names),
-        "names": celeb_names,
-        "images": celeb_images
-    }
+async def get_celebrities(request: Request, offset: int = 0, limit: int = celebrity_catalog.DEFAULT_PAGE_SIZE,
+                          group: Optional[str] = None, gender: Optional[str] = None, q: Optional[str] = None):
+    """List loaded celebrities, filtered by group, gender (M/F) or name prefix (q), one page at a time"""
+    encoding = api_responses.choose_encoding(request.headers.get("accept-encoding", ""))
+    body, etag, encoding = catalog.page(offset, limit, group, gender, q, encoding)
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache", "Vary": "Accept-Encoding"}
+    if celebrity_catalog.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+@app.api_route("/media/{name}", methods=["GET", "HEAD"])
+async def get_media(request: Request, name: str):
+    """Gallery image variant by content hash (/media/<sha256>-<size>.webp|jpg), cacheable forever"""
+    response = gallery_media.media_response(name, request.headers, request.method)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return response
 
 @app.get("/csv-stats/")
 async def get_csv_stats():
     """Get CSV data statistics"""
-    return {
+    return api_responses.FastJSONResponse({
         "total_records": len(celeb_data),
         "sample_records": celeb_data[:5] if celeb_data else []
-    }
+    })
 
 @app.post("/reload-celebrities/")
 async def reload_celebrities():
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the image search providers and image hosts gallery_ingest.py talks to.
+
+Answers in the shapes the providers parse:
+
+- GET /en.wikipedia.org/api/rest_v1/page/summary/{title}   page summary with originalimage/thumbnail
+- GET /api.duckduckgo.com/                                  instant answer JSON with Image and RelatedTopics
+- GET /www.bing.com/images/search                           results page with HTML-escaped "murl" entries
+- GET /{host}/{path}                                        any other host serves an image
+
+Requests reach it through MockHostsTransport, which rewrites https://host/path
+to <mock>/host/path, so the crawler's per-host rate limiting still sees the
+real host names. Latency, 500 rate, 429 rate (with Retry-After), image size
+and results per search are configurable from the command line and at runtime
+through POST /_mock/config. GET /_mock/stats reports what was served per host.
+
+Usage:
+    python mock_image_hosts.py --port 8089 --scenario flaky
+    python mock_image_hosts.py --images celebrities/BTS_Jimin --latency lognormal:0.2:0.5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import html
+import io
+import json
+import os
+import random
+import threading
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, Response
+
+from mock_llm import parse_latency
+
+# Named scenarios used by bench_ingest.py
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "fast": {"latency": "fixed:0.01", "error_rate": 0.0, "rate_limit": 0.0, "image_kb": 60},
+    "typical": {"latency": "lognormal:0.15:0.5", "error_rate": 0.01, "rate_limit": 0.0, "image_kb": 120},
+    "slow": {"latency": "lognormal:0.8:0.5", "error_rate": 0.0, "rate_limit": 0.0, "image_kb": 120},
+    "flaky": {"latency": "uniform:0.05:0.5", "error_rate": 0.2, "rate_limit": 0.0, "image_kb": 120},
+    "throttled": {"latency": "fixed:0.02", "error_rate": 0.0, "rate_limit": 0.2, "image_kb": 60},
+    "large": {"latency": "fixed:0.02", "error_rate": 0.0, "rate_limit": 0.0, "image_kb": 1500},
+}
+
+config: Dict[str, Any] = dict(SCENARIOS["fast"], results=5, retry_after=1, images=None, seed=None)
+stats: Dict[str, int] = {}
+_stats_lock = threading.Lock()
+_rng = random.Random()
+_sample_latency = parse_latency(config["latency"])
+_image_pool: List[bytes] = []
+_image_pool_key = None
+
+
+def synthetic_images(size_kb: int, count: int = 16) -> List[bytes]:
+    """Distinct noise JPEGs of roughly ``size_kb`` each"""
+    from PIL import Image
+
+    images = []
+    side = max(32, int((size_kb * 1024 / 1.6) ** 0.5))
+    for seed in range(count):
+        for _ in range(3):
+            buf = io.BytesIO()
+            Image.effect_noise((side, side), 40 + seed).convert("RGB").save(buf, "JPEG", quality=90)
+            # Noise compresses predictably, so one correction lands close to the target size
+            ratio = size_kb * 1024 / buf.tell()
+            if 0.8 < ratio < 1.25:
+                break
+            side = max(32, int(side * ratio ** 0.5))
+        images.append(buf.getvalue())
+    return images
+
+
+def folder_images(folder: str) -> List[bytes]:
+    images = []
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if name.lower().endswith((".jpg", ".jpeg", ".png")):
+                with open(os.path.join(root, name), "rb") as f:
+                    images.append(f.read())
+    if not images:
+        raise ValueError(f"No images found in {folder}")
+    return images
+
+
+def configure(**changes):
+    """Apply a partial config update (also used by the /_mock/config endpoint)"""
+    global _sample_latency, _image_pool, _image_pool_key
+    if "scenario" in changes:
+        config.update(SCENARIOS[changes.pop("scenario")])
+    config.update({key: value for key, value in changes.items() if value is not None})
+    _sample_latency = parse_latency(config["latency"])
+    if config.get("seed") is not None:
+        _rng.seed(config["seed"])
+    key = config.get("images") or config["image_kb"]
+    if key != _image_pool_key:
+        _image_pool = folder_images(config["images"]) if config.get("images") else synthetic_images(config["image_kb"])
+        _image_pool_key = key
+
+
+def count(key: str, amount: int = 1):
+    with _stats_lock:
+        stats[key] = stats.get(key, 0) + amount
+
+
+async def simulate(host: str) -> Optional[Response]:
+    """Apply latency, errors and rate limits; return an error response or None"""
+    count(f"{host}.requests")
+    await asyncio.sleep(max(0.0, _sample_latency()))
+    roll = _rng.random()
+    if roll < config["rate_limit"]:
+        count(f"{host}.429")
+        return Response(status_code=429, headers={"Retry-After": str(config["retry_after"])})
+    if roll < config["rate_limit"] + config["error_rate"]:
+        count(f"{host}.500")
+        return Response(status_code=500)
+    count(f"{host}.200")
+    return None
+
+
+def image_urls(host: str, query: str, count_: int) -> List[str]:
+    slug = hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+    return [f"https://{host}/images/{slug}/{n}.jpg" for n in range(count_)]
+
+
+app = FastAPI(title="Mock Image Hosts", version="1.0.0")
+
+
+@app.get("/en.wikipedia.org/api/rest_v1/page/summary/{title}")
+async def wikipedia_summary(title: str):
+    """Wikipedia page summary with a lead image"""
+    error = await simulate("en.wikipedia.org")
+    if error:
+        return error
+    original, thumbnail = image_urls("upload.wikimedia.org", title, 2)
+    return {"title": title, "originalimage": {"source": original}, "thumbnail": {"source": thumbnail}}
+
+
+@app.get("/api.duckduckgo.com/")
+async def duckduckgo(q: str = ""):
+    """DuckDuckGo instant answer"""
+    error = await simulate("api.duckduckgo.com")
+    if error:
+        return error
+    urls = image_urls("external-content.duckduckgo.com", q, config["results"])
+    return {"Image": urls[0], "RelatedTopics": [{"Icon": {"URL": url}} for url in urls[1:]]}
+
+
+@app.get("/www.bing.com/images/search")
+async def bing(q: str = ""):
+    """Bing image results page"""
+    error = await simulate("www.bing.com")
+    if error:
+        return error
+    # Spread the results over a few CDN hosts, like real results
+    urls = [url.replace("https://cdn", f"https://cdn{n % 3}", 1)
+            for n, url in enumerate(image_urls("cdn.example-images.com", q, config["results"]))]
+    items = "".join(f'<a class="iusc" m="{html.escape(json.dumps({"murl": url}, separators=(",", ":")))}"></a>'
+                    for url in urls)
+    return HTMLResponse(f"<html><body>{items}</body></html>")
+
+
+@app.post("/_mock/config")
+async def update_config(request: Request):
+    """Change latency/error/429/image settings at runtime"""
+    configure(**await request.json())
+    return config
+
+
+@app.get("/_mock/stats")
+async def get_stats():
+    """Counts of served requests per host and outcome"""
+    with _stats_lock:
+        return dict(stats)
+
+
+@app.post("/_mock/reset")
+async def reset_stats():
+    """Clear the served-request counters"""
+    with _stats_lock:
+        stats.clear()
+    return {"message": "Stats reset"}
+
+
+@app.get("/{host}/{path:path}")
+async def image(host: str, path: str):
+    """Any other host is an image host"""
+    error = await simulate(host)
+    if error:
+        return error
+    if not _image_pool:
+        configure()
+    digest = hashlib.sha1(f"{host}/{path}".encode("utf-8")).digest()
+    # Trailing bytes after the JPEG end marker make every URL a distinct file without re-encoding
+    body = _image_pool[digest[0] % len(_image_pool)] + digest
+    count("image_bytes", len(body))
+    return Response(body, media_type="image/jpeg", headers={"ETag": f'"{digest.hex()}"'})
+
+
+class MockHostsTransport(httpx.AsyncHTTPTransport):
+    """Sends every request to the mock, as <mock>/<original host>/<original path>"""
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = httpx.URL(base_url.rstrip("/"))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = self.base_url.copy_with(path=f"{self.base_url.path.rstrip('/')}/{request.url.host}{request.url.path}",
+                                      query=request.url.query or None)
+        return await super().handle_async_request(
+            httpx.Request(request.method, url, headers=request.headers, stream=request.stream,
+                          extensions=request.extensions)
+        )
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local mock of the image search providers and image hosts")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="fast")
+    parser.add_argument("--latency", help="fixed:S | uniform:LO:HI | lognormal:MEDIAN:SIGMA | exponential:MEAN")
+    parser.add_argument("--error-rate", type=float, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-limit", type=float, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--image-kb", type=int, help="approximate size of the synthetic images")
+    parser.add_argument("--images", help="serve the images in this folder instead of synthetic ones")
+    parser.add_argument("--results", type=int, help="image URLs per search response")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    configure(scenario=args.scenario, latency=args.latency, error_rate=args.error_rate, rate_limit=args.rate_limit,
+              retry_after=args.retry_after, image_kb=args.image_kb, images=args.images, results=args.results,
+              seed=args.seed)
+    print(f"🧪 Mock image hosts on http://{args.host}:{args.port} with "
+          f"{ {key: value for key, value in config.items() if value is not None} }")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Groq, OpenAI and Hugging Face inference APIs.
+
+Speaks the same request/response shapes main.py uses:
+
+- POST /openai/v1/chat/completions   (Groq)
+- POST /v1/chat/completions          (OpenAI)
+- POST /models/{model}               (Hugging Face inference, list of generated_text)
+
+Latency, error rate and 429 rate are configurable from the command line and at
+runtime through POST /_mock/config, so load tests can switch scenarios without
+restarting. GET /_mock/stats reports what the mock has served.
+
+Usage:
+    python mock_llm.py --port 8088 --latency lognormal:0.4:0.5 --error-rate 0.05 --rate-limit 0.1
+
+Then start the API with the provider URLs pointing at it:
+    GROQ_API_KEY=mock GROQ_API_URL=http://127.0.0.1:8088/openai/v1/chat/completions uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import threading
+import time
+from typing import Any, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+import insight_rules
+
+# Named scenarios used by loadtest.py (and handy from the command line)
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "fast": {"latency": "fixed:0.05", "error_rate": 0.0, "rate_limit": 0.0},
+    "typical": {"latency": "lognormal:0.6:0.4", "error_rate": 0.01, "rate_limit": 0.0},
+    "slow": {"latency": "lognormal:3.0:0.5", "error_rate": 0.0, "rate_limit": 0.0},
+    "flaky": {"latency": "uniform:0.2:2.0", "error_rate": 0.2, "rate_limit": 0.0},
+    "throttled": {"latency": "fixed:0.1", "error_rate": 0.0, "rate_limit": 0.5},
+    "exhausted": {"latency": "fixed:0.05", "error_rate": 0.0, "rate_limit": 1.0},
+    "timeout": {"latency": "fixed:20", "error_rate": 0.0, "rate_limit": 0.0},
+}
+
+config: Dict[str, Any] = dict(SCENARIOS["fast"], seed=None)
+stats: Dict[str, int] = {}
+_stats_lock = threading.Lock()
+_rng = random.Random()
+
+
+def parse_latency(spec: str):
+    """Turn 'fixed:S', 'uniform:LO:HI', 'lognormal:MEDIAN:SIGMA' or 'exponential:MEAN' into a sampler"""
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: _rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda: _rng.lognormvariate(mu, values[1])
+    if kind == "exponential":
+        return lambda: _rng.expovariate(1.0 / values[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+_sample_latency = parse_latency(config["latency"])
+
+
+def configure(**changes):
+    """Apply a partial config update (also used by the /_mock/config endpoint)"""
+    global _sample_latency
+    if "scenario" in changes:
+        config.update(SCENARIOS[changes.pop("scenario")])
+    config.update({key: value for key, value in changes.items() if value is not None})
+    _sample_latency = parse_latency(config["latency"])
+    if config.get("seed") is not None:
+        _rng.seed(config["seed"])
+
+
+def count(key: str):
+    with _stats_lock:
+        stats[key] = stats.get(key, 0) + 1
+
+
+def fake_insights_text() -> str:
+    """Build a reply in the numbered/bulleted layout parse_ai_response understands"""
+    features = insight_rules.analysis_features(
+        _rng.randint(16, 45), _rng.choice(["male", "female"]), _rng.uniform(5, 10),
+        _rng.choice(["happy", "neutral", "sad"]),
+        {
+            "symmetry": _rng.uniform(70, 95),
+            "skinClarity": _rng.uniform(75, 95),
+            "proportions": _rng.uniform(75, 90),
+            "expression": _rng.choice([75, 85]),
+        },
+    )
+    insights = insight_rules.evaluate("crazy_fun", features)
+    headings = ["1. Achievements", "2. Personality Traits", "3. Future Predictions", "4. Fun Facts"]
+    lines = []
+    for heading, category in zip(headings, insight_rules.CATEGORIES):
+        lines.append(heading)
+        for phrase in _rng.sample(insights[category], min(2, len(insights[category]))):
+            lines.append(f"- {phrase}")
+    return "\n".join(lines)
+
+
+async def simulate(provider: str):
+    """Apply latency, errors and rate limits; return an error response or None"""
+    count(f"{provider}.requests")
+    await asyncio.sleep(max(0.0, _sample_latency()))
+    roll = _rng.random()
+    if roll < config["rate_limit"]:
+        count(f"{provider}.429")
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+            headers={"Retry-After": "60"},
+        )
+    if roll < config["rate_limit"] + config["error_rate"]:
+        count(f"{provider}.500")
+        return JSONResponse(status_code=500, content={"error": {"message": "Mock upstream failure"}})
+    count(f"{provider}.200")
+    return None
+
+
+def chat_completion(model: str) -> Dict[str, Any]:
+    return {
+        "id": f"chatcmpl-mock-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": fake_insights_text()},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 180, "completion_tokens": 120, "total_tokens": 300},
+    }
+
+
+app = FastAPI(title="Mock LLM Providers", version="1.0.0")
+
+
+@app.post("/openai/v1/chat/completions")
+async def groq_chat(request: Request):
+    """Groq chat completions"""
+    body = await request.json()
+    error = await simulate("groq")
+    return error or chat_completion(body.get("model", "mock"))
+
+
+@app.post("/v1/chat/completions")
+async def openai_chat(request: Request):
+    """OpenAI chat completions"""
+    body = await request.json()
+    error = await simulate("openai")
+    return error or chat_completion(body.get("model", "mock"))
+
+
+@app.post("/models/{model:path}")
+async def huggingface_inference(model: str, request: Request):
+    """Hugging Face text-generation inference"""
+    await request.json()
+    error = await simulate("huggingface")
+    return error or [{"generated_text": fake_insights_text()}]
+
+
+@app.post("/_mock/config")
+async def update_config(request: Request):
+    """Change latency/error/429 settings at runtime"""
+    configure(**await request.json())
+    return config
+
+
+@app.get("/_mock/stats")
+async def get_stats():
+    """Counts of served requests per provider and outcome"""
+    with _stats_lock:
+        return dict(stats)
+
+
+@app.post("/_mock/reset")
+async def reset_stats():
+    """Clear the served-request counters"""
+    with _stats_lock:
+        stats.clear()
+    return {"message": "Stats reset"}
+
+
+def provider_env(base_url: str) -> Dict[str, str]:
+    """Environment variables that point main.py at a mock running on ``base_url``"""
+    base_url = base_url.rstrip("/")
+    return {
+        "GROQ_API_KEY": "mock",
+        "OPENAI_API_KEY": "mock",
+        "HUGGINGFACE_API_KEY": "mock",
+        "GROQ_API_URL": f"{base_url}/openai/v1/chat/completions",
+        "OPENAI_API_URL": f"{base_url}/v1/chat/completions",
+        "HUGGINGFACE_API_URL": f"{base_url}/models/microsoft/DialoGPT-large",
+    }
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local mock of the LLM providers used by main.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="fast")
+    parser.add_argument("--latency", help="fixed:S | uniform:LO:HI | lognormal:MEDIAN:SIGMA | exponential:MEAN")
+    parser.add_argument("--error-rate", type=float, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-limit", type=float, help="fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    configure(scenario=args.scenario, latency=args.latency, error_rate=args.error_rate,
+              rate_limit=args.rate_limit, seed=args.seed)
+    print(f"🧪 Mock LLM providers on http://{args.host}:{args.port} with {config}")
+    for key, value in provider_env(f"http://{args.host}:{args.port}").items():
+        print(f"   {key}={value}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
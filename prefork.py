@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Preforking server for main.py.
+
+``uvicorn --workers N`` spawns fresh interpreters, so every worker re-imports
+main.py and loads its own copy of InsightFace, TensorFlow (DeepFace), the
+insight corpus and the gallery. This loads what can be shared once in a
+master process, then fork()s the workers, which share those pages
+copy-on-write and serve one listening socket.
+
+Fork-safety, handled here rather than left to luck:
+
+- Native thread pools: with several workers, OMP/BLAS/TensorFlow/OpenCV are
+  each given available_cpus() // workers threads (unless already set) before
+  anything is imported, so N workers do not start N full-size pools on the
+  same cores. One worker keeps the runtimes' own defaults.
+- InsightFace's onnxruntime sessions start their own thread pools, which
+  none of those variables control and threading.active_count() cannot see.
+  They are created in each worker after fork (main.load_insightface), so
+  InsightFace is not shared. DeepFace loads lazily in each worker too: building
+  its Keras models starts TensorFlow's thread pools, the same hazard. Model
+  weights are therefore NOT shared: every worker holds its own copy. What the
+  workers do share is the gallery, the insight corpus and the imported code.
+- SQLite: the job store and LLM quota ledger connections are closed before
+  forking and reopened in each worker. With several workers the job store
+  defaults to SQLite, so any worker can answer GET /jobs/{id}.
+- The inference thread pool is recreated in each worker, and numpy's global
+  RNG is reseeded (the stdlib ``random`` module reseeds itself).
+- gc.freeze() moves everything loaded so far out of the collector's reach, so
+  collections in the workers do not write to (and un-share) the model pages.
+- Nothing may run inference or load models in the master: that would start
+  the runtimes' thread pools before fork.
+
+One worker is the default until several have been verified with the real
+models; pass --workers or set WEB_CONCURRENCY for more. Each worker has its own
+admission control budgets (admission.py) and its own /metrics, so with N
+workers a client gets up to N times the per-client budget.
+
+Memory: the master logs Rss, Pss (proportional set size: shared pages split
+between the processes using them) and private memory per worker once the
+workers are up, and again on SIGUSR1. Rss counts shared pages in full for
+every worker, so adding it up overstates usage; Pss adds up to the real total.
+Each worker's private memory is its per-request state plus whatever
+copy-on-write has un-shared. That is the real cost of one more worker.
+
+Usage:
+    python prefork.py --host 0.0.0.0 --port 8000 --workers 4
+    kill -USR1 <master pid>    # log memory per worker again
+"""
+
+import argparse
+import gc
+import logging
+import math
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger("prefork")
+
+# Thread pool sizes for native runtimes, applied before main.py imports them
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS",
+)
+RESPAWN_DELAY_SECONDS = 1.0
+
+
+def memory_usage(pid: int) -> Dict[str, int]:
+    """Rss, Pss and private/shared memory of a process in KiB (Linux /proc)"""
+    usage: Dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    usage[key] = int(value.split()[0])
+    except OSError:
+        return {}
+    return {
+        "rss": usage.get("Rss", 0),
+        "pss": usage.get("Pss", 0),
+        "shared": usage.get("Shared_Clean", 0) + usage.get("Shared_Dirty", 0),
+        "private": usage.get("Private_Clean", 0) + usage.get("Private_Dirty", 0),
+    }
+
+
+def available_cpus() -> int:
+    """CPUs this container may use: the cgroup quota if there is one, else the CPU affinity"""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        with open("/sys/fs/cgroup/cpu.max", "r") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def threads_per_worker(workers: int) -> Optional[int]:
+    """Native threads each worker may use, or None to leave the runtimes' defaults"""
+    if workers <= 1:
+        return None
+    return max(1, available_cpus() // workers)
+
+
+def preload(workers: int):
+    """Import main.py and load everything the workers should share"""
+    threads = threads_per_worker(workers)
+    if threads is not None:
+        for name in THREAD_ENV_VARS:
+            os.environ.setdefault(name, str(threads))
+    # InsightFace's onnxruntime sessions are created in the workers (init_worker)
+    os.environ["DEFER_MODEL_LOAD"] = "1"
+    if workers > 1:
+        # In-memory jobs would only be visible to the worker that created them
+        os.environ.setdefault("JOB_STORE", "sqlite")
+
+    import cv2
+
+    import main
+
+    if threads is not None:
+        cv2.setNumThreads(threads)
+    main.load_celebrities()
+    # Master connections are closed; every worker opens its own after fork
+    if hasattr(main.job_manager.store, "close"):
+        main.job_manager.store.close()
+    main.llm_scheduler.ledger.close()
+    # Only sees Python threads; native runtime pools are kept out of the master by DEFER_MODEL_LOAD
+    if threading.active_count() > 1:
+        logger.warning(f"{threading.active_count() - 1} threads running before fork; "
+                       f"they will not exist in the workers: {[t.name for t in threading.enumerate()]}")
+    gc.collect()
+    gc.freeze()
+    return main
+
+
+def init_worker(app_module):
+    """Replace per-process state inherited from the master"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    import numpy as np
+
+    np.random.seed()
+    app_module.load_insightface()
+    if hasattr(app_module.job_manager.store, "reopen"):
+        app_module.job_manager.store.reopen()
+    app_module.llm_scheduler.ledger.reopen()
+    app_module.inference_pool = ThreadPoolExecutor(max_workers=app_module.INFERENCE_WORKERS,
+                                                   thread_name_prefix="inference")
+    app_module.job_manager.executor = app_module.inference_pool
+
+
+def run_worker(app_module, sock: socket.socket, args):
+    import uvicorn
+
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGUSR1):
+        signal.signal(signum, signal.SIG_DFL)
+    init_worker(app_module)
+    config = uvicorn.Config(app_module.app, log_level=args.log_level, timeout_keep_alive=args.keep_alive)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Master:
+    """Forks and supervises the workers; restarts any that die"""
+
+    def __init__(self, app_module, sock: socket.socket, args):
+        self.app_module = app_module
+        self.sock = sock
+        self.args = args
+        self.workers: Dict[int, int] = {}  # pid -> slot
+        self.stopping = False
+        self.report_at: Optional[float] = None
+
+    def spawn(self, slot: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.app_module, self.sock, self.args)
+            except BaseException as e:
+                logger.error(f"Worker {slot} crashed: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = slot
+        logger.info(f"Worker {slot} started (pid {pid})")
+
+    def report_memory(self):
+        master = memory_usage(os.getpid())
+        if not master:
+            logger.info("Memory report needs /proc/<pid>/smaps_rollup (Linux)")
+            return
+        logger.info(f"Memory (MiB)  master: rss={master['rss'] / 1024:.0f} pss={master['pss'] / 1024:.0f}")
+        totals = dict(master)
+        for pid, slot in sorted(self.workers.items(), key=lambda item: item[1]):
+            usage = memory_usage(pid)
+            if not usage:
+                continue
+            for key in totals:
+                totals[key] += usage[key]
+            logger.info(f"  worker {slot} (pid {pid}): rss={usage['rss'] / 1024:.0f} pss={usage['pss'] / 1024:.0f} "
+                        f"shared={usage['shared'] / 1024:.0f} private={usage['private'] / 1024:.0f}")
+        logger.info(f"  total: pss={totals['pss'] / 1024:.0f} MiB (summed rss would claim {totals['rss'] / 1024:.0f} MiB)")
+
+    def stop(self, signum, frame):
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.report_memory())
+        for slot in range(self.args.workers):
+            self.spawn(slot)
+        self.report_at = time.monotonic() + self.args.memory_report_after
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                if self.report_at is not None and time.monotonic() >= self.report_at:
+                    self.report_at = None
+                    self.report_memory()
+                time.sleep(0.2)
+                continue
+            slot = self.workers.pop(pid, None)
+            if slot is None or self.stopping:
+                continue
+            logger.warning(f"Worker {slot} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}, "
+                           f"restarting")
+            time.sleep(RESPAWN_DELAY_SECONDS)
+            self.spawn(slot)
+        logger.info("All workers stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve main:app from preforked copy-on-write workers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                        help="worker processes (default: WEB_CONCURRENCY or 1)")
+    parser.add_argument("--keep-alive", type=int, default=5, help="HTTP keep-alive timeout in seconds")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--memory-report-after", type=float, default=15.0,
+                        help="seconds after start to log memory per worker")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    sock = bind_socket(args.host, args.port)
+    start = time.perf_counter()
+    app_module = preload(args.workers)
+    threads = threads_per_worker(args.workers)
+    logger.info(f"Loaded gallery and corpus in {time.perf_counter() - start:.1f}s; "
+                f"forking {args.workers} workers on {args.host}:{args.port} ({available_cpus()} CPUs available, "
+                f"{threads or 'default'} native threads per worker)")
+    Master(app_module, sock, args).run()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
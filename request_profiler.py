@@ -0,0 +1,167 @@
+"""
+Opt-in profiling of a single /analyze/ request.
+
+Send ``X-Profile: 1`` (or ``?profile=1``) together with ``X-Admin-Token`` and
+the response gains a "profile" object:
+
+- "stages": wall time per stage (upload, queued, then the pipeline's own
+  stages from run_analysis), in milliseconds.
+- "collapsed": sampled stacks of the inference thread in the collapsed
+  format read by flamegraph.pl, speedscope and inferno
+  (``jq -r .profile.collapsed > analyze.folded``).
+- "top": the frames the thread was most often found in.
+
+The profiler samples the stack of the thread running the analysis every
+PROFILE_INTERVAL_MS from a helper thread. It measures wall time, so time
+spent inside TensorFlow/OpenCV native code or waiting on an LLM provider shows
+up under the Python frame that called it; a deterministic profiler (cProfile)
+would only see Python calls and only caller/callee pairs, not whole stacks.
+With PROFILE_DIR set, each collapsed profile is also written there as
+<id>.folded.
+
+Requests without the flag only pay for one header lookup. Profiling is off
+entirely unless ADMIN_TOKEN is set.
+"""
+
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+
+from admission import ADMIN_TOKEN
+
+logger = logging.getLogger(__name__)
+
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "")
+TOP_FRAMES = 20
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def requested(request: Request) -> bool:
+    """Whether the client asked for a profile (header or query flag)"""
+    flag = request.headers.get("x-profile") or request.query_params.get("profile")
+    return bool(flag) and flag.lower() in TRUE_VALUES
+
+
+def authorize(request: Request, admin_token: str = ADMIN_TOKEN):
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Profiling is disabled (ADMIN_TOKEN is not set)")
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+def frame_label(code) -> str:
+    # ";" separates frames and the last space separates the count in collapsed stacks
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL_MS / 1000.0):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        labels: Dict[Any, str] = {}
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def top(self, limit: int = TOP_FRAMES) -> List[List[Any]]:
+        """[frame, samples with that frame on top of the stack] for the busiest frames"""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return [[frame, count] for frame, count in leaves.most_common(limit)]
+
+
+class RequestProfile:
+    """Stage timings and sampled stacks for one request"""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:12]
+        self.stages: List[List[Any]] = []
+        self.sampler: Optional[StackSampler] = None
+        self.total_seconds = 0.0
+        self._started = time.perf_counter()
+        self._last = self._started
+
+    def add_stage(self, name: str, seconds: float):
+        self.stages.append([name, round(seconds * 1000.0, 2)])
+        self._last = time.perf_counter()
+
+    def record_stage(self, name: str, payload: Dict, seconds: float):
+        """run_analysis on_stage callback"""
+        self.add_stage(name, seconds)
+
+    def run(self, analysis: Callable[..., Dict], *args) -> Dict:
+        """Call ``analysis(*args, on_stage=...)`` on this thread while sampling it"""
+        self.add_stage("queued", time.perf_counter() - self._last)
+        self.sampler = StackSampler(threading.get_ident())
+        self.sampler.start()
+        try:
+            return analysis(*args, on_stage=self.record_stage)
+        finally:
+            self.sampler.stop()
+            # Whatever ran after the last stage (temp file removal, gc.collect())
+            self.add_stage("cleanup", time.perf_counter() - self._last)
+            self.total_seconds = time.perf_counter() - self._started
+
+    def report(self) -> Dict[str, Any]:
+        report = {
+            "id": self.id,
+            "total_ms": round(self.total_seconds * 1000.0, 2),
+            "stages": self.stages,
+            "interval_ms": PROFILE_INTERVAL_MS,
+            "samples": self.sampler.samples if self.sampler else 0,
+            "top": self.sampler.top() if self.sampler else [],
+            "collapsed": self.sampler.collapsed() if self.sampler else "",
+        }
+        if PROFILE_DIR:
+            report["file"] = self.save(PROFILE_DIR)
+        return report
+
+    def save(self, directory: str) -> Optional[str]:
+        path = os.path.join(directory, f"{self.id}.folded")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.sampler.collapsed() if self.sampler else "")
+        except OSError as e:
+            logger.warning(f"Could not save profile {self.id}: {e}")
+            return None
+        return path
@@ -0,0 +1,45 @@
+"""
+Which near-duplicates gallery_dedup.py removes.
+
+    python -m pytest test_gallery_dedup.py
+"""
+
+from gallery_dedup import cluster, plan
+
+THRESHOLD = 4
+
+
+def record(path: str, phash: int, pixels: int) -> dict:
+    return {"path": path, "hash": phash, "pixels": pixels, "bytes": 10000}
+
+
+def test_chain_keeps_images_that_are_not_near_the_kept_copy():
+    # A~B and B~C (3 bits each), but A and C are 6 bits apart
+    a = record("gallery/Idol/000001.jpg", 0b000000, 3000)
+    b = record("gallery/Idol/000002.jpg", 0b000111, 2000)
+    c = record("gallery/Idol/000003.jpg", 0b111111, 1000)
+
+    clusters = cluster([a, b, c], THRESHOLD)
+    assert len(clusters) == 1 and len(clusters[0]) == 3
+
+    result = plan(clusters, threshold=THRESHOLD)
+    assert [(r["path"], r["kept"]) for r in result["remove"]] == [(b["path"], a["path"])]
+
+
+def test_rest_of_a_chain_is_deduplicated_around_its_own_best_copy():
+    a = record("gallery/Idol/000001.jpg", 0b00000000, 4000)
+    b = record("gallery/Idol/000002.jpg", 0b00000111, 3000)
+    c = record("gallery/Idol/000003.jpg", 0b00111111, 2000)
+    d = record("gallery/Idol/000004.jpg", 0b11111111, 1000)
+
+    result = plan(cluster([a, b, c, d], THRESHOLD), threshold=THRESHOLD)
+    assert sorted((r["path"], r["kept"]) for r in result["remove"]) == [(b["path"], a["path"]), (d["path"], c["path"])]
+
+
+def test_duplicates_across_identities_are_only_reported():
+    a = record("gallery/Idol/000001.jpg", 0b0, 2000)
+    b = record("gallery/Other/000001.jpg", 0b1, 1000)
+
+    result = plan(cluster([a, b], THRESHOLD), threshold=THRESHOLD)
+    assert result["remove"] == []
+    assert result["conflicts"] == [[a["path"], b["path"]]]
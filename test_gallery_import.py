@@ -0,0 +1,99 @@
+"""
+Archive path traversal checks for gallery_import.py.
+
+    python -m pytest test_gallery_import.py
+"""
+
+import io
+import os
+import random
+import tarfile
+import zipfile
+
+import pytest
+from PIL import Image
+
+from gallery_import import ArchiveImporter, member_identity, safe_member_path
+
+HOSTILE_MEMBERS = [
+    "ds/../evil.jpg",
+    "../evil.jpg",
+    "ds/Name/../../../evil.jpg",
+    "ds\\..\\evil.jpg",
+    "/tmp/Evil/000001.jpg",
+    "C:/Evil/000001.jpg",
+    "c:Evil.jpg",
+    "ds/.. /a.jpg",  # not a ".." component, but the identity strips to ".."
+]
+
+
+def jpeg_bytes(seed: int) -> bytes:
+    """Random-noise JPEG, big enough to pass the MIN_IMAGE_BYTES check"""
+    rng = random.Random(seed)
+    image = Image.frombytes("RGB", (96, 96), bytes(rng.randrange(256) for _ in range(96 * 96 * 3)))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=95)
+    return buffer.getvalue()
+
+
+def hostile_zip(path: str):
+    with zipfile.ZipFile(path, "w") as archive:
+        for seed, name in enumerate(HOSTILE_MEMBERS + ["ds/Good Name/a.jpg"]):
+            archive.writestr(name, jpeg_bytes(seed))
+
+
+def hostile_tar(path: str):
+    with tarfile.open(path, "w:gz") as archive:
+        for seed, name in enumerate(HOSTILE_MEMBERS + ["ds/Good Name/a.jpg"]):
+            data = jpeg_bytes(seed)
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+def files_under(root: str):
+    return sorted(os.path.relpath(os.path.join(folder, name), root)
+                  for folder, _, names in os.walk(root) for name in names)
+
+
+@pytest.mark.parametrize("member", HOSTILE_MEMBERS[:-1])
+def test_unsafe_member_paths_have_no_identity(member):
+    assert not safe_member_path(member)
+    assert member_identity(member) is None
+
+
+def test_safe_member_paths():
+    assert safe_member_path("ds/Good Name/a.jpg")
+    assert member_identity("ds/Good_Name/a.jpg", strip_components=1) == "Good Name"
+    assert member_identity("Jimin_001.jpg") == "Jimin"
+
+
+@pytest.mark.parametrize("build", [hostile_zip, hostile_tar], ids=["zip", "tar"])
+def test_hostile_archive_stays_inside_gallery(tmp_path, build):
+    sandbox = tmp_path / "sandbox"
+    out_dir = sandbox / "gallery"
+    out_dir.mkdir(parents=True)
+    archive = str(tmp_path / "hostile.archive")
+    build(archive)
+
+    stats = ArchiveImporter(str(out_dir), workers=1, check_faces=False, strip_components=1).run(archive)
+
+    assert files_under(str(sandbox)) == [os.path.join("gallery", "Good_Name", "000001.jpg")]
+    assert stats["saved"] == 1
+    assert stats["rejected_unsafe_path"] == len(HOSTILE_MEMBERS)
+
+
+def test_symlinked_identity_folder_is_refused(tmp_path):
+    out_dir = tmp_path / "gallery"
+    outside = tmp_path / "outside"
+    out_dir.mkdir()
+    outside.mkdir()
+    os.symlink(outside, out_dir / "Evil")
+    archive = str(tmp_path / "faces.zip")
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("Evil/a.jpg", jpeg_bytes(1))
+
+    stats = ArchiveImporter(str(out_dir), workers=1, check_faces=False).run(archive)
+
+    assert os.listdir(outside) == []
+    assert stats["rejected_unsafe_path"] == 1
@@ -0,0 +1,94 @@
+"""
+Which failed URLs gallery_ingest.py fetches again on a later run.
+
+    python -m pytest test_ingest_manifest.py
+"""
+
+import asyncio
+import io
+import random
+
+import httpx
+import pytest
+from PIL import Image
+
+import ingest_manifest
+from gallery_ingest import GalleryCrawler, ImageProvider
+from ingest_manifest import IngestManifest
+
+NAME = "Test Idol"
+URL = "https://images.example.com/idol.jpg"
+
+
+def jpeg_bytes() -> bytes:
+    rng = random.Random(0)
+    image = Image.frombytes("RGB", (96, 96), bytes(rng.randrange(256) for _ in range(96 * 96 * 3)))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=95)
+    return buffer.getvalue()
+
+
+class FixedProvider(ImageProvider):
+    name = "fixed"
+
+    async def search(self, fetch, query, max_results):
+        return [URL]
+
+
+def crawl(tmp_path, manifest: IngestManifest, status: int) -> dict:
+    """One ingestion run against an image host answering ``status``; returns the result and request count"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if status == 200:
+            return httpx.Response(200, headers={"content-type": "image/jpeg"}, content=jpeg_bytes())
+        return httpx.Response(status, headers={"retry-after": "0"})
+
+    crawler = GalleryCrawler([FixedProvider()], out_dir=str(tmp_path / "gallery"), per_identity=1, retries=0,
+                             manifest=manifest, transport=httpx.MockTransport(handler))
+
+    async def run():
+        return await crawler.run([NAME])
+
+    result = asyncio.run(run())[0]
+    return dict(result, requests=len(requests))
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return IngestManifest(str(tmp_path / "manifest.sqlite3"))
+
+
+@pytest.mark.parametrize("status", [500, 503, 429, 408])
+def test_transient_failure_is_retried_on_the_next_run(tmp_path, manifest, status):
+    first = crawl(tmp_path, manifest, status)
+    assert first["status"] == "failed" and first["requests"] == 1
+    assert manifest.dead_urls(NAME) == set()
+
+    second = crawl(tmp_path, manifest, 200)
+    assert second["status"] == "downloaded" and second["requests"] == 1
+
+
+@pytest.mark.parametrize("status", [403, 404, 410])
+def test_permanent_failure_is_not_fetched_again(tmp_path, manifest, status):
+    crawl(tmp_path, manifest, status)
+    assert manifest.dead_urls(NAME) == {URL}
+
+    second = crawl(tmp_path, manifest, 200)
+    assert second["status"] == "failed" and second["requests"] == 0
+
+
+def test_url_is_dead_after_max_attempts(manifest):
+    for attempt in range(ingest_manifest.URL_MAX_ATTEMPTS):
+        assert manifest.dead_urls(NAME) == set()
+        manifest.record_fetch(NAME, "fixed", URL, ingest_manifest.HTTP_RETRY, 503)
+    assert manifest.dead_urls(NAME) == {URL}
+
+
+def test_old_manifest_rows_for_server_errors_are_revived(tmp_path):
+    path = str(tmp_path / "manifest.sqlite3")
+    IngestManifest(path).record_fetch(NAME, "fixed", URL, ingest_manifest.HTTP_ERROR, 503)
+    IngestManifest(path).record_fetch(NAME, "fixed", URL + "?gone", ingest_manifest.HTTP_ERROR, 404)
+
+    assert IngestManifest(path).dead_urls(NAME) == {URL + "?gone"}
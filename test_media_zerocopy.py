@@ -0,0 +1,88 @@
+"""
+/media/ through the full middleware stack on a server offering zero-copy send.
+
+    python -m pytest test_media_zerocopy.py
+"""
+
+import asyncio
+import os
+import tempfile
+
+# main.py opens its SQLite files at import; keep them out of the working tree
+_scratch = tempfile.mkdtemp(prefix="test-media-")
+os.environ.setdefault("LLM_QUOTA_DB", os.path.join(_scratch, "llm_quota.sqlite3"))
+os.environ.setdefault("JOB_DB_PATH", os.path.join(_scratch, "jobs.sqlite3"))
+
+import api_responses  # noqa: E402
+import gallery_media  # noqa: E402
+import main  # noqa: E402
+
+SHA256 = "ab" * 32
+BODY = b"RIFF\x00\x00\x00\x00WEBPVP8 " + bytes(range(256)) * 8
+
+
+def call(app, path: str, headers=(), extensions=None):
+    """Drive an ASGI app with one GET; returns the messages it sent"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"testserver")] + [(k.encode(), v.encode()) for k, v in headers],
+        "client": ("127.0.0.1", 50000), "server": ("testserver", 80), "extensions": extensions or {},
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            message = dict(message, body=message["file"].read())
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def media_file(root: str) -> str:
+    name = gallery_media.media_name(SHA256, 256, "webp")
+    path = gallery_media.media_path(root, name)
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(BODY)
+    return name
+
+
+def test_zerocopysend_gets_its_start_message(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    name = media_file(gallery_media.GALLERY_DERIVATIVES_DIR)
+
+    sent = call(main.app, f"/media/{name}", headers=[("accept-encoding", "gzip, br")],
+                extensions={"http.response.zerocopysend": {}})
+
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.zerocopysend"]
+    assert sent[0]["status"] == 200
+    headers = dict(sent[0]["headers"])
+    assert b"content-encoding" not in headers
+    assert headers[b"content-length"] == str(len(BODY)).encode()
+    assert sent[1]["body"] == BODY
+
+
+def test_chunked_send_without_the_extension(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    name = media_file(gallery_media.GALLERY_DERIVATIVES_DIR)
+
+    sent = call(main.app, f"/media/{name}", headers=[("accept-encoding", "gzip")])
+
+    assert sent[0]["type"] == "http.response.start" and sent[0]["status"] == 200
+    assert b"".join(m.get("body", b"") for m in sent[1:]) == BODY
+
+
+def test_compression_middleware_passes_other_messages_after_start():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.pathsend", "path": "/dev/null"})
+
+    sent = call(api_responses.CompressionMiddleware(app), "/", headers=[("accept-encoding", "gzip")])
+
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.pathsend"]
@@ -0,0 +1,217 @@
+"""
+Bounded, streaming reader for image uploads.
+
+FastAPI's ``UploadFile`` parameters read the whole multipart body before the
+handler runs, and the only check the handlers could make was the client's own
+Content-Type. read_image_upload() parses the multipart stream as it arrives
+instead and rejects a bad upload as soon as the evidence is in:
+
+- Content-Length over the limit: 413 before any of the body is read.
+- More than MAX_UPLOAD_BYTES of file data: 413 at the chunk that crosses it.
+- First bytes are not JPEG, PNG, WebP or BMP: 415 after about 32 bytes.
+- Width x height over MAX_IMAGE_PIXELS (a decompression bomb: a tiny file
+  that decodes to gigabytes): 413 as soon as the header with the dimensions
+  has arrived. A header whose dimensions cannot be found within
+  SNIFF_LIMIT_BYTES is rejected too.
+
+So memory per request is bounded by MAX_UPLOAD_BYTES, and nothing is decoded
+that was not sniffed first.
+"""
+
+import os
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", str(40_000_000)))
+# JPEG dimensions come after EXIF/ICC segments, which are at most 64 KB each
+SNIFF_LIMIT_BYTES = 256 * 1024
+# Boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+INVALID_IMAGE_MESSAGE = "Please upload a valid image file (JPG, PNG, etc.)"
+
+# OpenAPI request body for handlers that take the upload through read_image_upload()
+IMAGE_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {"file": {"type": "string", "format": "binary"}},
+        }}},
+    }
+}
+
+# JPEG start-of-frame markers (the ones carrying the image size)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """Image format from the magic bytes, or None"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head.startswith(b"BM"):
+        return "bmp"
+    return None
+
+
+def _jpeg_size(head: bytes) -> Optional[Tuple[int, int]]:
+    position = 2
+    while position + 4 <= len(head):
+        if head[position] != 0xFF:
+            raise ValueError("corrupt JPEG segment")
+        marker = head[position + 1]
+        if marker == 0xFF:  # fill byte
+            position += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # no length field
+            position += 2
+            continue
+        if marker == 0xD9 or marker == 0xDA:
+            raise ValueError("JPEG without a frame header")
+        (length,) = struct.unpack_from(">H", head, position + 2)
+        if marker in JPEG_SOF_MARKERS:
+            if position + 9 > len(head):
+                return None
+            height, width = struct.unpack_from(">HH", head, position + 5)
+            return width, height
+        position += 2 + length
+    return None
+
+
+def image_size(head: bytes, image_format: str) -> Optional[Tuple[int, int]]:
+    """(width, height) from the start of the file; None if more bytes are needed"""
+    if image_format == "jpeg":
+        return _jpeg_size(head)
+    if image_format == "png":
+        if len(head) < 24:
+            return None
+        return struct.unpack_from(">II", head, 16)
+    if image_format == "bmp":
+        if len(head) < 26:
+            return None
+        width, height = struct.unpack_from("<ii", head, 18)
+        return abs(width), abs(height)
+    if image_format == "webp":
+        if len(head) < 30:
+            return None
+        chunk = head[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack_from("<HH", head, 26)
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            b0, b1, b2, b3 = head[21:25]
+            return 1 + (b0 | (b1 & 0x3F) << 8), 1 + (b1 >> 6 | b2 << 2 | (b3 & 0x0F) << 10)
+        if chunk == b"VP8X":
+            return 1 + int.from_bytes(head[24:27], "little"), 1 + int.from_bytes(head[27:30], "little")
+        raise ValueError("unknown WebP chunk")
+    return None
+
+
+class ImageUploadReader:
+    """Collects one multipart field, checking size, format and dimensions as data arrives"""
+
+    def __init__(self, field: str, max_bytes: int, max_pixels: int):
+        self.field = field
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.data = bytearray()
+        self.format: Optional[str] = None
+        self.size: Optional[Tuple[int, int]] = None
+        self.found = False
+        self.finished = False
+        self._in_field = False
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+
+    def callbacks(self) -> Dict[str, Any]:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+            "on_header_field": self._header_field_data,
+            "on_header_value": self._header_value_data,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+        }
+
+    def _part_begin(self):
+        self._headers = {}
+
+    def _header_field_data(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _header_value_data(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._in_field = not self.found and options.get(b"name") == self.field.encode()
+        self.found = self.found or self._in_field
+
+    def _part_data(self, data: bytes, start: int, end: int):
+        if self._in_field:
+            self.data += data[start:end]
+
+    def _part_end(self):
+        if self._in_field:
+            self._in_field = False
+            self.finished = True
+
+    def check(self):
+        """Reject as soon as what has arrived so far is enough to tell"""
+        if len(self.data) > self.max_bytes:
+            raise HTTPException(status_code=413, detail=f"Image is larger than {self.max_bytes // (1024 * 1024)} MB")
+        if self.format is None and (len(self.data) >= 32 or (self.finished and self.data)):
+            self.format = sniff_format(bytes(self.data[:32]))
+            if self.format is None:
+                raise HTTPException(status_code=415, detail=INVALID_IMAGE_MESSAGE)
+        if self.format is not None and self.size is None:
+            try:
+                self.size = image_size(bytes(self.data[:SNIFF_LIMIT_BYTES]), self.format)
+            except (ValueError, struct.error):
+                raise HTTPException(status_code=400, detail=INVALID_IMAGE_MESSAGE)
+            if self.size is None and (len(self.data) >= SNIFF_LIMIT_BYTES or self.finished):
+                raise HTTPException(status_code=400, detail=INVALID_IMAGE_MESSAGE)
+            if self.size is not None and (self.size[0] * self.size[1] > self.max_pixels or 0 in self.size):
+                raise HTTPException(status_code=413, detail=f"Image dimensions {self.size[0]}x{self.size[1]} "
+                                                             f"are not supported")
+
+
+async def read_image_upload(request: Request, field: str = "file", max_bytes: int = MAX_UPLOAD_BYTES,
+                            max_pixels: int = MAX_IMAGE_PIXELS) -> Tuple[bytes, Dict[str, Any]]:
+    """Stream a multipart image upload; returns the file bytes and {format, width, height}"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Image is larger than {max_bytes // (1024 * 1024)} MB")
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise HTTPException(status_code=400, detail=INVALID_IMAGE_MESSAGE)
+
+    reader = ImageUploadReader(field, max_bytes, max_pixels)
+    parser = MultipartParser(options[b"boundary"], reader.callbacks())
+    async for chunk in request.stream():
+        if chunk:
+            parser.write(chunk)
+            reader.check()
+        if reader.finished:
+            # The rest of the body (other fields, the closing boundary) is not needed
+            break
+    if not reader.finished or not reader.data:
+        raise HTTPException(status_code=400, detail=INVALID_IMAGE_MESSAGE)
+    reader.check()
+    width, height = reader.size
+    return bytes(reader.data), {"format": reader.format, "width": width, "height": height}